@@ -28,13 +28,14 @@ from typing import Dict
 from ai_dev_assistant.rag.config import DEFAULT_MODE
 from ai_dev_assistant.rag.context import ContextOptions, build_context
 from ai_dev_assistant.rag.modes import ConversationMode, get_mode_policy
+from ai_dev_assistant.rag.session import get_session
 from ai_dev_assistant.services.explain import explain_query
 from ai_dev_assistant.services.search import search_query
 
 
 def ask(
     query: str,
-    k: int = 5,
+    k: int | None = None,
     mode: str | None = None,
     *,
     memory: str | None = None,  # NEW
@@ -82,7 +83,8 @@ def ask(
     # Retrieval (optional)
     # ----------------------------
     if policy.use_retrieval:
-        retrieval = search_query(query, k=k)
+        # Modes with partitions retrieve per chunk type (k, if given, is split between them)
+        retrieval = search_query(query, k=k, partitions=policy.partitions)
     else:
         retrieval = {
             "query": query,
@@ -114,7 +116,8 @@ def ask(
     assert isinstance(chunks, list), f"Invalid chunks type: {type(chunks)}"
 
     results = [(r["chunk_id"], r["score"]) for r in chunks]
-    context = build_context(results, options)
+    with get_session().artifacts() as artifacts:
+        context = build_context(results, options, artifacts)
 
     # ----------------------------
     # Explanation (optional)
@@ -139,6 +142,7 @@ def ask(
             "prefer_full_code": policy.prefer_full_code,
             "expand_inheritance_depth": policy.expand_inheritance_depth,
             "inject_project_overview": policy.inject_project_overview,
+            "partitions": dict(policy.partitions),
         },
         "retrieval": retrieval,
         "context": context,
@@ -22,7 +22,7 @@ def ask_with_memory(
     *,
     conversation_id: str | None = None,
     mode: str | None = None,
-    k: int = 5,
+    k: int | None = None,
 ) -> Dict:
     """
     High-level conversational entrypoint with memory support.
@@ -18,7 +18,9 @@ from __future__ import annotations
 
 import argparse
 
-from ai_dev_assistant.rag.modes import ConversationMode
+from ai_dev_assistant.rag.embedding_policy import EMBEDDABLE_TYPES
+from ai_dev_assistant.rag.modes import ConversationMode, get_mode_policy
+from ai_dev_assistant.rag.session import get_session
 from ai_dev_assistant.services.context import build_query_context
 from ai_dev_assistant.services.explain import explain_query
 from ai_dev_assistant.services.search import search_query
@@ -49,8 +51,33 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--k",
         type=int,
-        default=5,
-        help="Number of chunks to retrieve (default: 5)",
+        default=None,
+        help="Number of chunks to retrieve (default: 5, or the mode's partition sizes)",
+    )
+
+    parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        choices=sorted(EMBEDDABLE_TYPES),
+        default=None,
+        help="Only retrieve chunks of this type (repeatable)",
+    )
+
+    parser.add_argument(
+        "--path",
+        dest="path_prefix",
+        type=str,
+        default=None,
+        help="Only retrieve chunks of files under this path, relative to the repo root",
+    )
+
+    parser.add_argument(
+        "--package",
+        dest="packages",
+        action="append",
+        default=None,
+        help="Only retrieve chunks of this package and its subpackages (repeatable)",
     )
 
     parser.add_argument(
@@ -101,6 +128,10 @@ def main() -> None:
     search_result = search_query(
         args.query,
         k=args.k,
+        types=args.types,
+        path_prefix=args.path_prefix,
+        packages=args.packages,
+        partitions=get_mode_policy(ConversationMode(args.mode)).partitions,
     )
 
     # --------------------------------------------------
@@ -118,6 +149,8 @@ def main() -> None:
 
     print("\n=== CONTEXT SUMMARY ===")
     print(f"Chunks: {context_result['chunk_count']}")
+    if not search_result["dry_run"]:
+        print(f"Index: {get_session().vector_store().describe()}")
 
     # --------------------------------------------------
     # 3) LLM explanation
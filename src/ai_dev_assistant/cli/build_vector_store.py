@@ -10,6 +10,8 @@ Usage:
 Optional:
 
     python -m ai_dev_assistant.cli.build_vector_store --repo /path/to/repo
+    python -m ai_dev_assistant.cli.build_vector_store --index-type ivfpq --rerank 4
+    python -m ai_dev_assistant.cli.build_vector_store --index-type hnsw
 
 Notes:
 - If --repo is provided, it becomes the active repository.
@@ -21,6 +23,7 @@ from __future__ import annotations
 import argparse
 from pathlib import Path
 
+from ai_dev_assistant.infra.vector_store import AUTO_INDEX_TYPE, INDEX_TYPES
 from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
 from ai_dev_assistant.tools.defaults import (
     repo_name_from_path,
@@ -37,6 +40,27 @@ def parse_args() -> argparse.Namespace:
         help="Path to repository root (optional; overrides active repo)",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Apply embedding changes to the saved index instead of rebuilding it",
+    )
+
+    parser.add_argument(
+        "--index-type",
+        choices=(*INDEX_TYPES, AUTO_INDEX_TYPE),
+        help=(
+            "flat (exact), sq8 (~4x smaller), ivfpq (~32x smaller), ivfflat / hnsw (approximate, fast "
+            "on large repos) or auto (by vector count); default: RAG_INDEX_TYPE"
+        ),
+    )
+
+    parser.add_argument(
+        "--rerank",
+        type=int,
+        help="Re-score rerank * k candidates against the original vectors (0: off)",
+    )
+
     return parser.parse_args()
 
 
@@ -51,7 +75,7 @@ def main() -> None:
         repo_name = repo_name_from_path(repo_root)
         set_active_repo_name(repo_name)
 
-    build_vector_store()
+    build_vector_store(incremental=args.incremental, index_type=args.index_type, rerank=args.rerank)
 
 
 if __name__ == "__main__":
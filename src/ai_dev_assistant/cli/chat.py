@@ -46,8 +46,8 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--k",
         type=int,
-        default=5,
-        help="Number of chunks to retrieve per query",
+        default=None,
+        help="Number of chunks to retrieve per query (default: 5, or the mode's partition sizes)",
     )
 
     return parser.parse_args()
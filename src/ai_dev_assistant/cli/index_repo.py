@@ -7,9 +7,17 @@ Run:
 
     python -m ai_dev_assistant.cli.index_repo --repo /path/to/repo
 
+Parse files in parallel (0 = one process per CPU):
+
+    python -m ai_dev_assistant.cli.index_repo --repo /path/to/repo --workers 0
+
+Refresh after a merge, from the git diff since the indexed commit:
+
+    python -m ai_dev_assistant.cli.index_repo --repo /path/to/repo --git-diff
+
 The indexed artifacts will be written to:
 
-    <data_root>/<repo_name>/chunks.json
+    <data_root>/<repo_name>/chunks.jsonl
 """
 
 from __future__ import annotations
@@ -30,6 +38,25 @@ def parse_args() -> argparse.Namespace:
         help="Path to the repository root to index",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used for chunking (default: 1, 0 = one per CPU)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-parse files changed since the last run (uses the index manifest)",
+    )
+
+    parser.add_argument(
+        "--git-diff",
+        action="store_true",
+        help="Only re-parse paths git reports as changed since the indexed commit (implies --incremental)",
+    )
+
     return parser.parse_args()
 
 
@@ -38,6 +65,9 @@ def main() -> None:
 
     index_repo(
         repo_root=args.repo,
+        workers=args.workers,
+        incremental=args.incremental,
+        git_diff=args.git_diff,
     )
 
 
@@ -40,6 +40,25 @@ def parse_args() -> argparse.Namespace:
         help="Path to the repository to index",
     )
 
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used for chunking (default: 1, 0 = one per CPU)",
+    )
+
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only re-process files changed since the last run",
+    )
+
+    parser.add_argument(
+        "--git-diff",
+        action="store_true",
+        help="Only re-parse paths git reports as changed since the indexed commit (implies --incremental)",
+    )
+
     return parser.parse_args()
 
 
@@ -64,9 +83,11 @@ def main() -> None:
     set_active_repo_name(repo_name)
 
     # 2️⃣ Run pipeline
-    index_repo(repo_root=repo_root)
-    rebuild_embeddings()
-    build_vector_store()
+    incremental = args.incremental or args.git_diff
+
+    index_repo(repo_root=repo_root, workers=args.workers, incremental=incremental, git_diff=args.git_diff)
+    rebuild_embeddings(incremental=incremental)
+    build_vector_store(incremental=incremental)
     export_yaml_preview()
 
     print("\n✅ Indexing complete")
@@ -22,7 +22,9 @@ from __future__ import annotations
 
 import argparse
 
-from ai_dev_assistant.rag.modes import ConversationMode
+from ai_dev_assistant.rag.embedding_policy import EMBEDDABLE_TYPES
+from ai_dev_assistant.rag.modes import ConversationMode, get_mode_policy
+from ai_dev_assistant.rag.session import get_session
 from ai_dev_assistant.services.context import build_query_context
 from ai_dev_assistant.services.search import search_query
 from ai_dev_assistant.tools.defaults import (
@@ -51,8 +53,47 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument(
         "--k",
         type=int,
-        default=5,
-        help="Number of chunks to retrieve (default: 5)",
+        default=None,
+        help="Number of chunks to retrieve (default: 5, or the mode's partition sizes)",
+    )
+
+    parser.add_argument(
+        "--nprobe",
+        type=int,
+        default=None,
+        help="IVF lists to probe (approximate indexes; default: index setting)",
+    )
+
+    parser.add_argument(
+        "--ef-search",
+        type=int,
+        default=None,
+        help="HNSW candidate list size (approximate indexes; default: index setting)",
+    )
+
+    parser.add_argument(
+        "--type",
+        dest="types",
+        action="append",
+        choices=sorted(EMBEDDABLE_TYPES),
+        default=None,
+        help="Only retrieve chunks of this type (repeatable)",
+    )
+
+    parser.add_argument(
+        "--path",
+        dest="path_prefix",
+        type=str,
+        default=None,
+        help="Only retrieve chunks of files under this path, relative to the repo root",
+    )
+
+    parser.add_argument(
+        "--package",
+        dest="packages",
+        action="append",
+        default=None,
+        help="Only retrieve chunks of this package and its subpackages (repeatable)",
     )
 
     parser.add_argument(
@@ -66,7 +107,7 @@ def parse_args() -> argparse.Namespace:
         type=str,
         choices=[m.value for m in ConversationMode],
         default=ConversationMode.DEBUGGING.value,
-        help="Expansion mode (default: DEBUGGING)",
+        help="Retrieval and expansion mode (default: DEBUGGING)",
     )
 
     return parser.parse_args()
@@ -96,11 +137,23 @@ def main() -> None:
     # --------------------------------------------------
     # 1) Semantic search
     # --------------------------------------------------
-    search_result = search_query(args.query, k=args.k)
+    search_result = search_query(
+        args.query,
+        k=args.k,
+        nprobe=args.nprobe,
+        ef_search=args.ef_search,
+        types=args.types,
+        path_prefix=args.path_prefix,
+        packages=args.packages,
+        partitions=get_mode_policy(ConversationMode(args.mode)).partitions,
+    )
 
     print("\n=== QUERY ===")
     print(args.query)
 
+    if not search_result["dry_run"]:
+        print(f"\nIndex: {get_session().vector_store().describe()}")
+
     print("\n=== RETRIEVED CHUNKS ===")
     for item in search_result["chunks"]:
         print(f"{item['chunk_id']}  score={item['score']:.4f}")
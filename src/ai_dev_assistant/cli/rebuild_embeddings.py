@@ -10,6 +10,7 @@ Usage:
 Optional:
 
     python -m ai_dev_assistant.cli.rebuild_embeddings --repo /path/to/repo
+    python -m ai_dev_assistant.cli.rebuild_embeddings --resume
 
 Notes:
 - If --repo is provided, it becomes the active repository.
@@ -37,6 +38,18 @@ def parse_args() -> argparse.Namespace:
         help="Path to repository root (optional; overrides active repo)",
     )
 
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Only embed chunks added since the last run",
+    )
+
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Reuse vectors checkpointed by an interrupted run",
+    )
+
     return parser.parse_args()
 
 
@@ -51,7 +64,7 @@ def main() -> None:
         repo_name = repo_name_from_path(repo_root)
         set_active_repo_name(repo_name)
 
-    rebuild_embeddings()
+    rebuild_embeddings(incremental=args.incremental, resume=args.resume)
 
 
 if __name__ == "__main__":
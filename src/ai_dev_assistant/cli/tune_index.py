@@ -0,0 +1,95 @@
+"""
+cli.tune_index
+
+CLI entrypoint for tuning the vector index against a recall target.
+
+Usage:
+
+    python -m ai_dev_assistant.cli.tune_index
+
+Optional:
+
+    python -m ai_dev_assistant.cli.tune_index --repo /path/to/repo
+    python -m ai_dev_assistant.cli.tune_index --target-recall 0.9 --k 5 --index-types hnsw ivfflat
+
+Notes:
+- If --repo is provided, it becomes the active repository.
+- Otherwise, the last active repository is used.
+- The selected index replaces the saved one.
+"""
+
+from __future__ import annotations
+
+import argparse
+from pathlib import Path
+
+from ai_dev_assistant.infra.vector_store import INDEX_TYPES
+from ai_dev_assistant.tools.defaults import (
+    repo_name_from_path,
+    set_active_repo_name,
+)
+from ai_dev_assistant.tools.tune_index import main as tune_index
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Pick the fastest vector index meeting a recall target.")
+
+    parser.add_argument(
+        "--repo",
+        type=Path,
+        help="Path to repository root (optional; overrides active repo)",
+    )
+
+    parser.add_argument(
+        "--target-recall",
+        type=float,
+        default=0.95,
+        help="Minimum recall@k against exact search (default: 0.95)",
+    )
+
+    parser.add_argument(
+        "--k",
+        type=int,
+        default=10,
+        help="Number of results per query (default: 10)",
+    )
+
+    parser.add_argument(
+        "--queries",
+        type=int,
+        default=200,
+        help="Stored vectors sampled as pseudo-queries (default: 200)",
+    )
+
+    parser.add_argument(
+        "--index-types",
+        nargs="+",
+        choices=INDEX_TYPES,
+        default=list(INDEX_TYPES),
+        help="Index types to try (default: all; flat is always tried)",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    if args.repo:
+        repo_root = args.repo.expanduser().resolve()
+        if not repo_root.exists():
+            raise RuntimeError(f"Repository does not exist: {repo_root}")
+
+        repo_name = repo_name_from_path(repo_root)
+        set_active_repo_name(repo_name)
+
+    tune_index(
+        target_recall=args.target_recall,
+        k=args.k,
+        queries=args.queries,
+        index_types=args.index_types,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+cli.watch
+
+Keep the index of a repository up to date while you edit.
+
+Run:
+
+    python -m ai_dev_assistant.cli.watch --repo /path/to/repo
+
+Changed files are re-chunked, re-embedded and applied to the
+FAISS index in the background, a short while after the last
+save (see --debounce). Stop with Ctrl+C.
+"""
+
+from __future__ import annotations
+
+import argparse
+from functools import partial
+from pathlib import Path
+
+from ai_dev_assistant.tools.defaults import (
+    repo_name_from_path,
+    set_active_repo_name,
+)
+from ai_dev_assistant.tools.watch import Watcher, refresh
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Watch a repository and keep its index live.")
+
+    parser.add_argument(
+        "--repo",
+        type=Path,
+        required=True,
+        help="Path to the repository to watch",
+    )
+
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between scans (default: 1.0)",
+    )
+
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=2.0,
+        help="Quiet seconds to wait after the last change before refreshing (default: 2.0)",
+    )
+
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of processes used for chunking (default: 1, 0 = one per CPU)",
+    )
+
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+
+    repo_root = args.repo.expanduser().resolve()
+    if not repo_root.exists():
+        raise RuntimeError(f"Repository does not exist: {repo_root}")
+
+    set_active_repo_name(repo_name_from_path(repo_root))
+
+    watcher = Watcher(
+        repo_root,
+        interval=args.interval,
+        debounce=args.debounce,
+        on_refresh=partial(refresh, repo_root, workers=args.workers),
+    )
+
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+# infra/artifact_sqlite.py
+"""
+Per-repository SQLite index of chunk artifacts.
+
+chunks.jsonl stays the pipeline artifact; this database is
+its query-side copy, so context assembly can fetch the few
+rows a query needs by id, type, symbol or file instead of
+parsing every chunk and embedding record.
+
+Chunk ids are not unique (a redefined method keeps both
+chunks), so rows are keyed by rowid and lookups return
+rows in artifact order.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Iterator
+
+_COLUMNS = ("id", "file", "type", "symbol", "text", "blob", "start", "end")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id      TEXT NOT NULL,
+    file    TEXT NOT NULL,
+    type    TEXT NOT NULL,
+    symbol  TEXT NOT NULL,
+    text    TEXT NOT NULL,
+    blob    TEXT,
+    start   INTEGER,
+    "end"   INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_id ON chunks(id);
+CREATE INDEX IF NOT EXISTS idx_chunks_type ON chunks(type);
+CREATE INDEX IF NOT EXISTS idx_chunks_symbol ON chunks(symbol);
+CREATE INDEX IF NOT EXISTS idx_chunks_file ON chunks(file);
+"""
+
+_INSERT = 'INSERT INTO chunks (id, file, type, symbol, text, blob, start, "end") VALUES (?, ?, ?, ?, ?, ?, ?, ?)'
+
+# Stay well below SQLite's bound-parameter limit
+_MAX_PARAMS = 500
+
+
+def _row_values(record: dict) -> tuple:
+    return tuple(record.get(column) for column in _COLUMNS)
+
+
+def _batches(values: list[str]) -> Iterator[list[str]]:
+    for i in range(0, len(values), _MAX_PARAMS):
+        yield values[i : i + _MAX_PARAMS]
+
+
+# ============================================================
+# WRITING
+# ============================================================
+
+
+def _connect(path: Path) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def rebuild_chunks(path: Path, records: Iterable[dict]) -> int:
+    """
+    Replace all rows with the given chunk records.
+    """
+    conn = _connect(path)
+    try:
+        with conn:
+            conn.execute("DELETE FROM chunks")
+            count = conn.executemany(_INSERT, (_row_values(r) for r in records)).rowcount
+        conn.execute("ANALYZE")
+    finally:
+        conn.close()
+    return count
+
+
+def apply_chunk_changes(path: Path, removed: list[str], records: Iterable[dict]) -> None:
+    """
+    Delete every row whose id is in removed, then insert records.
+    """
+    conn = _connect(path)
+    try:
+        with conn:
+            for batch in _batches(list(dict.fromkeys(removed))):
+                conn.execute(f"DELETE FROM chunks WHERE id IN ({', '.join('?' * len(batch))})", batch)
+            conn.executemany(_INSERT, (_row_values(r) for r in records))
+    finally:
+        conn.close()
+
+
+# ============================================================
+# READING
+# ============================================================
+
+
+class ArtifactIndex:
+    """
+    Read-only lookups on the chunk database.
+
+    Usage:
+        with ArtifactIndex(path) as artifacts:
+            artifacts.get_chunks(ids)
+    """
+
+    def __init__(self, path: Path):
+        # Read-only, so a resident session may share it across threads
+        self.conn = sqlite3.connect(f"{path.as_uri()}?mode=ro", uri=True, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+
+    def __enter__(self) -> "ArtifactIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def _select(self, where: str, params: list) -> list[dict]:
+        rows = self.conn.execute(f"SELECT * FROM chunks WHERE {where} ORDER BY rowid", params)
+        return [dict(row) for row in rows]
+
+    def get_chunks(self, ids: Iterable[str]) -> dict[str, dict]:
+        """
+        Chunks by id (the last one wins for duplicate ids).
+        """
+        found: dict[str, dict] = {}
+        for batch in _batches(list(dict.fromkeys(ids))):
+            for row in self._select(f"id IN ({', '.join('?' * len(batch))})", batch):
+                found[row["id"]] = row
+        return found
+
+    def find_by_symbol(self, chunk_type: str, symbols: Iterable[str]) -> list[dict]:
+        rows: list[dict] = []
+        for batch in _batches(list(dict.fromkeys(symbols))):
+            placeholders = ", ".join("?" * len(batch))
+            rows.extend(self._select(f"type = ? AND symbol IN ({placeholders})", [chunk_type, *batch]))
+        return rows
+
+    def find_by_file(self, file: str) -> list[dict]:
+        return self._select("file = ?", [file])
+
+    def first_of_type(self, chunk_type: str) -> dict | None:
+        rows = self.conn.execute("SELECT * FROM chunks WHERE type = ? ORDER BY rowid LIMIT 1", [chunk_type])
+        row = rows.fetchone()
+        return dict(row) if row else None
@@ -25,17 +25,47 @@ EMBEDDING_MODEL = os.environ.get(
     "RAG_EMBEDDING_MODEL",
     "text-embedding-3-large",
 )
+# Shortened embeddings: vectors are cut to this many dimensions
+# (by the API for text-embedding-3-*, otherwise truncated and
+# renormalized locally). Unset keeps the model's full size.
+EMBEDDING_TARGET_DIM = int(os.environ.get("RAG_EMBEDDING_DIM", "0")) or None
+
+# Offline embedding model (infra/local_embeddings.py): set
+# RAG_EMBEDDING_MODEL to this to index and search without an API
+LOCAL_EMBEDDING_MODEL = "local-hash"
+LOCAL_EMBEDDING_DIM = int(
+    os.environ.get(
+        "RAG_LOCAL_EMBEDDING_DIM",
+        "1024",
+    )
+)
 LLM_MODEL = os.environ.get(
     "RAG_LLM_MODEL",
     "gpt-4.1-mini",
 )
 
+# Embedding batches kept in flight at once
+EMBEDDING_CONCURRENCY = int(
+    os.environ.get(
+        "RAG_EMBEDDING_CONCURRENCY",
+        "4",
+    )
+)
+
+# Inputs over the model's token limit: "truncate" keeps the
+# head, "split" embeds every piece and averages the vectors
+EMBEDDING_OVERSIZE_POLICY = os.environ.get(
+    "RAG_EMBEDDING_OVERSIZE",
+    "truncate",
+)
+
 # ============================================================
 # PRICING (USD per 1M tokens)
 # ============================================================
 EMBEDDING_PRICES_PER_1M = {
     "text-embedding-3-small": 0.02,
     "text-embedding-3-large": 0.13,
+    LOCAL_EMBEDDING_MODEL: 0.0,
 }
 LLM_PRICES_PER_1M = {
     "gpt-4.1": {
@@ -0,0 +1,162 @@
+# infra/embedding_cache.py
+"""
+Persistent embedding cache.
+
+Vectors are keyed by (model, sha256 of the input text), so
+an unchanged overview is never sent to the API twice, across
+runs and across repositories. The cache lives in a single
+SQLite database under the data root.
+
+Vectors are stored as float32, the precision the API returns
+and the FAISS index uses.
+
+EmbeddingCheckpoint is the per-repository counterpart: an
+append-only log of the vectors an embedding run has finished,
+kept next to the repo artifacts so an interrupted run can be
+resumed even where the shared cache is not persisted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from array import array
+from pathlib import Path
+from typing import IO, Iterable
+
+# Stay well below SQLite's bound-parameter limit
+_MAX_PARAMS = 500
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def model_key(model: str, dimensions: int | None = None) -> str:
+    """
+    Cache namespace of a model: shortened vectors are kept
+    apart from full-size ones ("text-embedding-3-large@256").
+    """
+    return f"{model}@{dimensions}" if dimensions else model
+
+
+class EmbeddingCache:
+    """
+    Usage:
+        with EmbeddingCache(path) as cache:
+            found = cache.get_many(model, keys)
+            cache.put_many(model, {key: vector})
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                text_sha256 TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (model, text_sha256)
+            )
+            """
+        )
+
+    def __enter__(self) -> "EmbeddingCache":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def get_many(self, model: str, keys: Iterable[str]) -> dict[str, list[float]]:
+        keys = list(keys)
+        found: dict[str, list[float]] = {}
+
+        for i in range(0, len(keys), _MAX_PARAMS):
+            batch = keys[i : i + _MAX_PARAMS]
+            placeholders = ", ".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT text_sha256, vector FROM embeddings WHERE model = ? AND text_sha256 IN ({placeholders})",
+                [model, *batch],
+            )
+            for key, blob in rows:
+                found[key] = array("f", blob).tolist()
+
+        return found
+
+    def put_many(self, model: str, vectors: dict[str, list[float]]) -> None:
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, text_sha256, vector) VALUES (?, ?, ?)",
+                ((model, key, array("f", vector).tobytes()) for key, vector in vectors.items()),
+            )
+
+
+def _last_byte(path: Path) -> bytes:
+    with path.open("rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1)
+
+
+class EmbeddingCheckpoint:
+    """
+    JSON lines of {"model", "key", "embedding"}, flushed and
+    fsynced per append. A torn last line (crash mid-write) is
+    skipped on load.
+
+    Usage:
+        checkpoint = EmbeddingCheckpoint(path)
+        done = checkpoint.load(model)
+        checkpoint.append(model, {key: vector})
+        checkpoint.discard()  # once the run has been written out
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._file: IO[str] | None = None
+
+    def load(self, model: str) -> dict[str, list[float]]:
+        found: dict[str, list[float]] = {}
+
+        if not self.path.exists():
+            return found
+
+        with self.path.open(encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if record["model"] == model:
+                    found[record["key"]] = record["embedding"]
+
+        return found
+
+    def append(self, model: str, vectors: dict[str, list[float]]) -> None:
+        if self._file is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._file = self.path.open("a", encoding="utf-8")
+            # Terminate a torn line left by a crashed run
+            if self._file.tell() and _last_byte(self.path) != b"\n":
+                self._file.write("\n")
+
+        self._file.writelines(
+            json.dumps({"model": model, "key": key, "embedding": vector}) + "\n" for key, vector in vectors.items()
+        )
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self) -> None:
+        self.close()
+        self.path.unlink(missing_ok=True)
@@ -1,17 +1,282 @@
 # infra/embeddings.py
 from __future__ import annotations
 
-from typing import List
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List, NamedTuple, Protocol
+
+import numpy as np
+import openai
 
 from ai_dev_assistant.infra.ai_client import get_ai_client
+from ai_dev_assistant.rag.cost import get_encoding
+
+from .config import (
+    EMBEDDING_CONCURRENCY,
+    EMBEDDING_MODEL,
+    EMBEDDING_OVERSIZE_POLICY,
+    EMBEDDING_TARGET_DIM,
+    LOCAL_EMBEDDING_DIM,
+    LOCAL_EMBEDDING_MODEL,
+)
+from .local_embeddings import HashingEmbedder
+
+# API limits of the embedding models (text-embedding-3-*, ada-002)
+MAX_INPUT_TOKENS = 8191
+MAX_REQUEST_TOKENS = 300_000
+MAX_REQUEST_INPUTS = 2048
+
+# ============================================================
+# BACKENDS
+# ============================================================
+
+
+class EmbeddingBackend(Protocol):
+    """
+    An embedding model computed in-process. Models without a
+    registered backend are sent to the OpenAI API.
+    """
+
+    # Size of the vectors it returns
+    dim: int
+
+    def embed_texts(
+        self,
+        texts: List[str],
+        on_batch: Callable[[Dict[int, List[float]]], None] | None = None,
+    ) -> List[List[float]]: ...
+
+    def embed_query(self, query: str) -> List[float]: ...
+
+
+_BACKENDS: Dict[str, EmbeddingBackend] = {
+    LOCAL_EMBEDDING_MODEL: HashingEmbedder(dim=LOCAL_EMBEDDING_DIM),
+}
+
+
+def register_backend(model: str, backend: EmbeddingBackend) -> None:
+    _BACKENDS[model] = backend
+
+
+def get_backend(model: str) -> EmbeddingBackend | None:
+    return _BACKENDS.get(model)
+
+
+def is_local_model(model: str) -> bool:
+    """
+    True if the model runs in-process: no API key, no cost, and
+    usable in dry-run mode.
+    """
+    return model in _BACKENDS
+
+
+# ============================================================
+# DIMENSIONS
+# ============================================================
+
+
+def supports_dimensions(model: str) -> bool:
+    """
+    True if the API can return shortened vectors for the model.
+    """
+    return model.startswith("text-embedding-3")
+
+
+def check_dimensions(model: str, dimensions: int | None, native: int | None = None) -> None:
+    """
+    Raise before anything is embedded if vectors of the model
+    cannot be shortened to `dimensions` (RAG_EMBEDDING_DIM).
+
+    native is the model's full vector size; it defaults to that
+    of the registered backend. Unknown sizes are not checked.
+    """
+    if native is None:
+        backend = get_backend(model)
+        native = backend.dim if backend is not None else None
+    if dimensions and native and dimensions > native:
+        raise ValueError(
+            f"RAG_EMBEDDING_DIM={dimensions} is larger than the {native} dimensions of {model!r}.\n"
+            f"Set RAG_EMBEDDING_DIM to at most {native}, or unset it to keep the full size."
+        )
+
+
+def reduce_dimensions(vector: List[float], dimensions: int) -> List[float]:
+    """
+    Keep the first `dimensions` components and renormalize,
+    which is what the API does for text-embedding-3 models.
+    """
+    if dimensions > len(vector):
+        raise ValueError(f"Cannot reduce a {len(vector)}-dimensional vector to {dimensions} dimensions")
+
+    head = np.asarray(vector[:dimensions], dtype=np.float64)
+    norm = np.linalg.norm(head)
+    return (head / norm if norm else head).tolist()
+
+
+# Retry policy for rate limits (429), server errors (5xx)
+# and dropped connections
+MAX_RETRIES = 6
+RETRY_BASE_DELAY = 0.5
+RETRY_MAX_DELAY = 30.0
+
+
+def _is_retryable(error: Exception) -> bool:
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    return isinstance(error, openai.APIStatusError) and error.status_code >= 500
+
+
+def _retry_delay(error: Exception, attempt: int, base_delay: float) -> float:
+    """
+    Honour Retry-After when the server sends one, otherwise
+    exponential backoff with full jitter.
+    """
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    try:
+        return min(float(retry_after), RETRY_MAX_DELAY)
+    except (TypeError, ValueError):
+        return random.uniform(0, min(RETRY_MAX_DELAY, base_delay * 2**attempt))
+
+
+def _api_client():
+    """
+    The API client, with retries left to _embed_batch.
+    """
+    client = get_ai_client()
+
+    if client is None:
+        raise RuntimeError(
+            "Embedding requested in dry-run mode.\n"
+            f"Disable dry-run, or use the local embedding model (RAG_EMBEDDING_MODEL={LOCAL_EMBEDDING_MODEL})."
+        )
+
+    return client.with_options(max_retries=0)
+
+
+def _embed_batch(
+    client,
+    batch: List[str],
+    model: str,
+    base_delay: float,
+    dimensions: int | None = None,
+) -> List[List[float]]:
+    attempt = 0
+    options = {"dimensions": dimensions} if dimensions else {}
+
+    while True:
+        try:
+            response = client.embeddings.create(
+                model=model,
+                input=batch,
+                **options,
+            )
+        except Exception as e:
+            if attempt >= MAX_RETRIES or not _is_retryable(e):
+                raise
+            time.sleep(_retry_delay(e, attempt, base_delay))
+            attempt += 1
+            continue
+
+        return [item.embedding for item in response.data]
+
 
-from .config import EMBEDDING_MODEL
+# ============================================================
+# TOKEN-AWARE BATCHING
+# ============================================================
+
+
+class Piece(NamedTuple):
+    index: int  # position of the source text
+    text: str
+    tokens: int
+
+
+def split_oversize(
+    texts: List[str],
+    encoder,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+    policy: str = EMBEDDING_OVERSIZE_POLICY,
+) -> List[Piece]:
+    """
+    Turn texts into request inputs of at most max_input_tokens.
+
+    policy="truncate" keeps the first max_input_tokens tokens,
+    policy="split" cuts the text into consecutive pieces.
+    """
+    if policy not in ("truncate", "split"):
+        raise ValueError(f"Unknown oversize policy: {policy!r} (expected 'truncate' or 'split')")
+
+    pieces: List[Piece] = []
+
+    for index, text in enumerate(texts):
+        tokens = encoder.encode(text)
+
+        if len(tokens) <= max_input_tokens:
+            pieces.append(Piece(index, text, len(tokens)))
+        elif policy == "truncate":
+            pieces.append(Piece(index, encoder.decode(tokens[:max_input_tokens]), max_input_tokens))
+        else:
+            for start in range(0, len(tokens), max_input_tokens):
+                part = tokens[start : start + max_input_tokens]
+                pieces.append(Piece(index, encoder.decode(part), len(part)))
+
+    return pieces
+
+
+def pack_batches(
+    pieces: List[Piece],
+    max_tokens: int = MAX_REQUEST_TOKENS,
+    max_inputs: int = MAX_REQUEST_INPUTS,
+) -> List[List[Piece]]:
+    """
+    Greedily fill requests up to the token and input limits,
+    keeping the input order.
+    """
+    batches: List[List[Piece]] = []
+    batch: List[Piece] = []
+    batch_tokens = 0
+
+    for piece in pieces:
+        if batch and (batch_tokens + piece.tokens > max_tokens or len(batch) >= max_inputs):
+            batches.append(batch)
+            batch, batch_tokens = [], 0
+
+        batch.append(piece)
+        batch_tokens += piece.tokens
+
+    if batch:
+        batches.append(batch)
+
+    return batches
+
+
+def _combine(vectors: List[List[float]], weights: List[int]) -> List[float]:
+    """
+    Token-weighted mean of the piece vectors, renormalized.
+    """
+    mean = np.average(np.asarray(vectors, dtype=np.float64), axis=0, weights=weights)
+    return (mean / np.linalg.norm(mean)).tolist()
+
+
+# ============================================================
+# EMBEDDING
+# ============================================================
 
 
 def embed_texts(
     texts: List[str],
     model: str,
-    batch_size: int = 64,
+    batch_size: int = MAX_REQUEST_INPUTS,
+    concurrency: int = EMBEDDING_CONCURRENCY,
+    retry_base_delay: float = RETRY_BASE_DELAY,
+    max_batch_tokens: int = MAX_REQUEST_TOKENS,
+    max_input_tokens: int = MAX_INPUT_TOKENS,
+    oversize: str = EMBEDDING_OVERSIZE_POLICY,
+    encoder=None,
+    on_batch: Callable[[Dict[int, List[float]]], None] | None = None,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
 ) -> List[List[float]]:
     """
     Low-level embedding call.
@@ -20,21 +285,118 @@ def embed_texts(
     - No cost estimation
     - No printing
     - No DRY_RUN
+
+    Requests are packed up to max_batch_tokens tokens and
+    batch_size inputs. Inputs over max_input_tokens follow the
+    `oversize` policy (see split_oversize); split inputs get
+    the token-weighted mean of their piece vectors.
+
+    Up to `concurrency` requests are in flight at once; vectors
+    are returned in the order of `texts`. Rate limits and
+    server errors are retried with jittered backoff.
+
+    on_batch, if given, is called in the calling thread as
+    requests complete, with {text index: vector} for the texts
+    they finished. Requests already in flight when one fails
+    are still reported before the error is raised.
+
+    Models with a registered backend are embedded by it; the
+    request tuning arguments then do not apply.
+
+    `dimensions` shortens the vectors: the API does it for
+    models that support it, otherwise they are truncated and
+    renormalized here.
     """
-    client = get_ai_client()
+    check_dimensions(model, dimensions)
+    api_dimensions = dimensions if dimensions and supports_dimensions(model) else None
+    truncate_to = dimensions if dimensions and not api_dimensions else None
 
-    if client is None:
-        raise RuntimeError("Embedding requested in dry-run mode.\nThis should have been skipped earlier.")
+    backend = get_backend(model)
+    if backend is not None:
+        if truncate_to is None:
+            return backend.embed_texts(texts, on_batch=on_batch)
 
-    vectors: List[List[float]] = []
+        def reduce_batch(done: Dict[int, List[float]]) -> None:
+            if on_batch is not None:
+                on_batch({i: reduce_dimensions(v, truncate_to) for i, v in done.items()})
 
-    for i in range(0, len(texts), batch_size):
-        batch = texts[i : i + batch_size]
-        response = client.embeddings.create(
-            model=model,
-            input=batch,
-        )
-        vectors.extend(item.embedding for item in response.data)
+        vectors = backend.embed_texts(texts, on_batch=reduce_batch)
+        return [reduce_dimensions(v, truncate_to) for v in vectors]
+
+    # Retries are handled here, per batch
+    client = _api_client()
+
+    if encoder is None:
+        encoder = get_encoding(model)
+
+    pieces = split_oversize(texts, encoder, max_input_tokens, oversize)
+    batches = pack_batches(pieces, max_batch_tokens, batch_size)
+
+    # Piece positions per text, to merge split inputs back
+    grouped: List[List[int]] = [[] for _ in texts]
+    for position, piece in enumerate(pieces):
+        grouped[piece.index].append(position)
+
+    piece_vectors: List[List[float] | None] = [None] * len(pieces)
+    remaining = [len(group) for group in grouped]
+    vectors: List[List[float] | None] = [None] * len(texts)
+
+    offsets = [0]
+    for batch in batches[:-1]:
+        offsets.append(offsets[-1] + len(batch))
+
+    def embed(number: int) -> int:
+        batch = batches[number]
+        batch_vectors = _embed_batch(client, [piece.text for piece in batch], model, retry_base_delay, api_dimensions)
+        piece_vectors[offsets[number] : offsets[number] + len(batch)] = batch_vectors
+        return number
+
+    def finish(number: int) -> None:
+        done: Dict[int, List[float]] = {}
+
+        for piece in batches[number]:
+            remaining[piece.index] -= 1
+            if remaining[piece.index]:
+                continue
+
+            group = grouped[piece.index]
+            if len(group) == 1:
+                vectors[piece.index] = piece_vectors[group[0]]
+            else:
+                vectors[piece.index] = _combine([piece_vectors[p] for p in group], [pieces[p].tokens for p in group])
+            if truncate_to is not None:
+                vectors[piece.index] = reduce_dimensions(vectors[piece.index], truncate_to)
+            done[piece.index] = vectors[piece.index]
+
+        if on_batch is not None and done:
+            on_batch(done)
+
+    if concurrency <= 1 or len(batches) < 2:
+        for number in range(len(batches)):
+            finish(embed(number))
+        return vectors
+
+    error: BaseException | None = None
+
+    # The pool size bounds the in-flight window
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="embed") as executor:
+        futures = [executor.submit(embed, number) for number in range(len(batches))]
+
+        for future in as_completed(futures):
+            if future.cancelled():
+                continue
+            try:
+                number = future.result()
+            except BaseException as e:
+                if error is None:
+                    error = e
+                    for pending in futures:
+                        pending.cancel()
+                continue
+            finish(number)
+
+    if error is not None:
+        raise error
 
     return vectors
 
@@ -42,12 +404,38 @@ def embed_texts(
 def embed_query(
     query: str,
     model: str = EMBEDDING_MODEL,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
 ) -> List[float]:
-    client = get_ai_client()
+    """
+    Embed one query, shortened like embed_texts so it matches
+    the stored vectors (API requests are retried like batches).
+    """
+    return embed_queries([query], model=model, dimensions=dimensions)[0]
 
-    response = client.embeddings.create(
-        model=model,
-        input=query,
-    )
 
-    return response.data[0].embedding
+def embed_queries(
+    queries: List[str],
+    model: str = EMBEDDING_MODEL,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
+) -> List[List[float]]:
+    """
+    Embed several queries with one API request (per
+    MAX_REQUEST_INPUTS queries), shortened like embed_query.
+    """
+    check_dimensions(model, dimensions)
+    api_dimensions = dimensions if dimensions and supports_dimensions(model) else None
+
+    backend = get_backend(model)
+    if backend is not None:
+        vectors = [backend.embed_query(query) for query in queries]
+    else:
+        client = _api_client()
+        vectors = []
+        for start in range(0, len(queries), MAX_REQUEST_INPUTS):
+            batch = queries[start : start + MAX_REQUEST_INPUTS]
+            vectors.extend(_embed_batch(client, batch, model, RETRY_BASE_DELAY, api_dimensions))
+
+    if dimensions and not api_dimensions:
+        vectors = [reduce_dimensions(vector, dimensions) for vector in vectors]
+
+    return vectors
@@ -0,0 +1,96 @@
+# infra/git.py
+"""
+Thin wrappers around the git CLI.
+
+- No domain logic
+- No printing
+- Every function returns None when git is unavailable,
+  the path is not inside a work tree or a revision is
+  unknown, so callers can fall back to a filesystem scan
+
+All paths are POSIX paths relative to the directory passed
+in (which may be a subdirectory of the work tree).
+"""
+
+from __future__ import annotations
+
+import subprocess
+from pathlib import Path
+
+
+def _git(repo_root: Path, *args: str) -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_root), *args],
+            capture_output=True,
+            text=True,
+            encoding="utf-8",
+            errors="surrogateescape",
+            check=False,
+        )
+    except OSError:
+        return None
+
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def _split_z(output: str) -> set[str]:
+    return {path for path in output.split("\0") if path}
+
+
+def git_head(repo_root: Path) -> str | None:
+    """
+    Return the commit SHA checked out at repo_root.
+    """
+    out = _git(repo_root, "rev-parse", "--verify", "--quiet", "HEAD")
+    return out.strip() if out else None
+
+
+def git_changed_paths(repo_root: Path, since: str) -> set[str] | None:
+    """
+    Paths that may differ from what was indexed at commit `since`:
+
+    - changed, added and deleted between `since` and the working
+      tree (committed, staged and unstaged changes; a rename is
+      reported as its old and its new path)
+    - untracked files that are not ignored
+
+    Deleted untracked files cannot be reported by git; see
+    git_tracked_paths.
+    """
+    diff = _git(repo_root, "diff", "--name-only", "--no-renames", "--relative", "-z", since, "--")
+    if diff is None:
+        return None
+
+    untracked = _git(repo_root, "ls-files", "--others", "--exclude-standard", "-z")
+    if untracked is None:
+        return None
+
+    return _split_z(diff) | _split_z(untracked)
+
+
+def git_dirty_paths(repo_root: Path) -> set[str] | None:
+    """
+    Paths whose working tree differs from HEAD (the `git status`
+    set: staged, unstaged and untracked, not ignored).
+    """
+    return git_changed_paths(repo_root, "HEAD")
+
+
+def git_exclude_file(repo_root: Path) -> Path | None:
+    """
+    The repository's .git/info/exclude (which may not exist).
+    """
+    out = _git(repo_root, "rev-parse", "--git-path", "info/exclude")
+    # Relative to repo_root unless the git dir is elsewhere
+    return repo_root / out.strip() if out else None
+
+
+def git_tracked_paths(repo_root: Path) -> set[str] | None:
+    """
+    Paths tracked in the git index (read from the index only).
+    """
+    out = _git(repo_root, "ls-files", "-z")
+    return None if out is None else _split_z(out)
@@ -0,0 +1,112 @@
+# infra/local_embeddings.py
+"""
+Offline embedding backend (pure NumPy, no network).
+
+Texts are embedded by signed feature hashing: identifiers are
+split into lower-case sub-words (snake_case, camelCase, digits),
+and every sub-word, adjacent sub-word pair and character
+trigram is hashed into one of `dim` buckets with a +1/-1 sign.
+Counts are dampened with 1 + log(tf), weighted per feature
+kind, and the vector is L2-normalized, so inner product is
+cosine similarity.
+
+The mapping is stateless: a text always gets the same vector,
+whatever else is indexed. That keeps it valid for the
+(model, text) embedding cache and for incremental index
+updates, which corpus-fitted weights (IDF, LSA) would not be.
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from collections import Counter
+from typing import Callable, Dict, Iterator, List
+
+import numpy as np
+
+_WORD = re.compile(r"[A-Za-z0-9]+")
+_SUBWORD = re.compile(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|\d+")
+
+# English filler and Python boilerplate that match everything
+STOPWORDS = frozenset("a an and are as at be by for from in is it of on or the this to with self cls def return none".split())
+
+# Relative weight of each feature kind
+WORD_WEIGHT = 1.0
+BIGRAM_WEIGHT = 0.5
+TRIGRAM_WEIGHT = 0.3
+
+
+def subwords(text: str) -> Iterator[str]:
+    """
+    Lower-case sub-words of every identifier in text:
+    "AdapterFactory.get_item" -> adapter, factory, get, item.
+    """
+    for word in _WORD.findall(text):
+        for part in _SUBWORD.findall(word):
+            part = part.lower()
+            if part not in STOPWORDS:
+                yield part
+
+
+def trigrams(word: str) -> Iterator[str]:
+    padded = f"#{word}#"
+    for i in range(len(padded) - 2):
+        yield padded[i : i + 3]
+
+
+class HashingEmbedder:
+    """
+    Usage:
+        embedder = HashingEmbedder(dim=1024)
+        matrix = embedder.embed_matrix(texts)
+    """
+
+    def __init__(self, dim: int):
+        self.dim = dim
+
+    def _accumulate(self, vector: np.ndarray, features: Counter, weight: float) -> None:
+        if not features:
+            return
+
+        count = len(features)
+        hashes = np.fromiter((zlib.crc32(f.encode()) for f in features), dtype=np.uint32, count=count)
+        tf = np.fromiter(features.values(), dtype=np.float32, count=count)
+
+        signs = np.where(hashes & 0x80000000, -1.0, 1.0).astype(np.float32)
+        np.add.at(vector, hashes % self.dim, signs * weight * (1.0 + np.log(tf)))
+
+    def embed_one(self, text: str) -> np.ndarray:
+        words = list(subwords(text))
+        vector = np.zeros(self.dim, dtype=np.float32)
+
+        # Kind prefixes keep the three feature spaces apart
+        self._accumulate(vector, Counter("w:" + w for w in words), WORD_WEIGHT)
+        self._accumulate(vector, Counter(f"b:{a} {b}" for a, b in zip(words, words[1:], strict=False)), BIGRAM_WEIGHT)
+        self._accumulate(vector, Counter("c:" + t for w in words for t in trigrams(w)), TRIGRAM_WEIGHT)
+
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def embed_matrix(self, texts: List[str]) -> np.ndarray:
+        matrix = np.empty((len(texts), self.dim), dtype=np.float32)
+        for i, text in enumerate(texts):
+            matrix[i] = self.embed_one(text)
+        return matrix
+
+    # --------------------------------------------------
+    # EmbeddingBackend
+    # --------------------------------------------------
+
+    def embed_texts(
+        self,
+        texts: List[str],
+        on_batch: Callable[[Dict[int, List[float]]], None] | None = None,
+    ) -> List[List[float]]:
+        vectors = self.embed_matrix(texts).tolist()
+        if on_batch is not None and vectors:
+            on_batch(dict(enumerate(vectors)))
+        return vectors
+
+    def embed_query(self, query: str) -> List[float]:
+        return self.embed_one(query).tolist()
@@ -2,13 +2,265 @@
 from __future__ import annotations
 
 import json
-from typing import Iterable, List, Tuple
+import os
+import time
+from typing import Iterable, List, NamedTuple, Sequence, Tuple
 
 import faiss
 import numpy as np
 
+from ai_dev_assistant.tools.artifacts import load_embeddings, resolve_embeddings_path
 from ai_dev_assistant.tools.defaults import get_faiss_index_path, get_faiss_meta_path
 
+# Rows copied, widened to float32 and normalized at a time, so a
+# memory-mapped matrix is never fully materialized twice
+ADD_BLOCK_ROWS = 16384
+
+# ============================================================
+# LABELS
+# ============================================================
+#
+# Every vector gets a stable int64 label, never reused, mapped to
+# its chunk id; results come back as labels, so updates never
+# renumber other vectors. Flat and SQ8 indexes are wrapped in an
+# IndexIDMap2, IVF indexes store labels natively, and HNSW graphs
+# (which cannot drop nodes) label vectors by insertion position,
+# renumbered when removed vectors are compacted away.
+
+# ============================================================
+# METADATA
+# ============================================================
+#
+# Each label has a chunk type code, a file id and a package id,
+# kept in numpy arrays indexed by label (~9 bytes per vector;
+# -1: removed). Codes index small string tables saved with the
+# ids. Filtered searches turn them into a bitmap over labels
+# that FAISS checks while scanning (IDSelectorBitmap), so the
+# top-k is taken among matching vectors only.
+
+
+class ChunkMeta(NamedTuple):
+    # Chunk type ("class_overview", ...)
+    type: str
+    # File path relative to the repo root ("src/pkg/mod.py")
+    file: str
+    # Dotted package of the file ("pkg"; "" at top level)
+    package: str
+
+
+# Field -> code dtype (at most 127 chunk types)
+METADATA_FIELDS = {"type": "int8", "file": "int32", "package": "int32"}
+
+# ============================================================
+# INDEX TYPES
+# ============================================================
+#
+# flat  - exact search over float32 vectors (4 bytes / dim)
+# sq8   - 8-bit scalar quantization (1 byte / dim, ~4x smaller)
+# ivfpq - inverted lists + product quantization, one byte per
+#         PQ_DIMS_PER_CODE dims (~32x smaller), probes only part
+#         of the corpus per query
+# ivfflat - inverted lists over float32 vectors: exact scores,
+#         scans nprobe of nlist lists per query
+# hnsw  - graph over float32 vectors (plus ~2 * M links per
+#         vector): exact scores, visits ~efSearch nodes per query
+#
+# Trained indexes (sq8, ivf*) are trained on a random sample of
+# at most TRAIN_SAMPLE_ROWS vectors. Quantized scores are
+# approximate; with rerank > 0, rerank * k candidates are
+# re-scored exactly against the original vectors in embeddings.npy.
+#
+# "auto" picks the type from the vector count (choose_index_type):
+# a flat scan is fastest up to a few ten thousand vectors, a graph
+# beyond that, and inverted lists once a graph is too slow to build.
+
+INDEX_TYPES = ("flat", "sq8", "ivfpq", "ivfflat", "hnsw")
+AUTO_INDEX_TYPE = "auto"
+
+FLAT_MAX_VECTORS = 50_000
+HNSW_MAX_VECTORS = 500_000
+
+# Links per HNSW node, and candidate list sizes when building / searching
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+
+# Removed vectors stay in an HNSW graph (and are over-fetched at
+# search time) until they exceed this fraction of its nodes; the
+# graph is then rebuilt from the remaining vectors
+HNSW_MAX_REMOVED_FRACTION = 0.2
+
+TRAIN_SAMPLE_ROWS = 16384
+PQ_DIMS_PER_CODE = 8
+
+# PQ codebook training (one 2**nbits-centroid k-means per
+# sub-space) is capped to this many points per centroid and
+# k-means iterations
+PQ_POINTS_PER_CENTROID = 64
+PQ_TRAIN_ITERATIONS = 10
+
+# k-means wants this many training points per centroid
+_POINTS_PER_CENTROID = 39
+
+
+def _normalized(vectors: np.ndarray) -> np.ndarray:
+    block = np.array(vectors, dtype="float32")
+    faiss.normalize_L2(block)
+    return block
+
+
+def _pq_subquantizers(dim: int) -> int:
+    """
+    Largest divisor of dim giving at least PQ_DIMS_PER_CODE
+    dimensions per code.
+    """
+    m = max(1, dim // PQ_DIMS_PER_CODE)
+    while dim % m:
+        m -= 1
+    return m
+
+
+def choose_index_type(count: int) -> str:
+    """
+    Index type for a corpus of count vectors.
+    """
+    if count <= FLAT_MAX_VECTORS:
+        return "flat"
+    if count <= HNSW_MAX_VECTORS:
+        return "hnsw"
+    return "ivfflat"
+
+
+def _ivf_lists(count: int) -> int:
+    train = min(count, TRAIN_SAMPLE_ROWS)
+    return max(1, min(int(4 * np.sqrt(count)), train // _POINTS_PER_CENTROID))
+
+
+def index_params(index_type: str, dim: int, count: int) -> dict:
+    """
+    Parameters of a new index for count vectors.
+    """
+    if index_type == AUTO_INDEX_TYPE:
+        index_type = choose_index_type(count)
+    if index_type not in INDEX_TYPES:
+        raise ValueError(f"Unknown index type: {index_type!r} (expected one of {INDEX_TYPES} or {AUTO_INDEX_TYPE!r})")
+
+    params: dict = {"type": index_type}
+
+    if index_type == "ivfpq":
+        nlist = _ivf_lists(count)
+        # 8-bit codes need 256 centroids per sub-space; small corpora get fewer
+        train = min(count, TRAIN_SAMPLE_ROWS)
+        nbits = int(np.clip(np.floor(np.log2(max(train, 2) / _POINTS_PER_CENTROID)), 1, 8))
+        params.update(
+            nlist=nlist,
+            m=_pq_subquantizers(dim),
+            nbits=nbits,
+            nprobe=min(nlist, max(1, nlist // 8)),
+        )
+    elif index_type == "ivfflat":
+        nlist = _ivf_lists(count)
+        params.update(nlist=nlist, nprobe=min(nlist, max(1, nlist // 16)))
+    elif index_type == "hnsw":
+        params.update(M=HNSW_M, efConstruction=HNSW_EF_CONSTRUCTION, efSearch=HNSW_EF_SEARCH)
+
+    return params
+
+
+def label_runs(labels: Sequence[int]) -> list[list[int]]:
+    """
+    Ascending labels as [first, count] runs: a freshly built
+    index is a single run.
+    """
+    runs: list[list[int]] = []
+    for label in labels:
+        if runs and runs[-1][0] + runs[-1][1] == label:
+            runs[-1][1] += 1
+        else:
+            runs.append([label, 1])
+    return runs
+
+
+def expand_runs(runs: Iterable[Sequence[int]]) -> list[int]:
+    return [label for first, count in runs for label in range(first, first + count)]
+
+
+def _package_matches(package: str, wanted: set[str]) -> bool:
+    # A package filter includes its subpackages
+    return any(package == p or package.startswith(p + ".") for p in wanted)
+
+
+def _with_labels(index: faiss.Index) -> faiss.IndexIDMap2:
+    """
+    Move a bare flat / SQ8 index (saved before labels) into an
+    id map, labelling vectors by position.
+    """
+    vectors = index.reconstruct_n(0, index.ntotal)
+    empty = faiss.clone_index(index)
+    empty.reset()
+
+    wrapped = faiss.IndexIDMap2(empty)
+    wrapped.add_with_ids(vectors, np.arange(len(vectors), dtype="int64"))
+    return wrapped
+
+
+# Zero-copy loading: flat codes (flat, SQ8, HNSW storage) and
+# inverted lists are mapped from the file instead of read, so
+# load time does not grow with the index and processes share the
+# OS page cache. Mapped indexes must not be modified.
+MMAP_FLAGS = {
+    "flat": faiss.IO_FLAG_MMAP_IFC,
+    "sq8": faiss.IO_FLAG_MMAP_IFC,
+    "hnsw": faiss.IO_FLAG_MMAP_IFC,
+    "ivfflat": faiss.IO_FLAG_MMAP,
+    "ivfpq": faiss.IO_FLAG_MMAP,
+}
+
+
+def create_index(dim: int, params: dict) -> faiss.Index:
+    if params["type"] == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatIP(dim))
+    if params["type"] == "sq8":
+        return faiss.IndexIDMap2(faiss.index_factory(dim, "SQ8", faiss.METRIC_INNER_PRODUCT))
+
+    if params["type"] == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, params["M"], faiss.METRIC_INNER_PRODUCT)
+        index.hnsw.efConstruction = params["efConstruction"]
+        index.hnsw.efSearch = params["efSearch"]
+        return index
+
+    if params["type"] == "ivfflat":
+        index = faiss.index_factory(dim, f"IVF{params['nlist']},Flat", faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = params["nprobe"]
+        return index
+
+    index = faiss.index_factory(
+        dim,
+        f"IVF{params['nlist']},PQ{params['m']}x{params['nbits']}",
+        faiss.METRIC_INNER_PRODUCT,
+    )
+    index.nprobe = params["nprobe"]
+    # Polysemous codes (for Hamming pre-filtering, unused here) are
+    # on by default and take minutes to train at high dimension
+    index.do_polysemous_training = False
+    index.pq.cp.max_points_per_centroid = PQ_POINTS_PER_CENTROID
+    index.pq.cp.min_points_per_centroid = 1
+    index.pq.cp.niter = PQ_TRAIN_ITERATIONS
+    return index
+
+
+def training_sample(vectors: np.ndarray, rows: int = TRAIN_SAMPLE_ROWS, seed: int = 0) -> np.ndarray:
+    """
+    Normalized random sample of the rows (sorted, so a
+    memory-mapped matrix is read front to back).
+    """
+    if len(vectors) <= rows:
+        return _normalized(vectors)
+
+    picked = np.sort(np.random.default_rng(seed).choice(len(vectors), size=rows, replace=False))
+    return _normalized(vectors[picked])
+
+
 # ============================================================
 # VECTOR STORE
 # ============================================================
@@ -19,69 +271,455 @@ class VectorStore:
     FAISS-backed vector store for semantic search.
     """
 
-    def __init__(self, dim: int):
-        # Inner product index (use normalized vectors = cosine similarity)
-        self.index = faiss.IndexFlatIP(dim)
-        self.ids: list[str] = []
+    def __init__(
+        self,
+        dim: int,
+        model: str | None = None,
+        index_type: str = "flat",
+        rerank: int = 0,
+        partition: str | None = None,
+    ):
+        self.dim = dim
+        # Chunk type of a sub-index (None: the main index)
+        self.partition = partition
+        # Embedding model of the vectors (None: unknown, legacy data)
+        self.model = model
+        # "auto" is resolved by build(), once the corpus size is known
+        self.params = {"type": index_type} if index_type == AUTO_INDEX_TYPE else index_params(index_type, dim, 0)
+        self.rerank = rerank
+
+        # Inner product index (use normalized vectors = cosine similarity).
+        # Other index types are created by build(), once the corpus is known.
+        self.index: faiss.Index | None = create_index(dim, self.params) if index_type == "flat" else None
+
+        # Label -> chunk id (ascending labels) and back
+        self._chunks: dict[int, str] = {}
+        self._labels: dict[str, int] = {}
+        self._next_label = 0
+        # Removed vectors still in an HNSW graph
+        self._removed = 0
+
+        # Field -> string table, its reverse lookup and the codes
+        # by label (see METADATA; None: built without metadata)
+        self._tables: dict[str, list[str]] | None = None
+        self._lookups: dict[str, dict[str, int]] = {}
+        self._codes: dict[str, np.ndarray] = {}
+
+        # Result of tools/tune_index (None: default settings)
+        self.tuning: dict | None = None
+
+        # Repository whose embeddings.npy is used for re-scoring (None: active)
+        self.repo_name: str | None = None
+
+        # Set by load()
+        self.read_only = False
+        self.memory_mapped = False
+        self.load_seconds: float | None = None
+        self._originals: tuple[dict[str, int], np.ndarray] | None = None
+
+    @property
+    def index_type(self) -> str:
+        return self.params["type"]
+
+    @property
+    def ids(self) -> list[str]:
+        """
+        Indexed chunk ids, oldest first.
+        """
+        return list(self._chunks.values())
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, chunk_id: str) -> bool:
+        return chunk_id in self._labels
+
+    @property
+    def has_metadata(self) -> bool:
+        return self._tables is not None
+
+    @property
+    def _is_ivf(self) -> bool:
+        return self.index_type in ("ivfpq", "ivfflat")
+
+    def _check_writable(self) -> None:
+        # A memory-mapped FAISS index aborts the process when modified
+        if self.read_only:
+            raise RuntimeError("This index was loaded read-only; load it with read_only=False to modify it")
+
+    def describe(self) -> str:
+        """
+        One-line summary: type, size and how it was loaded.
+        """
+        text = f"{self.index_type} index, {len(self)} vectors"
+        if self.partition is not None:
+            text = f"{self.partition} {text}"
+        if self.load_seconds is not None:
+            text += f", loaded in {self.load_seconds * 1000:.1f} ms"
+            if self.memory_mapped:
+                text += " (memory-mapped)"
+        return text
 
     # --------------------------------------------------
     # BUILD
     # --------------------------------------------------
 
-    def build(self, records: Iterable[dict]) -> None:
+    def build(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Sequence[ChunkMeta] | None = None,
+    ) -> None:
         """
-        Build FAISS index from embedding records.
+        Build FAISS index from an embedding matrix.
 
-        Each record must contain:
-        - id: str
-        - embedding: List[float]
+        vectors has one row per id (float32 or float16, possibly
+        memory-mapped); it is not modified. Quantized index
+        types are trained on a sample of it first.
+
+        metadata (one ChunkMeta per id) enables filtered search;
+        the vectors added later must then come with theirs.
         """
 
-        vectors: list[list[float]] = []
-        ids: list[str] = []
+        self._check_writable()
+        if not len(ids):
+            raise ValueError("No vectors provided to build FAISS index")
 
-        for record in records:
-            vectors.append(record["embedding"])
-            ids.append(record["id"])
+        self.params = index_params(self.index_type, self.dim, len(ids))
+        self.index = create_index(self.dim, self.params)
+        self._chunks = {}
+        self._labels = {}
+        self._next_label = 0
+        self._removed = 0
+        self._set_tables(None if metadata is None else {field: [] for field in METADATA_FIELDS})
 
-        if not vectors:
-            raise ValueError("No vectors provided to build FAISS index")
+        if not self.index.is_trained:
+            self.index.train(training_sample(vectors))
+
+        self.add(ids, vectors, metadata)
+
+    # --------------------------------------------------
+    # INCREMENTAL UPDATES
+    # --------------------------------------------------
+
+    def add(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Sequence[ChunkMeta] | None = None,
+    ) -> int:
+        """
+        Add embedding rows for chunks not in the index yet
+        (see upsert() for replacing vectors). metadata is required
+        if, and only if, the index was built with metadata.
+
+        Returns the number of vectors added.
+        """
+
+        self._check_writable()
+        if len(ids) != len(vectors):
+            raise ValueError(f"Got {len(ids)} ids for {len(vectors)} vectors")
+        if metadata is not None and len(metadata) != len(ids):
+            raise ValueError(f"Got {len(ids)} ids for {len(metadata)} metadata entries")
+        if self.has_metadata and metadata is None:
+            raise ValueError("This index stores chunk metadata; pass the metadata of the added vectors")
+        if not self.has_metadata and metadata is not None:
+            raise ValueError("This index was built without chunk metadata; rebuild it to store metadata")
+        if self.index is None:
+            raise RuntimeError(f"A {self.index_type} index must be built before vectors are added")
+
+        present = [chunk_id for chunk_id in ids if chunk_id in self._labels]
+        if present or len(set(ids)) != len(ids):
+            raise ValueError(f"Chunk ids already indexed or repeated (use upsert): {present[:5]}")
+
+        labels = np.arange(self._next_label, self._next_label + len(ids), dtype="int64")
+
+        for start in range(0, len(ids), ADD_BLOCK_ROWS):
+            # Normalize for cosine similarity
+            block = _normalized(vectors[start : start + ADD_BLOCK_ROWS])
+
+            if self.index_type == "hnsw":
+                # Graph positions are the labels: nothing is ever dropped
+                self.index.add(block)
+            else:
+                self.index.add_with_ids(block, labels[start : start + len(block)])
+
+        for label, chunk_id in zip(labels.tolist(), ids, strict=True):
+            self._chunks[label] = chunk_id
+            self._labels[chunk_id] = label
+        self._next_label += len(ids)
+
+        if metadata is not None:
+            self._set_metadata(labels, metadata)
+
+        return len(ids)
+
+    def upsert(
+        self,
+        ids: Sequence[str],
+        vectors: np.ndarray,
+        metadata: Sequence[ChunkMeta] | None = None,
+    ) -> int:
+        """
+        Insert or replace the vectors of the given chunks; a
+        replaced vector gets a new label.
+
+        Returns the number of vectors written.
+        """
+        self.remove(ids)
+        return self.add(ids, vectors, metadata)
+
+    def remove(self, chunk_ids: Iterable[str]) -> int:
+        """
+        Remove vectors by chunk id. Unknown ids are ignored.
+
+        HNSW graphs cannot drop nodes: removed vectors stay in
+        the index and are skipped at search time, until there are
+        more than HNSW_MAX_REMOVED_FRACTION of them and the graph
+        is compacted.
+
+        Returns the number of vectors removed.
+        """
+
+        self._check_writable()
+        labels = [self._labels.pop(chunk_id) for chunk_id in set(chunk_ids) if chunk_id in self._labels]
+
+        if not labels:
+            return 0
 
-        matrix = np.array(vectors, dtype="float32")
+        for label in labels:
+            del self._chunks[label]
+        for codes in self._codes.values():
+            codes[labels] = -1
 
-        # Normalize for cosine similarity
-        faiss.normalize_L2(matrix)
+        if self.index_type == "hnsw":
+            self._removed += len(labels)
+            if self._removed > HNSW_MAX_REMOVED_FRACTION * self.index.ntotal:
+                self._compact()
+        else:
+            self.index.remove_ids(np.array(labels, dtype="int64"))
 
-        self.index.add(matrix)
-        self.ids = ids
+        return len(labels)
+
+    def _compact(self) -> None:
+        """
+        Rebuild an HNSW graph without its removed vectors. Graph
+        positions are the labels, so the remaining vectors are
+        relabelled 0..n-1 (in label order).
+        """
+        live = np.fromiter(self._chunks, dtype="int64", count=len(self._chunks))
+
+        index = create_index(self.dim, self.params)
+        for start in range(0, len(live), ADD_BLOCK_ROWS):
+            # Stored vectors are normalized already
+            index.add(self.index.reconstruct_batch(live[start : start + ADD_BLOCK_ROWS]))
+
+        self.index = index
+        self._chunks = dict(enumerate(self._chunks.values()))
+        self._labels = {chunk_id: label for label, chunk_id in self._chunks.items()}
+        self._next_label = len(live)
+        self._removed = 0
+        self._codes = {field: codes[live] for field, codes in self._codes.items()}
+
+    # --------------------------------------------------
+    # METADATA
+    # --------------------------------------------------
+
+    def _set_tables(self, tables: dict[str, list[str]] | None) -> None:
+        self._tables = tables
+        self._lookups = {} if tables is None else {field: {v: i for i, v in enumerate(t)} for field, t in tables.items()}
+        self._codes = {} if tables is None else {field: np.full(0, -1, dtype) for field, dtype in METADATA_FIELDS.items()}
+
+    def _set_metadata(self, labels: np.ndarray, metadata: Sequence[ChunkMeta]) -> None:
+        for field in METADATA_FIELDS:
+            table, lookup = self._tables[field], self._lookups[field]
+            values = [getattr(meta, field) for meta in metadata]
+            for value in values:
+                if value not in lookup:
+                    lookup[value] = len(table)
+                    table.append(value)
+
+            codes = self._codes[field]
+            if len(codes) < self._next_label:
+                codes = np.concatenate([codes, np.full(self._next_label - len(codes), -1, codes.dtype)])
+            codes[labels] = [lookup[value] for value in values]
+            self._codes[field] = codes
+
+        if len(self._tables["type"]) > np.iinfo(METADATA_FIELDS["type"]).max:
+            raise ValueError(f"Too many chunk types for the metadata codes: {len(self._tables['type'])}")
+
+    def chunk_meta(self, chunk_id: str) -> ChunkMeta | None:
+        """
+        Stored metadata of an indexed chunk (None: unknown chunk
+        or index without metadata).
+        """
+        if not self.has_metadata or chunk_id not in self._labels:
+            return None
+        label = self._labels[chunk_id]
+        return ChunkMeta(**{field: self._tables[field][self._codes[field][label]] for field in METADATA_FIELDS})
+
+    def _selection(
+        self,
+        types: Iterable[str] | None,
+        path_prefix: str | None,
+        packages: Iterable[str] | None,
+    ) -> np.ndarray | None:
+        """
+        Mask over labels of the vectors matching every given
+        filter (None: no filter).
+        """
+        if types is None and path_prefix is None and packages is None:
+            return None
+        if not self.has_metadata:
+            raise ValueError("This index has no chunk metadata to filter on; rebuild it with build_vector_store")
+
+        matches = {}
+        if types is not None:
+            wanted = set(types)
+            matches["type"] = lambda value: value in wanted
+        if path_prefix is not None:
+            prefix = path_prefix.replace("\\", "/").removeprefix("./")
+            matches["file"] = lambda value: value.startswith(prefix)
+        if packages is not None:
+            wanted_packages = set(packages)
+            matches["package"] = lambda value: _package_matches(value, wanted_packages)
+
+        mask = np.ones(self._next_label, dtype=bool)
+        for field, match in matches.items():
+            codes = [code for code, value in enumerate(self._tables[field]) if match(value)]
+            # Removed labels (-1) never match
+            mask &= np.isin(self._codes[field], codes)
+
+        return mask
+
+    def configure(self, nprobe: int | None = None, ef_search: int | None = None) -> None:
+        """
+        Set the default speed / recall of an approximate index
+        (nprobe for IVF, ef_search for HNSW). Settings that do
+        not apply to the index type are ignored.
+        """
+        if nprobe is not None and self._is_ivf:
+            self.params["nprobe"] = min(nprobe, self.params["nlist"])
+            self.index.nprobe = self.params["nprobe"]
+        if ef_search is not None and self.index_type == "hnsw":
+            self.params["efSearch"] = ef_search
+            self.index.hnsw.efSearch = ef_search
 
     # --------------------------------------------------
     # SAVE / LOAD
     # --------------------------------------------------
 
     def save(self) -> None:
-        get_faiss_index_path().parent.mkdir(parents=True, exist_ok=True)
+        """
+        Write the index and its metadata, each through a temporary
+        file, so a resident reader never sees a partial file.
+        """
+        self._check_writable()
+        index_path = get_faiss_index_path(partition=self.partition)
+        meta_path = get_faiss_meta_path(partition=self.partition)
+        index_path.parent.mkdir(parents=True, exist_ok=True)
 
-        faiss.write_index(self.index, str(get_faiss_index_path()))
-        get_faiss_meta_path().write_text(
+        tmp_index = index_path.with_name(index_path.name + ".tmp")
+        faiss.write_index(self.index, str(tmp_index))
+
+        metadata = None
+        if self.has_metadata:
+            live = np.fromiter(self._chunks, dtype="int64", count=len(self._chunks))
+            # Codes aligned with ids
+            metadata = {
+                "tables": self._tables,
+                "codes": {field: codes[live].tolist() for field, codes in self._codes.items()},
+            }
+
+        tmp_meta = meta_path.with_name(meta_path.name + ".tmp")
+        tmp_meta.write_text(
             json.dumps(
                 {
                     "ids": self.ids,
-                    "dim": self.index.d,
+                    "labels": label_runs(list(self._chunks)),
+                    "next_label": self._next_label,
+                    "removed": self._removed,
+                    "dim": self.dim,
+                    "model": self.model,
+                    "index": self.params,
+                    "rerank": self.rerank,
+                    "tuning": self.tuning,
+                    "metadata": metadata,
                 },
                 indent=2,
             )
         )
 
+        os.replace(tmp_index, index_path)
+        os.replace(tmp_meta, meta_path)
+
     @classmethod
-    def load(cls) -> "VectorStore":
-        if not get_faiss_index_path().exists() or not get_faiss_meta_path().exists():
+    def load(
+        cls,
+        repo_name: str | None = None,
+        *,
+        partition: str | None = None,
+        read_only: bool = False,
+        mmap: bool | None = None,
+    ) -> "VectorStore":
+        """
+        Load the saved index of a repository (default: active),
+        or one of its per-chunk-type sub-indexes (partition).
+
+        A read_only store can only be searched. It is memory-mapped
+        from the index file unless mmap=False; mmap requires
+        read_only. The time taken is kept in load_seconds.
+        """
+        mmap = read_only if mmap is None else mmap
+        if mmap and not read_only:
+            raise ValueError("A memory-mapped index must be loaded read_only")
+
+        started = time.perf_counter()
+
+        index_path = get_faiss_index_path(repo_name, partition)
+        meta_path = get_faiss_meta_path(repo_name, partition)
+
+        if not index_path.exists() or not meta_path.exists():
             raise FileNotFoundError("FAISS index or metadata not found")
 
-        meta = json.loads(get_faiss_meta_path().read_text())
-        store = cls(dim=meta["dim"])
-        store.index = faiss.read_index(str(get_faiss_index_path()))
-        store.ids = meta["ids"]
+        meta = json.loads(meta_path.read_text())
+        store = cls(dim=meta["dim"], model=meta.get("model"), rerank=meta.get("rerank", 0), partition=partition)
+        store.params = meta.get("index", {"type": "flat"})
+
+        flags = faiss.IO_FLAG_READ_ONLY if read_only else 0
+        if mmap:
+            flags |= MMAP_FLAGS[store.index_type]
+        store.index = faiss.read_index(str(index_path), flags)
+        store.read_only = read_only
+        store.memory_mapped = mmap
+        store.repo_name = repo_name
+        store.tuning = meta.get("tuning")
+
+        if "labels" in meta:
+            labels = expand_runs(meta["labels"])
+            store._next_label = meta["next_label"]
+            store._removed = meta["removed"]
+        else:
+            # Saved before labels: positions, with None for removed vectors
+            labels = list(range(len(meta["ids"])))
+            store._next_label = len(labels)
+            store._removed = meta["ids"].count(None) if store.index_type == "hnsw" else 0
+            # Read-only: results come back as positions, which are the labels
+            if store.index_type in ("flat", "sq8") and not read_only:
+                store.index = _with_labels(store.index)
+
+        store._chunks = {label: chunk_id for label, chunk_id in zip(labels, meta["ids"], strict=True) if chunk_id is not None}
+        store._labels = {chunk_id: label for label, chunk_id in store._chunks.items()}
+
+        if meta.get("metadata"):
+            store._set_tables(meta["metadata"]["tables"])
+            live = np.fromiter(store._chunks, dtype="int64", count=len(store._chunks))
+            for field, dtype in METADATA_FIELDS.items():
+                codes = np.full(store._next_label, -1, dtype)
+                codes[live] = meta["metadata"]["codes"][field]
+                store._codes[field] = codes
+
+        store.load_seconds = time.perf_counter() - started
 
         return store
 
@@ -89,28 +727,168 @@ class VectorStore:
     # SEARCH
     # --------------------------------------------------
 
+    def use_originals(self, ids: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Set the full-precision vectors used for re-scoring
+        (by default the repo's embeddings.npy, memory-mapped).
+        """
+        self._originals = ({chunk_id: row for row, chunk_id in enumerate(ids)}, vectors)
+
+    def _load_originals(self) -> tuple[dict[str, int], np.ndarray] | None:
+        if self._originals is None:
+            path = resolve_embeddings_path(self.repo_name)
+            if path.exists():
+                self.use_originals(*load_embeddings(path))
+        return self._originals
+
+    def _rescore(self, vector: np.ndarray, candidates: list[Tuple[str, float]]) -> list[Tuple[str, float]]:
+        originals = self._load_originals()
+        if originals is None:
+            return candidates
+
+        rows_by_id, matrix = originals
+        known = [chunk_id for chunk_id, _ in candidates if chunk_id in rows_by_id]
+        if not known:
+            return candidates
+
+        exact = _normalized(matrix[[rows_by_id[chunk_id] for chunk_id in known]]) @ vector
+        order = np.argsort(-exact, kind="stable")
+
+        return [(known[i], float(exact[i])) for i in order]
+
+    def check_query(self, model: str, dim: int) -> None:
+        """
+        Fail clearly if queries are embedded differently from
+        the indexed vectors.
+        """
+        if self.model is not None and model != self.model:
+            raise ValueError(
+                f"The index was built with embedding model {self.model!r}, but queries use {model!r}; "
+                "rebuild the embeddings and the index, or set RAG_EMBEDDING_MODEL to match."
+            )
+        if dim != self.dim:
+            raise ValueError(
+                f"The index holds {self.dim}-dimensional vectors, but queries have {dim}; "
+                "rebuild the embeddings and the index, or set RAG_EMBEDDING_DIM to match."
+            )
+
+    def _search_params(
+        self,
+        fetch: int,
+        nprobe: int | None,
+        ef_search: int | None,
+        selector: faiss.IDSelector | None = None,
+    ) -> faiss.SearchParameters | None:
+        # The selector is only referenced by the parameters: the
+        # caller keeps it alive during the search
+        extra = {} if selector is None else {"sel": selector}
+
+        if self._is_ivf and (nprobe is not None or selector is not None):
+            nprobe = self.params["nprobe"] if nprobe is None else nprobe
+            return faiss.SearchParametersIVF(nprobe=min(nprobe, self.params["nlist"]), **extra)
+        if self.index_type == "hnsw":
+            # The candidate list must hold at least the requested results
+            ef = self.params["efSearch"] if ef_search is None else ef_search
+            return faiss.SearchParametersHNSW(efSearch=max(ef, fetch), **extra)
+        if selector is not None:
+            return faiss.SearchParameters(**extra)
+        return None
+
     def search(
         self,
         query_vector: List[float],
         k: int = 5,
+        rerank: int | None = None,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+        types: Iterable[str] | None = None,
+        path_prefix: str | None = None,
+        packages: Iterable[str] | None = None,
     ) -> List[Tuple[str, float]]:
         """
         Search for nearest neighbors.
 
+        rerank overrides the store's re-scoring factor (0: off).
+        nprobe (IVF) and ef_search (HNSW) override the index's
+        speed / recall setting for this query; larger is slower
+        and more accurate. Other index types ignore them.
+
+        types (chunk types), path_prefix (relative to the repo
+        root) and packages (with their subpackages) restrict the
+        results to the matching chunks. FAISS skips the other
+        vectors while searching, so up to k matching chunks come
+        back. Filtering requires an index built with metadata.
+
         Returns:
         [(chunk_id, score), ...]
         """
+        return self.search_batch(
+            [query_vector],
+            k=k,
+            rerank=rerank,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            types=types,
+            path_prefix=path_prefix,
+            packages=packages,
+        )[0]
+
+    def search_batch(
+        self,
+        query_vectors: Sequence[List[float]] | np.ndarray,
+        k: int = 5,
+        rerank: int | None = None,
+        nprobe: int | None = None,
+        ef_search: int | None = None,
+        types: Iterable[str] | None = None,
+        path_prefix: str | None = None,
+        packages: Iterable[str] | None = None,
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Search for the nearest neighbors of every row of a query
+        matrix in one FAISS call (options and filters as for
+        search(); the filters apply to every query).
+
+        Returns one [(chunk_id, score), ...] list per query.
+        """
+
+        vectors = np.array(query_vectors, dtype="float32", ndmin=2)
+
+        if not len(vectors):
+            return []
+        if vectors.shape[1] != self.dim:
+            raise ValueError(
+                f"Query vector has {vectors.shape[1]} dimensions but the index has {self.dim}; "
+                "was it built with another embedding model?"
+            )
+
+        selection = self._selection(types, path_prefix, packages)
+        if selection is not None and not selection.any():
+            return [[] for _ in vectors]
+
+        faiss.normalize_L2(vectors)
+
+        rerank = self.rerank if rerank is None else rerank
+        fetch = k * rerank if rerank else k
 
-        vector = np.array([query_vector], dtype="float32")
-        faiss.normalize_L2(vector)
+        selector = None
+        if selection is not None:
+            selector = faiss.IDSelectorBitmap(np.packbits(selection, bitorder="little"))
+        elif self.index_type == "hnsw":
+            # Removed vectors are still in the graph (a selection excludes them)
+            fetch += self._removed
 
-        scores, indices = self.index.search(vector, k)
+        params = self._search_params(fetch, nprobe, ef_search, selector)
+        scores, indices = self.index.search(vectors, fetch, params=params)
 
-        results: list[Tuple[str, float]] = []
+        batch: list[list[Tuple[str, float]]] = []
 
-        for idx, score in zip(indices[0], scores[0], strict=True):
-            if idx < 0:
-                continue
-            results.append((self.ids[idx], float(score)))
+        for vector, labels, row_scores in zip(vectors, indices.tolist(), scores.tolist(), strict=True):
+            results = [
+                (self._chunks[label], score) for label, score in zip(labels, row_scores, strict=True) if label in self._chunks
+            ]
+            if rerank:
+                results = self._rescore(vector, results)
+            batch.append(results[:k])
 
-        return results
+        return batch
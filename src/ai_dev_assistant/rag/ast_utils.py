@@ -1,6 +1,7 @@
 # rag/ast_utils.py
 
 import ast
+import re
 
 
 def is_overload_function(func: ast.FunctionDef) -> bool:
@@ -31,3 +32,39 @@ def iter_real_functions(tree: ast.Module) -> list[ast.FunctionDef]:
         functions[node.name] = node
 
     return list(functions.values())
+
+
+_LINE_BREAK = re.compile(rb"\r\n|\r|\n")
+
+
+class SourceIndex:
+    """
+    Byte-offset index over a module's source text.
+
+    AST column offsets are UTF-8 byte offsets, so a node's text
+    is a single slice of the encoded source. Lines are split like
+    the parser does (\\r\\n, \\r, \\n; no form feeds), which makes
+    segment() equivalent to ast.get_source_segment() without
+    re-splitting the whole file for every node.
+    """
+
+    def __init__(self, code: str):
+        self.data = code.encode("utf-8")
+        self.line_starts = [0]
+        self.line_starts.extend(m.end() for m in _LINE_BREAK.finditer(self.data))
+
+    def byte_range(self, node: ast.AST) -> tuple[int, int] | None:
+        end_lineno = getattr(node, "end_lineno", None)
+        end_col_offset = getattr(node, "end_col_offset", None)
+        if end_lineno is None or end_col_offset is None:
+            return None
+
+        start = self.line_starts[node.lineno - 1] + node.col_offset
+        end = self.line_starts[end_lineno - 1] + end_col_offset
+        return start, end
+
+    def segment(self, node: ast.AST) -> str | None:
+        span = self.byte_range(node)
+        if span is None:
+            return None
+        return self.data[span[0] : span[1]].decode("utf-8")
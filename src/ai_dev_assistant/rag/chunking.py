@@ -14,11 +14,12 @@ Sources of structure:
 - AST (modules, classes, functions, methods)
 """
 
+from __future__ import annotations
+
 import ast
 from pathlib import Path
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable
 
-from .ast_utils import is_overload_function, iter_real_functions
 from .overviews import (
     build_class_overview,
     build_function_overview,
@@ -27,6 +28,10 @@ from .overviews import (
     build_project_overview,
 )
 from .schema import CodeChunk
+from .structure import collect_module_structure
+
+if TYPE_CHECKING:
+    from ai_dev_assistant.tools.blobs import BlobStore
 
 
 def chunk_project_overview(repo_root: Path) -> CodeChunk:
@@ -48,7 +53,14 @@ def chunk_project_overview(repo_root: Path) -> CodeChunk:
 # ============================================================
 
 
-def chunk_python_file(path: Path) -> Iterable[CodeChunk]:
+def chunk_python_file(path: Path, blobs: BlobStore | None = None) -> Iterable[CodeChunk]:
+    """
+    Chunk one Python file.
+
+    With a blob store, the file source is stored once and code
+    chunks reference byte ranges in it instead of carrying
+    their own copy of the text.
+    """
     code = path.read_text(encoding="utf-8", errors="ignore")
 
     try:
@@ -56,6 +68,26 @@ def chunk_python_file(path: Path) -> Iterable[CodeChunk]:
     except SyntaxError:
         return
 
+    # Single pass over the AST; everything below only formats it
+    module = collect_module_structure(tree, code)
+
+    data = code.encode("utf-8")
+    blob = blobs.put(data) if blobs is not None else None
+
+    def code_chunk(chunk_id: str, chunk_type: str, symbol: str, source: str, span: tuple[int, int] | None) -> CodeChunk:
+        if blob is None or span is None:
+            return CodeChunk(id=chunk_id, file=str(path), type=chunk_type, symbol=symbol, text=source)
+        return CodeChunk(
+            id=chunk_id,
+            file=str(path),
+            type=chunk_type,
+            symbol=symbol,
+            text="",
+            blob=blob,
+            start=span[0],
+            end=span[1],
+        )
+
     # --------------------------------------------------
     # MODULE OVERVIEW (embedded)
     # --------------------------------------------------
@@ -64,70 +96,52 @@ def chunk_python_file(path: Path) -> Iterable[CodeChunk]:
         file=str(path),
         type="module_overview",
         symbol=path.stem,
-        text=build_module_overview(path, tree),
+        text=build_module_overview(path, module),
     )
 
     # --------------------------------------------------
     # MODULE FULL CODE (not embedded)
     # --------------------------------------------------
-    yield CodeChunk(
-        id=f"{path}::module",
-        file=str(path),
-        type="module",
-        symbol=path.stem,
-        text=code,
-    )
+    yield code_chunk(f"{path}::module", "module", path.stem, code, (0, len(data)))
 
     # --------------------------------------------------
     # CLASSES
     # --------------------------------------------------
-    for node in tree.body:
-        if not isinstance(node, ast.ClassDef):
-            continue
-
+    for cls in module.classes:
         yield CodeChunk(
-            id=f"{path}::{node.name}::overview",
+            id=f"{path}::{cls.name}::overview",
             file=str(path),
             type="class_overview",
-            symbol=node.name,
-            text=build_class_overview(path, node),
+            symbol=cls.name,
+            text=build_class_overview(path, cls),
         )
 
-        yield CodeChunk(
-            id=f"{path}::{node.name}",
-            file=str(path),
-            type="class",
-            symbol=node.name,
-            text=ast.get_source_segment(code, node) or "",
-        )
-
-        for item in node.body:
-            if not isinstance(item, ast.FunctionDef):
-                continue
+        yield code_chunk(f"{path}::{cls.name}", "class", cls.name, cls.source, cls.span)
 
-            if is_overload_function(item):
+        for method in cls.methods:
+            if method.is_overload:
                 continue
 
             yield CodeChunk(
-                id=f"{path}::{node.name}.{item.name}::overview",
+                id=f"{path}::{cls.name}.{method.name}::overview",
                 file=str(path),
                 type="method_overview",
-                symbol=f"{node.name}.{item.name}",
-                text=build_method_overview(path, node.name, item),
+                symbol=f"{cls.name}.{method.name}",
+                text=build_method_overview(path, cls.name, method),
             )
 
-            yield CodeChunk(
-                id=f"{path}::{node.name}.{item.name}",
-                file=str(path),
-                type="method",
-                symbol=f"{node.name}.{item.name}",
-                text=ast.get_source_segment(code, item) or "",
+            yield code_chunk(
+                f"{path}::{cls.name}.{method.name}",
+                "method",
+                f"{cls.name}.{method.name}",
+                method.source,
+                method.span,
             )
 
     # --------------------------------------------------
     # STANDALONE FUNCTIONS (IMPORTANT PART)
     # --------------------------------------------------
-    for func in iter_real_functions(tree):
+    for func in module.functions:
         yield CodeChunk(
             id=f"{path}::{func.name}::overview",
             file=str(path),
@@ -136,10 +150,4 @@ def chunk_python_file(path: Path) -> Iterable[CodeChunk]:
             text=build_function_overview(path, func),
         )
 
-        yield CodeChunk(
-            id=f"{path}::{func.name}",
-            file=str(path),
-            type="function",
-            symbol=func.name,
-            text=ast.get_source_segment(code, func) or "",
-        )
+        yield code_chunk(f"{path}::{func.name}", "function", func.name, func.source, func.span)
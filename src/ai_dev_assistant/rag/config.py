@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import os
 
+from ai_dev_assistant.infra.config import EMBEDDING_TARGET_DIM, LOCAL_EMBEDDING_DIM, LOCAL_EMBEDDING_MODEL
+
 from .modes import ConversationMode
 
 # ===============================
@@ -32,6 +34,39 @@ EMBEDDING_MODEL = os.environ.get(
 EMBEDDING_DIMENSIONS = {
     "text-embedding-3-small": 1536,
     "text-embedding-3-large": 3072,
+    LOCAL_EMBEDDING_MODEL: LOCAL_EMBEDDING_DIM,
 }
 
-VECTOR_DIM = EMBEDDING_DIMENSIONS[EMBEDDING_MODEL]
+# Size of the stored vectors (RAG_EMBEDDING_DIM, if set)
+VECTOR_DIM = EMBEDDING_TARGET_DIM or EMBEDDING_DIMENSIONS[EMBEDDING_MODEL]
+
+# Storage precision of embeddings.npy: "float32" or "float16"
+# (half the size; vectors are widened to float32 for FAISS)
+EMBEDDING_STORAGE_DTYPE = os.environ.get(
+    "RAG_EMBEDDING_DTYPE",
+    "float32",
+)
+
+# --------------------------------------------------
+# Vector index
+# --------------------------------------------------
+
+# "flat" (exact), "sq8" / "ivfpq" (quantized), "ivfflat" / "hnsw"
+# (approximate) or "auto" (by corpus size, see infra/vector_store.py)
+VECTOR_INDEX_TYPE = os.environ.get("RAG_INDEX_TYPE", "auto")
+
+# Re-score rerank * k quantized candidates against the original vectors (0: off)
+VECTOR_INDEX_RERANK = int(os.environ.get("RAG_INDEX_RERANK", "0"))
+
+# Per-query speed / recall of approximate indexes (unset: the
+# index's own setting): IVF lists probed, HNSW candidate list size
+VECTOR_INDEX_NPROBE = int(os.environ.get("RAG_INDEX_NPROBE", "0")) or None
+VECTOR_INDEX_EF_SEARCH = int(os.environ.get("RAG_INDEX_EF_SEARCH", "0")) or None
+
+# Memory-map the index for searching (zero-copy cold start, pages
+# shared between processes) instead of reading it into memory
+VECTOR_INDEX_MMAP = os.environ.get("RAG_INDEX_MMAP", "1") == "1"
+
+# Also build one sub-index per chunk type, searched by the modes
+# that list partitions (see rag/modes.py)
+VECTOR_INDEX_PARTITIONS = os.environ.get("RAG_INDEX_PARTITIONS", "1") == "1"
@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
-import json
 from dataclasses import dataclass
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator
 
-from ai_dev_assistant.tools.defaults import get_chunks_path, get_embeddings_path
+from ai_dev_assistant.infra.artifact_sqlite import ArtifactIndex
+from ai_dev_assistant.tools.artifacts import chunk_text, iter_chunk_records, resolve_chunks_path
+from ai_dev_assistant.tools.blobs import BlobStore
+from ai_dev_assistant.tools.defaults import get_artifacts_db_path
+
+from .embedding_policy import EMBEDDABLE_TYPES
 
 
 @dataclass(frozen=True)
@@ -61,12 +65,87 @@ def find_parent_overviews(parent_names, emb_by_id):
 # ============================================================
 
 
-def load_embeddings() -> List[Dict]:
-    return json.loads(get_embeddings_path().read_text())
+def load_overviews(repo_name: str | None = None) -> Dict[str, Dict]:
+    return {r["id"]: r for r in load_chunks(repo_name) if r["type"] in EMBEDDABLE_TYPES}
+
+
+def load_chunks(repo_name: str | None = None) -> Iterator[Dict]:
+    return iter_chunk_records(resolve_chunks_path(repo_name))
+
+
+def load_chunk_subset(wanted_ids: set[str], repo_name: str | None = None) -> tuple[dict[str, dict], dict | None]:
+    """
+    Stream the chunk artifact once, keeping only the wanted
+    chunks and the project overview.
+    """
+    chunk_by_id: dict[str, dict] = {}
+    project_overview = None
+
+    for chunk in load_chunks(repo_name):
+        if chunk["id"] in wanted_ids:
+            chunk_by_id[chunk["id"]] = chunk
+        if project_overview is None and chunk["type"] == "project":
+            project_overview = chunk
+
+    return chunk_by_id, project_overview
+
+
+# ============================================================
+# ARTIFACT LOOKUPS
+# ============================================================
+
+
+class SqliteArtifacts:
+    """
+    Indexed lookups in the artifact database: only the rows
+    a query needs are read.
+    """
+
+    def __init__(self, index: ArtifactIndex, repo_name: str | None = None):
+        self.index = index
+        self.repo_name = repo_name
+
+    def get_overviews(self, ids: Iterable[str]) -> dict[str, dict]:
+        return self.index.get_chunks(ids)
+
+    def find_class_overviews(self, symbols: list[str]) -> list[dict]:
+        return self.index.find_by_symbol("class_overview", symbols)
+
+    def load_code(self, ids: set[str]) -> tuple[dict[str, dict], dict | None]:
+        return self.index.get_chunks(ids), self.index.first_of_type("project")
+
+    def close(self) -> None:
+        self.index.close()
+
+
+class JsonArtifacts:
+    """
+    Lookups over the chunk artifact, for workspaces without an
+    artifact database.
+    """
+
+    def __init__(self, repo_name: str | None = None):
+        self.repo_name = repo_name
+        self.emb_by_id = load_overviews(repo_name)
+
+    def get_overviews(self, ids: Iterable[str]) -> dict[str, dict]:
+        return {i: self.emb_by_id[i] for i in ids if i in self.emb_by_id}
+
+    def find_class_overviews(self, symbols: list[str]) -> list[dict]:
+        return find_parent_overviews(symbols, self.emb_by_id)
+
+    def load_code(self, ids: set[str]) -> tuple[dict[str, dict], dict | None]:
+        return load_chunk_subset(ids, self.repo_name)
 
+    def close(self) -> None:
+        pass
 
-def load_chunks() -> List[Dict]:
-    return json.loads(get_chunks_path().read_text())
+
+def open_artifacts(repo_name: str | None = None) -> SqliteArtifacts | JsonArtifacts:
+    db_path = get_artifacts_db_path(repo_name)
+    if db_path.exists():
+        return SqliteArtifacts(ArtifactIndex(db_path), repo_name)
+    return JsonArtifacts(repo_name)
 
 
 # ============================================================
@@ -76,7 +155,7 @@ def load_chunks() -> List[Dict]:
 
 def collect_parent_overviews(
     start_overview: dict,
-    emb_by_id: dict[str, dict],
+    artifacts: SqliteArtifacts | JsonArtifacts,
     max_depth: int,
 ) -> list[dict]:
     """
@@ -94,7 +173,7 @@ def collect_parent_overviews(
         for overview in current_level:
             parents = extract_parents_from_overview(overview["text"])
 
-            for parent in find_parent_overviews(parents, emb_by_id):
+            for parent in artifacts.find_class_overviews(parents):
                 if parent["id"] in visited:
                     continue
 
@@ -116,17 +195,47 @@ def collect_parent_overviews(
 def build_context(
     results,
     options: ContextOptions,
+    artifacts: SqliteArtifacts | JsonArtifacts | None = None,
 ):
-    embeddings = load_embeddings()
-    chunks = load_chunks()
-
-    emb_by_id = {r["id"]: r for r in embeddings}
-    chunk_by_id = {c["id"]: c for c in chunks}
-
-    project_overview = next(
-        (c for c in chunks if c["type"] == "project"),
-        None,
-    )
+    """
+    artifacts: resident lookups (rag.session) to use; by default
+    the active repo's artifacts are opened for this call and
+    closed. Code is read from the blob store of their repo.
+    """
+    owned = artifacts is None
+    if owned:
+        artifacts = open_artifacts()
+    try:
+        emb_by_id = artifacts.get_overviews(chunk_id for chunk_id, _ in results)
+
+        # Resolve parents first, so the code of everything this
+        # context needs is fetched in one go.
+        parents_by_id: dict[str, list[dict]] = {}
+        wanted_ids: set[str] = set()
+
+        for chunk_id, _ in results:
+            overview = emb_by_id.get(chunk_id)
+            if not overview:
+                continue
+
+            wanted_ids.add(chunk_id.replace("::overview", ""))
+
+            if options.expand_inheritance_depth > 0 and overview["type"] == "class_overview":
+                parents = collect_parent_overviews(
+                    start_overview=overview,
+                    artifacts=artifacts,
+                    max_depth=options.expand_inheritance_depth,
+                )
+                parents_by_id[chunk_id] = parents
+                wanted_ids.update(p["id"].replace("::overview", "") for p in parents)
+
+        chunk_by_id, project_overview = artifacts.load_code(wanted_ids)
+    finally:
+        if owned:
+            artifacts.close()
+
+    # Code is sliced from the blob store only when shown
+    blobs = BlobStore.for_repo(artifacts.repo_name)
 
     context_blocks = []
     used_ids = set()
@@ -138,13 +247,7 @@ def build_context(
         parent_blocks = []
 
         if options.expand_inheritance_depth > 0 and overview["type"] == "class_overview":
-            parent_overviews = collect_parent_overviews(
-                start_overview=overview,
-                emb_by_id=emb_by_id,
-                max_depth=options.expand_inheritance_depth,
-            )
-
-            for parent in parent_overviews:
+            for parent in parents_by_id[chunk_id]:
                 parent_base_id = parent["id"].replace("::overview", "")
                 parent_full = chunk_by_id.get(parent_base_id)
 
@@ -160,7 +263,7 @@ def build_context(
                 ]
 
                 if parent_full and options.prefer_full_code:
-                    pb.append("\n--- Full Code ---\n" + parent_full["text"])
+                    pb.append("\n--- Full Code ---\n" + chunk_text(parent_full, blobs))
 
                 parent_blocks.append("\n".join(pb))
 
@@ -180,7 +283,7 @@ def build_context(
         block.append("\n--- Overview ---\n" + overview["text"])
 
         if full and options.prefer_full_code:
-            block.append("\n--- Full Code ---\n" + full["text"])
+            block.append("\n--- Full Code ---\n" + chunk_text(full, blobs))
 
         context_blocks.extend(parent_blocks)
         context_blocks.append("\n".join(block))
@@ -1,17 +1,28 @@
 # rag/cost.py
 from __future__ import annotations
 
+from functools import lru_cache
+
 import tiktoken
 
-from ai_dev_assistant.infra.config import EMBEDDING_PRICES_PER_1M, LLM_PRICES_PER_1M
+from ai_dev_assistant.infra.config import EMBEDDING_PRICES_PER_1M, LLM_PRICES_PER_1M, LOCAL_EMBEDDING_MODEL
 
 # ============================================================
 # TOKEN COUNTING
 # ============================================================
 
 
+@lru_cache(maxsize=None)
+def get_encoding(model: str) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        # Models tiktoken does not know yet
+        return tiktoken.get_encoding("cl100k_base")
+
+
 def count_tokens(texts: list[str], model: str) -> int:
-    enc = tiktoken.encoding_for_model(model)
+    enc = get_encoding(model)
     return sum(len(enc.encode(t)) for t in texts)
 
 
@@ -24,6 +35,10 @@ def estimate_embedding_cost(
     texts: list[str],
     model: str,
 ) -> tuple[int, float]:
+    if model == LOCAL_EMBEDDING_MODEL:
+        # Free, and must work without a tiktoken download
+        return 0, 0.0
+
     tokens = count_tokens(texts, model)
     price = tokens / 1_000_000 * EMBEDDING_PRICES_PER_1M[model]
     return tokens, price
@@ -0,0 +1,393 @@
+"""
+discovery.py
+
+Pruned, ignore-aware file discovery for a repository.
+
+Directories are listed with os.scandir and pruned before
+they are entered, so virtualenvs, caches, build output and
+anything the repository ignores are never walked.
+
+Ignore sources (later ones take precedence):
+- DEFAULT_IGNORE_DIRS, and any directory holding a pyvenv.cfg
+- .git/info/exclude
+- .gitignore files, nested ones overriding their parents
+- PROJECT_IGNORE_FILE at the repository root
+
+Ignore files use gitignore syntax: comments, negation (!),
+anchoring (leading or inner /), directory-only patterns
+(trailing /), *, ?, [...] and **.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from stat import S_ISREG
+from typing import Iterator
+
+# ============================================================
+# CONFIGURATION
+# ============================================================
+
+DEFAULT_IGNORE_DIRS = frozenset(
+    {
+        ".git",
+        ".hg",
+        ".svn",
+        "__pycache__",
+        ".mypy_cache",
+        ".pytest_cache",
+        ".ruff_cache",
+        ".tox",
+        ".nox",
+        ".eggs",
+        ".venv",
+        "venv",
+        "node_modules",
+        "site-packages",
+        "build",
+        "dist",
+    }
+)
+
+PROJECT_IGNORE_FILE = ".aidevignore"
+
+# Larger files are almost always generated or minified
+MAX_FILE_SIZE = 1_000_000
+
+
+# ============================================================
+# IGNORE PATTERNS
+# ============================================================
+
+
+@dataclass(frozen=True)
+class IgnorePattern:
+    """
+    One gitignore line, matched relative to the directory
+    (base) holding the ignore file.
+    """
+
+    base: str
+    regex: re.Pattern[str]
+    negated: bool
+    dir_only: bool
+    anchored: bool
+
+    def matches(self, rel_path: str, name: str, is_dir: bool) -> bool:
+        if self.dir_only and not is_dir:
+            return False
+
+        if not self.anchored:
+            return self.regex.fullmatch(name) is not None
+
+        if self.base:
+            if not rel_path.startswith(self.base + "/"):
+                return False
+            rel_path = rel_path[len(self.base) + 1 :]
+
+        return self.regex.fullmatch(rel_path) is not None
+
+
+def _translate_glob(pattern: str) -> str:
+    """
+    Translate a gitignore glob into a regular expression.
+    """
+    out: list[str] = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if c == "*":
+            if pattern.startswith("**", i) and (i == 0 or pattern[i - 1] == "/"):
+                end = i + 2
+                if end == n:
+                    out.append(".*")
+                    i = end
+                    continue
+                if pattern[end] == "/":
+                    out.append("(?:.*/)?")
+                    i = end + 1
+                    continue
+
+            while i < n and pattern[i] == "*":
+                i += 1
+            out.append("[^/]*")
+            continue
+
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            end = pattern.find("]", i + 2 if pattern.startswith("[!", i) else i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1 : end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append(f"[{body.replace(chr(92), chr(92) * 2)}]")
+                i = end
+        elif c == "\\" and i + 1 < n:
+            i += 1
+            out.append(re.escape(pattern[i]))
+        else:
+            out.append(re.escape(c))
+
+        i += 1
+
+    return "".join(out)
+
+
+def parse_ignore_lines(lines: list[str], base: str = "") -> list[IgnorePattern]:
+    """
+    Parse gitignore-style lines into patterns anchored at base
+    (a POSIX path relative to the repository root).
+    """
+    patterns: list[IgnorePattern] = []
+
+    for line in lines:
+        line = line.rstrip("\r\n")
+
+        # Trailing spaces are ignored unless escaped
+        if not line.endswith("\\ "):
+            line = line.rstrip(" ")
+
+        if not line or line.startswith("#"):
+            continue
+
+        negated = line.startswith("!")
+        if negated:
+            line = line[1:]
+        elif line.startswith("\\#") or line.startswith("\\!"):
+            line = line[1:]
+
+        dir_only = line.endswith("/")
+        line = line.rstrip("/")
+        if not line:
+            continue
+
+        anchored = "/" in line
+        line = line.lstrip("/")
+
+        patterns.append(
+            IgnorePattern(
+                base=base,
+                regex=re.compile(_translate_glob(line), re.DOTALL),
+                negated=negated,
+                dir_only=dir_only,
+                anchored=anchored,
+            )
+        )
+
+    return patterns
+
+
+def read_ignore_file(path: Path, base: str = "") -> list[IgnorePattern]:
+    try:
+        text = path.read_text(encoding="utf-8", errors="ignore")
+    except OSError:
+        return []
+    return parse_ignore_lines(text.splitlines(), base)
+
+
+def is_ignored(patterns: list[IgnorePattern], rel_path: str, is_dir: bool) -> bool:
+    """
+    Apply patterns in order; the last match decides.
+    """
+    name = rel_path.rsplit("/", 1)[-1]
+    ignored = False
+
+    for pattern in patterns:
+        if pattern.negated == ignored and pattern.matches(rel_path, name, is_dir):
+            ignored = not pattern.negated
+
+    return ignored
+
+
+# ============================================================
+# WALKER
+# ============================================================
+
+
+class RepoWalker:
+    """
+    Walk a repository top-down with os.scandir, pruning
+    ignored directories before descending into them.
+
+    Ignore files are read once per directory and cached,
+    so a walker can be shared between several traversals.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ignore_dirs: frozenset[str] = DEFAULT_IGNORE_DIRS,
+        use_gitignore: bool = True,
+        max_file_size: int | None = MAX_FILE_SIZE,
+    ):
+        self.root = root
+        self.ignore_dirs = ignore_dirs
+        self.use_gitignore = use_gitignore
+        self.max_file_size = max_file_size
+
+        # Files left out by the size limit during the last walk
+        self.skipped_large: list[Path] = []
+
+        self._project_patterns = read_ignore_file(root / PROJECT_IGNORE_FILE)
+        self._git_patterns: dict[str, list[IgnorePattern]] = {}
+
+    # --------------------------------------------------
+    # Ignore rules
+    # --------------------------------------------------
+
+    def _patterns_for(self, rel_dir: str) -> list[IgnorePattern]:
+        """
+        Git patterns in effect for entries of rel_dir ("" is the root).
+        """
+        cached = self._git_patterns.get(rel_dir)
+        if cached is not None:
+            return cached
+
+        if not self.use_gitignore:
+            patterns: list[IgnorePattern] = []
+        elif rel_dir:
+            parent = rel_dir.rsplit("/", 1)[0] if "/" in rel_dir else ""
+            patterns = self._patterns_for(parent) + read_ignore_file(self.root / rel_dir / ".gitignore", rel_dir)
+        else:
+            patterns = read_ignore_file(self.root / ".git" / "info" / "exclude") + read_ignore_file(self.root / ".gitignore")
+
+        self._git_patterns[rel_dir] = patterns
+        return patterns
+
+    def _rel(self, path: Path) -> str:
+        rel = path.relative_to(self.root).as_posix()
+        return "" if rel == "." else rel
+
+    # --------------------------------------------------
+    # Listing
+    # --------------------------------------------------
+
+    def scandir(self, directory: Path) -> tuple[list[os.DirEntry], list[os.DirEntry]]:
+        """
+        List the non-ignored subdirectories and files of a
+        directory, each sorted by name.
+
+        Symlinked directories are not followed.
+        """
+        rel_dir = self._rel(directory)
+        patterns = self._patterns_for(rel_dir) + self._project_patterns
+
+        dirs: list[os.DirEntry] = []
+        files: list[os.DirEntry] = []
+
+        try:
+            with os.scandir(directory) as it:
+                entries = sorted(it, key=lambda e: e.name)
+        except OSError:
+            return dirs, files
+
+        for entry in entries:
+            rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+            try:
+                is_dir = entry.is_dir(follow_symlinks=False)
+            except OSError:
+                continue
+
+            if is_dir:
+                if not self._prunes_dir(entry.path, entry.name, rel_path, patterns):
+                    dirs.append(entry)
+            elif not is_ignored(patterns, rel_path, False):
+                files.append(entry)
+
+        return dirs, files
+
+    # --------------------------------------------------
+    # Single paths
+    # --------------------------------------------------
+
+    def _prunes_dir(self, entry_path: str, name: str, rel_path: str, patterns: list[IgnorePattern]) -> bool:
+        if name in self.ignore_dirs or name.endswith(".egg-info"):
+            return True
+        if is_ignored(patterns, rel_path, True):
+            return True
+        # Virtualenvs may be named anything
+        return os.path.exists(os.path.join(entry_path, "pyvenv.cfg"))
+
+    def check_file(self, rel_path: str) -> os.stat_result | None:
+        """
+        Return the stat of a single repo-relative file if a walk
+        would yield it, else None (missing, ignored, inside a
+        pruned directory or over the size limit).
+        """
+        parts = rel_path.split("/")
+
+        for depth in range(1, len(parts)):
+            rel_dir = "/".join(parts[:depth])
+            parent = "/".join(parts[: depth - 1])
+            dir_path = self.root / rel_dir
+
+            patterns = self._patterns_for(parent) + self._project_patterns
+            if dir_path.is_symlink() or self._prunes_dir(str(dir_path), parts[depth - 1], rel_dir, patterns):
+                return None
+
+        patterns = self._patterns_for("/".join(parts[:-1])) + self._project_patterns
+        if is_ignored(patterns, rel_path, False):
+            return None
+
+        try:
+            stat = (self.root / rel_path).stat()
+        except OSError:
+            return None
+
+        if not S_ISREG(stat.st_mode):
+            return None
+        if self.max_file_size is not None and stat.st_size > self.max_file_size:
+            return None
+
+        return stat
+
+    def iter_files(self, suffix: str = ".py") -> Iterator[tuple[Path, os.stat_result]]:
+        """
+        Yield (path, stat) for every non-ignored file with the
+        given suffix, in a stable depth-first order.
+
+        Files above max_file_size are skipped and recorded
+        in skipped_large.
+        """
+        self.skipped_large = []
+        stack = [self.root]
+
+        while stack:
+            directory = stack.pop()
+            dirs, files = self.scandir(directory)
+
+            for entry in files:
+                if not entry.name.endswith(suffix):
+                    continue
+
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+
+                path = Path(entry.path)
+                if self.max_file_size is not None and stat.st_size > self.max_file_size:
+                    self.skipped_large.append(path)
+                    continue
+
+                yield path, stat
+
+            stack.extend(Path(entry.path) for entry in reversed(dirs))
+
+
+def iter_python_files(repo_root: Path, **options) -> Iterator[Path]:
+    """
+    Yield the Python files of a repository that should be indexed.
+    """
+    for path, _ in RepoWalker(repo_root, **options).iter_files(".py"):
+        yield path
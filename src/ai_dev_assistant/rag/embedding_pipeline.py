@@ -3,71 +3,123 @@ from __future__ import annotations
 
 from typing import Dict, Iterable, List
 
+from ai_dev_assistant.infra.config import EMBEDDING_TARGET_DIM
+from ai_dev_assistant.infra.embedding_cache import EmbeddingCache, EmbeddingCheckpoint, model_key, text_key
 from ai_dev_assistant.infra.embeddings import embed_texts
 from ai_dev_assistant.rag.schema import CodeChunk
+from ai_dev_assistant.tools.defaults import get_embedding_cache_path
 
 from .config import EMBEDDING_MODEL
 from .cost import estimate_embedding_cost
-from .embedding_policy import iter_embeddable_chunks
+from .embedding_policy import is_embeddable
 
 
 # ============================================================
 # CORE EMBEDDING LOGIC
 # ============================================================
-def batched(iterable, batch_size: int):
-    batch = []
-    for item in iterable:
-        batch.append(item)
-        if len(batch) >= batch_size:
-            yield batch
-            batch = []
-    if batch:
-        yield batch
-
-
 def embed_chunks(
     chunks: Iterable[CodeChunk],
     model: str = EMBEDDING_MODEL,
     dry_run: bool = False,
+    cache: EmbeddingCache | None = None,
+    checkpoint: EmbeddingCheckpoint | None = None,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
 ) -> List[Dict]:
-    chunks = list(chunks)
-    embeddable = list(iter_embeddable_chunks(chunks))
-
-    texts = [chunk.text for chunk in embeddable]
-
-    estimated_tokens, estimated_cost = estimate_embedding_cost(
-        texts,
-        model,
-    )
-    print(f"Estimated embedding tokens: {estimated_tokens:,}")
-    print(f"Estimated cost ($):        {estimated_cost:.4f}")
-
-    embedded_ids = {chunk.id for chunk in embeddable}
-    ignored = [c for c in chunks if c.id not in embedded_ids]
-
-    print("=== EMBEDDING FILTER RESULT ===")
-    print(f"Total chunks:   {len(chunks)}")
-    print(f"Will embed:     {len(embeddable)}")
-    print(f"Ignored:        {len(ignored)}\n")
-
+    """
+    Embed the embeddable chunks.
+
+    Identical texts are embedded once per run, and vectors are
+    looked up in (and added to) the persistent embedding cache,
+    so only new texts are sent to the API.
+
+    Every finished request is written to the cache, and to the
+    checkpoint if one is given; vectors already in the
+    checkpoint (from an interrupted run) count as done.
+
+    Shortened vectors (`dimensions`) are cached separately from
+    full-size ones.
+    """
+    # Single pass: only embeddable (overview) chunks are kept in memory,
+    # full-code chunks are counted and dropped.
+    embeddable: list[CodeChunk] = []
     ignored_by_type: dict[str, int] = {}
-    for chunk in ignored:
-        ignored_by_type[chunk.type] = ignored_by_type.get(chunk.type, 0) + 1
-
-    print("Ignored by type:")
-    for t, count in sorted(ignored_by_type.items()):
-        print(f"  - {t:18} {count}")
-    print("==============================")
-
-    if dry_run:
-        print("DRY RUN - NO EMBEDDING DONE")
-
-        return []
-
-    if not embeddable:
-        return []
 
-    vectors = embed_texts(texts, model=model)
+    for chunk in chunks:
+        if is_embeddable(chunk):
+            embeddable.append(chunk)
+        else:
+            ignored_by_type[chunk.type] = ignored_by_type.get(chunk.type, 0) + 1
+
+    # Deduplicate by content
+    keys = [text_key(chunk.text) for chunk in embeddable]
+    text_by_key = dict(zip(keys, (chunk.text for chunk in embeddable), strict=True))
+
+    own_cache = cache is None
+    if own_cache:
+        cache = EmbeddingCache(get_embedding_cache_path())
+
+    cache_model = model_key(model, dimensions)
+
+    try:
+        resumed: dict[str, list[float]] = {}
+        if checkpoint is not None:
+            resumed = {k: v for k, v in checkpoint.load(cache_model).items() if k in text_by_key}
+
+        vectors = cache.get_many(cache_model, (key for key in text_by_key if key not in resumed))
+        vectors.update(resumed)
+        misses = [key for key in text_by_key if key not in vectors]
+
+        estimated_tokens, estimated_cost = estimate_embedding_cost(
+            [text_by_key[key] for key in misses],
+            model,
+        )
+
+        print("=== EMBEDDING CACHE ===")
+        print(f"Unique texts:   {len(text_by_key)} ({len(embeddable) - len(text_by_key)} duplicates)")
+        print(f"Cache hits:     {len(vectors) - len(resumed)}")
+        if checkpoint is not None:
+            print(f"Resumed:        {len(resumed)}")
+        print(f"Cache misses:   {len(misses)}")
+        print(f"Estimated embedding tokens: {estimated_tokens:,}")
+        print(f"Estimated cost ($):        {estimated_cost:.4f}")
+
+        ignored = sum(ignored_by_type.values())
+
+        print("=== EMBEDDING FILTER RESULT ===")
+        print(f"Total chunks:   {len(embeddable) + ignored}")
+        print(f"Will embed:     {len(embeddable)}")
+        print(f"Ignored:        {ignored}\n")
+
+        print("Ignored by type:")
+        for t, count in sorted(ignored_by_type.items()):
+            print(f"  - {t:18} {count}")
+        print("==============================")
+
+        if dry_run:
+            print("DRY RUN - NO EMBEDDING DONE")
+
+            return []
+
+        if not embeddable:
+            return []
+
+        if resumed:
+            cache.put_many(cache_model, resumed)
+
+        # Persist each request as it completes, so an interrupted
+        # run does not pay for the same texts again
+        def on_batch(done: dict[int, list[float]]) -> None:
+            new = {misses[i]: vector for i, vector in done.items()}
+            cache.put_many(cache_model, new)
+            if checkpoint is not None:
+                checkpoint.append(cache_model, new)
+            vectors.update(new)
+
+        if misses:
+            embed_texts([text_by_key[key] for key in misses], model=model, on_batch=on_batch, dimensions=dimensions)
+    finally:
+        if own_cache:
+            cache.close()
 
     return [
         {
@@ -75,8 +127,8 @@ def embed_chunks(
             "type": chunk.type,
             "symbol": chunk.symbol,
             "file": chunk.file,
-            "embedding": vector,
+            "embedding": vectors[key],
             "text": chunk.text,
         }
-        for chunk, vector in zip(embeddable, vectors, strict=True)
+        for chunk, key in zip(embeddable, keys, strict=True)
     ]
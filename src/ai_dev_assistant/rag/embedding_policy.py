@@ -1,4 +1,6 @@
 # rag/embedding_policy.py
+from typing import Iterable
+
 from .schema import CodeChunk
 
 EMBEDDABLE_TYPES = {
@@ -10,7 +12,11 @@ EMBEDDABLE_TYPES = {
 }
 
 
-def iter_embeddable_chunks(chunks: list[CodeChunk]):
+def is_embeddable(chunk: CodeChunk) -> bool:
+    return chunk.type in EMBEDDABLE_TYPES
+
+
+def iter_embeddable_chunks(chunks: Iterable[CodeChunk]):
     for chunk in chunks:
-        if chunk.type in EMBEDDABLE_TYPES:
+        if is_embeddable(chunk):
             yield chunk
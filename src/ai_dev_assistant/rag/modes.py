@@ -55,6 +55,11 @@ class ModePolicy:
     conversational_directive: str
     description: str
 
+    # Chunk-type partitions to retrieve from, with the number of
+    # chunks from each, e.g. (("class_overview", 3),).
+    # Empty: top-k over all chunk types.
+    partitions: tuple[tuple[str, int], ...] = ()
+
 
 MODE_POLICIES: dict[ConversationMode, ModePolicy] = {
     ConversationMode.SEARCH: ModePolicy(
@@ -90,6 +95,7 @@ MODE_POLICIES: dict[ConversationMode, ModePolicy] = {
             "Explain runtime behavior, edge cases, and failure modes. Focus on why things happen and what could go wrong."
         ),
         description="Reason about bugs, crashes, and unexpected behavior.",
+        partitions=(("function_overview", 3), ("method_overview", 3)),
     ),
     ConversationMode.CODING: ModePolicy(
         use_retrieval=True,
@@ -112,6 +118,7 @@ MODE_POLICIES: dict[ConversationMode, ModePolicy] = {
             "Explain system structure and interactions between components. Focus on design intent and data flow."
         ),
         description="High-level system and architectural explanations.",
+        partitions=(("module_overview", 2), ("class_overview", 3)),
     ),
     ConversationMode.EXPLORATION: ModePolicy(
         use_retrieval=True,
@@ -1,41 +1,19 @@
-import ast
 from pathlib import Path
 from typing import Dict
 
-from .ast_utils import is_overload_function, iter_real_functions
+from .discovery import RepoWalker
+from .structure import (
+    ClassStructure,
+    FunctionStructure,
+    ModuleStructure,
+    format_function_signature,  # noqa: F401 (re-exported)
+)
 
 # ============================================================
 # HELPERS
 # ============================================================
 
 
-def format_function_signature(func: ast.FunctionDef) -> str:
-    """
-    Return a human-readable function signature extracted from AST.
-
-    Examples:
-    - foo(a, b)
-    - bar(path, strict=False)
-    """
-
-    parts: list[str] = []
-
-    # Positional arguments (skip self)
-    for arg in func.args.args:
-        if arg.arg != "self":
-            parts.append(arg.arg)
-
-    # *args
-    if func.args.vararg:
-        parts.append(f"*{func.args.vararg.arg}")
-
-    # **kwargs
-    if func.args.kwarg:
-        parts.append(f"**{func.args.kwarg.arg}")
-
-    return f"{func.name}({', '.join(parts)})"
-
-
 def format_package_tree(tree: Dict[str, dict], indent: int = 0) -> list[str]:
     """
     Convert a nested package dictionary into
@@ -69,31 +47,36 @@ IGNORE_DIRS = {
 MAX_DEPTH = 4
 
 
-def walk_python_packages(base: Path, depth: int = 0) -> Dict[str, dict]:
+def walk_python_packages(base: Path, depth: int = 0, walker: RepoWalker | None = None) -> Dict[str, dict]:
     """
     Recursively walk Python package directories and build
     a nested dictionary representing project structure.
 
     A directory is considered a Python package if it
-    contains an __init__.py file.
+    contains an __init__.py file. Directories pruned by
+    the repository walker (ignored, virtualenvs, ...) and
+    IGNORE_DIRS are skipped.
     """
 
     if depth > MAX_DEPTH:
         return {}
 
-    if not (base / "__init__.py").exists():
+    if walker is None:
+        walker = RepoWalker(base)
+
+    dirs, files = walker.scandir(base)
+
+    if not any(entry.name == "__init__.py" for entry in files):
         return {}
 
     tree: Dict[str, dict] = {}
 
-    for item in sorted(base.iterdir()):
-        if not item.is_dir():
-            continue
-        if item.name in IGNORE_DIRS:
+    for entry in dirs:
+        if entry.name in IGNORE_DIRS:
             continue
 
-        subtree = walk_python_packages(item, depth + 1)
-        tree[item.name] = subtree
+        subtree = walk_python_packages(Path(entry.path), depth + 1, walker)
+        tree[entry.name] = subtree
 
     return tree
 
@@ -129,7 +112,7 @@ def build_project_overview(repo_root: Path) -> str:
 # ============================================================
 
 
-def build_module_overview(path: Path, tree: ast.Module) -> str:
+def build_module_overview(path: Path, module: ModuleStructure) -> str:
     """
     Build a compact, human-readable structural overview of a Python module.
 
@@ -146,59 +129,39 @@ def build_module_overview(path: Path, tree: ast.Module) -> str:
         "",
     ]
 
-    module_doc = ast.get_docstring(tree)
-    if module_doc:
-        lines.extend(["Docstring:", module_doc.strip(), ""])
+    if module.docstring:
+        lines.extend(["Docstring:", module.docstring.strip(), ""])
 
     # Imports
-    imports: list[str] = []
-    for node in tree.body:
-        if isinstance(node, ast.Import):
-            imports.extend(name.name for name in node.names)
-        elif isinstance(node, ast.ImportFrom):
-            mod = node.module or ""
-            imports.extend(f"{mod}.{name.name}" for name in node.names)
-
-    if imports:
+    if module.imports:
         lines.append("Imports:")
-        for imp in sorted(set(imports)):
+        for imp in sorted(set(module.imports)):
             lines.append(f"- {imp}")
         lines.append("")
 
     # Module variables
-    variables: list[str] = []
-    for node in tree.body:
-        if isinstance(node, ast.Assign):
-            for target in node.targets:
-                if isinstance(target, ast.Name):
-                    variables.append(target.id)
-
-    if variables:
+    if module.variables:
         lines.append("Module variables:")
-        for var in sorted(set(variables)):
+        for var in sorted(set(module.variables)):
             lines.append(f"- {var}")
         lines.append("")
 
     # Classes
-    classes = [n for n in tree.body if isinstance(n, ast.ClassDef)]
-    if classes:
+    if module.classes:
         lines.append("Classes:")
-        for cls in classes:
+        for cls in module.classes:
             lines.append(f"- {cls.name}")
-            for item in cls.body:
-                if isinstance(item, ast.FunctionDef):
-                    lines.append(f"  - {item.name}()")
+            for method in cls.methods:
+                lines.append(f"  - {method.name}()")
         lines.append("")
 
     # Functions
-    functions = iter_real_functions(tree)
-    if functions:
+    if module.functions:
         lines.append("Functions:")
-        for fn in functions:
+        for fn in module.functions:
             lines.append(f"- {fn.name}()")
-            for item in fn.body:
-                if isinstance(item, ast.FunctionDef) and not is_overload_function(item):
-                    lines.append(f"  - nested: {item.name}()")
+            for nested in fn.nested:
+                lines.append(f"  - nested: {nested}()")
         lines.append("")
 
     return "\n".join(lines).strip()
@@ -211,7 +174,7 @@ def build_module_overview(path: Path, tree: ast.Module) -> str:
 
 def build_class_overview(
     module_path: Path,
-    class_node: ast.ClassDef,
+    cls: ClassStructure,
 ) -> str:
     """
     Build a compact structural overview of a class.
@@ -230,65 +193,43 @@ def build_class_overview(
     # --------------------------------------------------
     # Identity
     # --------------------------------------------------
-    lines.append(f"Class: {class_node.name}")
+    lines.append(f"Class: {cls.name}")
     lines.append(f"Defined in: {module_path}")
     lines.append("")
 
     # --------------------------------------------------
     # Base classes (inheritance)
     # --------------------------------------------------
-    bases: list[str] = []
-    for base_expr in class_node.bases:
-        if isinstance(base_expr, ast.Name):
-            bases.append(base_expr.id)
-        elif isinstance(base_expr, ast.Attribute):
-            bases.append(ast.unparse(base_expr))
-
-    if bases:
+    if cls.bases:
         lines.append("Inherits from:")
-        for base_name in bases:
+        for base_name in cls.bases:
             lines.append(f"- {base_name}")
         lines.append("")
 
     # --------------------------------------------------
     # Class docstring
     # --------------------------------------------------
-    docstring = ast.get_docstring(class_node)
-    if docstring:
+    if cls.docstring:
         lines.append("Docstring:")
-        lines.append(docstring.strip())
+        lines.append(cls.docstring.strip())
         lines.append("")
 
     # --------------------------------------------------
     # Class-level attributes
     # --------------------------------------------------
-    attributes: list[str] = []
-
-    for item in class_node.body:
-        if isinstance(item, ast.Assign):
-            for target in item.targets:
-                if isinstance(target, ast.Name):
-                    attributes.append(target.id)
-
-    if attributes:
+    if cls.attributes:
         lines.append("Class attributes:")
-        for attr in sorted(set(attributes)):
+        for attr in sorted(set(cls.attributes)):
             lines.append(f"- {attr}")
         lines.append("")
 
     # --------------------------------------------------
     # Methods
     # --------------------------------------------------
-    methods: list[str] = []
-
-    for item in class_node.body:
-        if isinstance(item, ast.FunctionDef):
-            methods.append(format_function_signature(item))
-
-    if methods:
+    if cls.methods:
         lines.append("Methods:")
-        for method in methods:
-            lines.append(f"- {method}")
+        for method in cls.methods:
+            lines.append(f"- {method.signature}")
         lines.append("")
 
     return "\n".join(lines).strip()
@@ -302,7 +243,7 @@ def build_class_overview(
 def build_method_overview(
     path: Path,
     class_name: str,
-    func: ast.FunctionDef,
+    func: FunctionStructure,
 ) -> str:
     """
     Build a short semantic description of a class method.
@@ -312,28 +253,19 @@ def build_method_overview(
 
     lines: list[str] = []
 
-    lines.append(f"Method: {class_name}.{format_function_signature(func)}")
+    lines.append(f"Method: {class_name}.{func.signature}")
     lines.append(f"Defined in: {path}")
     lines.append(f"Class: {class_name}")
     lines.append("")
 
-    doc = ast.get_docstring(func)
-    if doc:
+    if func.docstring:
         lines.append("Docstring:")
-        lines.append(doc.strip())
+        lines.append(func.docstring.strip())
         lines.append("")
 
-    if func.returns:
-        try:
-            returns = ast.unparse(func.returns)
-        except Exception:
-            returns = "unknown"
-    else:
-        returns = "unknown"
+    lines.append(f"Returns: {func.returns}")
 
-    lines.append(f"Returns: {returns}")
-
-    if any(isinstance(n, ast.Yield) for n in ast.walk(func)):
+    if func.is_generator:
         lines.append("Type: generator")
 
     return "\n".join(lines)
@@ -346,7 +278,7 @@ def build_method_overview(
 
 def build_function_overview(
     path: Path,
-    func: ast.FunctionDef,
+    func: FunctionStructure,
 ) -> str:
     """
     Build a short semantic description of a standalone function.
@@ -357,30 +289,21 @@ def build_function_overview(
 
     lines: list[str] = []
 
-    lines.append(f"Function: {format_function_signature(func)}")
+    lines.append(f"Function: {func.signature}")
     lines.append(f"Defined in: {path}")
     lines.append("")
 
     # Docstring (if present)
-    doc = ast.get_docstring(func)
-    if doc:
+    if func.docstring:
         lines.append("Docstring:")
-        lines.append(doc.strip())
+        lines.append(func.docstring.strip())
         lines.append("")
 
     # Return annotation
-    if func.returns:
-        try:
-            returns = ast.unparse(func.returns)
-        except Exception:
-            returns = "unknown"
-    else:
-        returns = "unknown"
-
-    lines.append(f"Returns: {returns}")
+    lines.append(f"Returns: {func.returns}")
 
     # Generator hint (semantic signal)
-    if any(isinstance(n, ast.Yield) for n in ast.walk(func)):
+    if func.is_generator:
         lines.append("Type: generator")
 
     return "\n".join(lines)
@@ -61,4 +61,14 @@ class CodeChunk:
     # - summarized
     # - embedded
     # - shown to ChatGPT
+    #
+    # Empty for code chunks whose source lives in the
+    # blob store (see below).
     text: str
+
+    # Where the source of a code chunk lives, when it is
+    # not stored inline: a content-addressed blob (sha256)
+    # and the UTF-8 byte range [start, end) within it.
+    blob: str | None = None
+    start: int | None = None
+    end: int | None = None
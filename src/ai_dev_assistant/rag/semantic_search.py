@@ -1,18 +1,143 @@
 # rag/semantic_search.py
 from __future__ import annotations
 
-from typing import List, Tuple
+from typing import Iterable, List, Sequence, Tuple
 
-from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.rag.config import VECTOR_INDEX_EF_SEARCH, VECTOR_INDEX_NPROBE
+from ai_dev_assistant.rag.session import get_session
 
 
 def search(
     query_vector: List[float],
     k: int = 5,
+    model: str | None = None,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    types: Iterable[str] | None = None,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
 ) -> List[Tuple[str, float]]:
     """
     Core vector retrieval.
     No cost logic. No OpenAI calls except embedding.
+
+    If model is given, the index must have been built with it.
+    nprobe / ef_search tune approximate indexes for this query.
+    types / path_prefix / packages restrict the results to the
+    matching chunks (see VectorStore.search).
+
+    The index stays resident in the process session and is only
+    reloaded when its files change.
+    """
+    store = get_session().vector_store()
+    if model is not None:
+        store.check_query(model, len(query_vector))
+    return store.search(
+        query_vector,
+        k=k,
+        nprobe=nprobe,
+        ef_search=ef_search,
+        types=types,
+        path_prefix=path_prefix,
+        packages=packages,
+    )
+
+
+def search_batch(
+    query_vectors: List[List[float]],
+    k: int = 5,
+    model: str | None = None,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    types: Iterable[str] | None = None,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
+) -> List[List[Tuple[str, float]]]:
     """
-    store = VectorStore.load()
-    return store.search(query_vector, k=k)
+    Vector retrieval for several queries in one index search.
+    """
+    if not query_vectors:
+        return []
+
+    store = get_session().vector_store()
+    if model is not None:
+        store.check_query(model, len(query_vectors[0]))
+    return store.search_batch(
+        query_vectors,
+        k=k,
+        nprobe=nprobe,
+        ef_search=ef_search,
+        types=types,
+        path_prefix=path_prefix,
+        packages=packages,
+    )
+
+
+def search_partitions(
+    query_vector: List[float],
+    partitions: Sequence[tuple[str, int]],
+    model: str | None = None,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
+) -> List[Tuple[str, float]]:
+    """
+    Vector retrieval from per-chunk-type sub-indexes.
+    """
+    return search_partitions_batch(
+        [query_vector],
+        partitions,
+        model=model,
+        nprobe=nprobe,
+        ef_search=ef_search,
+        path_prefix=path_prefix,
+        packages=packages,
+    )[0]
+
+
+def search_partitions_batch(
+    query_vectors: List[List[float]],
+    partitions: Sequence[tuple[str, int]],
+    model: str | None = None,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
+) -> List[List[Tuple[str, float]]]:
+    """
+    Up to k chunks from each (chunk type, k) partition, merged
+    by score, for several queries.
+
+    Each partition is searched in its own sub-index, which only
+    holds chunks of that type. Without one (partitions disabled,
+    or an index built before them), the main index is searched
+    with a chunk type filter instead.
+    """
+    if not query_vectors:
+        return []
+
+    session = get_session()
+    batch: List[List[Tuple[str, float]]] = [[] for _ in query_vectors]
+
+    for partition, k in partitions:
+        if session.has_partition(partition):
+            store, types = session.vector_store(partition), None
+        else:
+            store, types = session.vector_store(), [partition]
+        if model is not None:
+            store.check_query(model, len(query_vectors[0]))
+
+        found = store.search_batch(
+            query_vectors,
+            k=k,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            types=types,
+            path_prefix=path_prefix,
+            packages=packages,
+        )
+        for results, partition_results in zip(batch, found, strict=True):
+            results.extend(partition_results)
+
+    return [sorted(results, key=lambda item: item[1], reverse=True) for results in batch]
@@ -0,0 +1,162 @@
+# rag/session.py
+"""
+Process-level repository session.
+
+Loading the FAISS index and opening the chunk artifacts costs far
+more than a search. A RepoSession keeps both resident, so the
+turns of a chat (or the requests of a server) only pay for it
+once per repository.
+
+Each access stats the files behind a resource and reloads it if
+any of them changed (path, inode, mtime, size). An index or artifact
+rebuilt by another process (build_vector_store, watch) is picked
+up by the next query.
+
+Usage:
+    session = get_session()
+    results = session.vector_store().search(vector, k=5)
+    with session.artifacts() as artifacts:
+        context = build_context(results, options, artifacts)
+"""
+
+from __future__ import annotations
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.rag.config import VECTOR_INDEX_MMAP
+from ai_dev_assistant.tools.artifacts import resolve_chunks_path, resolve_embeddings_path
+from ai_dev_assistant.tools.defaults import (
+    get_active_repo_name,
+    get_artifacts_db_path,
+    get_faiss_index_path,
+    get_faiss_meta_path,
+)
+
+from .context import JsonArtifacts, SqliteArtifacts, open_artifacts
+
+Stamp = tuple[tuple[str, int, int, int] | None, ...]
+
+
+def file_stamp(*paths: Path) -> Stamp:
+    """
+    Identity of the current version of each file (None: missing).
+    Files replaced atomically get a new inode.
+    """
+    stamps = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            stamps.append(None)
+        else:
+            stamps.append((str(path), stat.st_ino, stat.st_mtime_ns, stat.st_size))
+    return tuple(stamps)
+
+
+class RepoSession:
+    """
+    Resident vector store and artifact lookups of one repository.
+    """
+
+    def __init__(self, repo_name: str):
+        self.repo_name = repo_name
+        # Number of times each resource was (re)loaded
+        self.loads = {"vector_store": 0, "artifacts": 0}
+
+        self._lock = threading.Lock()
+        # Partition (None: main index) -> store and its stamp
+        self._stores: dict[str | None, tuple[VectorStore, Stamp]] = {}
+        self._artifacts: SqliteArtifacts | JsonArtifacts | None = None
+        self._artifacts_stamp: Stamp | None = None
+        # Queries using each open lookup (by id), current or replaced
+        self._artifact_users: dict[int, int] = {}
+
+    def _store_files(self, partition: str | None = None) -> Stamp:
+        # Re-scoring reads embeddings.npy, so it is part of the index
+        return file_stamp(
+            get_faiss_index_path(self.repo_name, partition),
+            get_faiss_meta_path(self.repo_name, partition),
+            resolve_embeddings_path(self.repo_name),
+        )
+
+    def _artifact_files(self) -> Stamp:
+        db_path = get_artifacts_db_path(self.repo_name)
+        return file_stamp(db_path if db_path.exists() else resolve_chunks_path(self.repo_name))
+
+    def has_partition(self, partition: str) -> bool:
+        return get_faiss_index_path(self.repo_name, partition).exists()
+
+    def vector_store(self, partition: str | None = None) -> VectorStore:
+        """
+        The main index, or the sub-index of a chunk type.
+        """
+        with self._lock:
+            stamp = self._store_files(partition)
+            cached = self._stores.get(partition)
+            if cached is None or stamp != cached[1]:
+                # Searched only: read-only, memory-mapped unless RAG_INDEX_MMAP=0
+                store = VectorStore.load(self.repo_name, partition=partition, read_only=True, mmap=VECTOR_INDEX_MMAP)
+                cached = self._stores[partition] = (store, stamp)
+                self.loads["vector_store"] += 1
+            return cached[0]
+
+    @contextmanager
+    def artifacts(self) -> Iterator[SqliteArtifacts | JsonArtifacts]:
+        """
+        Artifact lookups for the duration of a query.
+
+        Replaced lookups are closed by the last query using
+        them (at once if none is).
+        """
+        with self._lock:
+            stamp = self._artifact_files()
+            if self._artifacts is None or stamp != self._artifacts_stamp:
+                self._release(self._artifacts)
+                self._artifacts = open_artifacts(self.repo_name)
+                self._artifacts_stamp = stamp
+                self.loads["artifacts"] += 1
+            artifacts = self._artifacts
+            self._artifact_users[id(artifacts)] = self._artifact_users.get(id(artifacts), 0) + 1
+
+        try:
+            yield artifacts
+        finally:
+            with self._lock:
+                self._artifact_users[id(artifacts)] -= 1
+                if artifacts is not self._artifacts:
+                    self._release(artifacts)
+
+    def _release(self, artifacts: SqliteArtifacts | JsonArtifacts | None) -> None:
+        # Close replaced lookups no query uses (caller holds the lock)
+        if artifacts is not None and not self._artifact_users.get(id(artifacts)):
+            self._artifact_users.pop(id(artifacts), None)
+            artifacts.close()
+
+
+_sessions: dict[str, RepoSession] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(repo_name: str | None = None) -> RepoSession:
+    """
+    Session of a repository (default: the active one), created
+    on first use and kept for the life of the process.
+    """
+    repo_name = repo_name or get_active_repo_name()
+    with _sessions_lock:
+        if repo_name not in _sessions:
+            _sessions[repo_name] = RepoSession(repo_name)
+        return _sessions[repo_name]
+
+
+def clear_sessions() -> None:
+    """
+    Drop every resident session (their resources are released
+    once no query uses them).
+    """
+    with _sessions_lock:
+        _sessions.clear()
@@ -0,0 +1,213 @@
+"""
+structure.py
+
+Single-pass structural extraction for a Python module.
+
+One StructureVisitor run per file collects everything the
+overview builders and the chunker need:
+- module docstring, imports and globals
+- classes with bases, docstring, attributes and methods
+- standalone functions with nested functions
+- signatures, return annotations and generator flags
+
+The overview builders then only format this data; they never
+walk the AST themselves.
+"""
+
+import ast
+from dataclasses import dataclass, field
+
+from .ast_utils import SourceIndex, is_overload_function
+
+
+def format_function_signature(func: ast.FunctionDef) -> str:
+    """
+    Return a human-readable function signature extracted from AST.
+
+    Examples:
+    - foo(a, b)
+    - bar(path, strict=False)
+    """
+
+    parts: list[str] = []
+
+    # Positional arguments (skip self)
+    for arg in func.args.args:
+        if arg.arg != "self":
+            parts.append(arg.arg)
+
+    # *args
+    if func.args.vararg:
+        parts.append(f"*{func.args.vararg.arg}")
+
+    # **kwargs
+    if func.args.kwarg:
+        parts.append(f"**{func.args.kwarg.arg}")
+
+    return f"{func.name}({', '.join(parts)})"
+
+
+# ============================================================
+# STRUCTURE
+# ============================================================
+
+
+@dataclass
+class FunctionStructure:
+    node: ast.FunctionDef
+    name: str
+    signature: str
+    docstring: str | None
+    returns: str
+    is_overload: bool
+    is_generator: bool
+    source: str
+
+    # UTF-8 byte range of the definition in the module source
+    span: tuple[int, int] | None = None
+    nested: list[str] = field(default_factory=list)
+
+
+@dataclass
+class ClassStructure:
+    node: ast.ClassDef
+    name: str
+    bases: list[str]
+    docstring: str | None
+    source: str
+    span: tuple[int, int] | None = None
+    attributes: list[str] = field(default_factory=list)
+
+    # Every method definition, including overload stubs
+    methods: list[FunctionStructure] = field(default_factory=list)
+
+
+@dataclass
+class ModuleStructure:
+    docstring: str | None = None
+    imports: list[str] = field(default_factory=list)
+    variables: list[str] = field(default_factory=list)
+    classes: list[ClassStructure] = field(default_factory=list)
+
+    # Runtime-real top-level functions (see ast_utils.iter_real_functions)
+    functions: list[FunctionStructure] = field(default_factory=list)
+
+
+# ============================================================
+# VISITOR
+# ============================================================
+
+
+class StructureVisitor(ast.NodeVisitor):
+    """
+    Collect a ModuleStructure in one pass over the module.
+
+    Only module-level statements and class bodies are visited.
+    A function body is descended into only when its source text
+    contains "yield", since no Yield node can exist otherwise.
+    """
+
+    def __init__(self, source: SourceIndex):
+        self.source = source
+        self.module = ModuleStructure()
+        self._functions: dict[str, FunctionStructure] = {}
+
+    # --------------------------------------------------
+    # Module level
+    # --------------------------------------------------
+
+    def visit_Module(self, node: ast.Module) -> None:
+        self.module.docstring = ast.get_docstring(node)
+
+        for stmt in node.body:
+            self.visit(stmt)
+
+        # Last definition wins, first position is kept
+        self.module.functions = list(self._functions.values())
+
+    def visit_Import(self, node: ast.Import) -> None:
+        self.module.imports.extend(name.name for name in node.names)
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:
+        mod = node.module or ""
+        self.module.imports.extend(f"{mod}.{name.name}" for name in node.names)
+
+    def visit_Assign(self, node: ast.Assign) -> None:
+        self.module.variables.extend(_assigned_names(node))
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        bases: list[str] = []
+        for base_expr in node.bases:
+            if isinstance(base_expr, ast.Name):
+                bases.append(base_expr.id)
+            elif isinstance(base_expr, ast.Attribute):
+                bases.append(ast.unparse(base_expr))
+
+        cls = ClassStructure(
+            node=node,
+            name=node.name,
+            bases=bases,
+            docstring=ast.get_docstring(node),
+            source=self.source.segment(node) or "",
+            span=self.source.byte_range(node),
+        )
+
+        for item in node.body:
+            if isinstance(item, ast.Assign):
+                cls.attributes.extend(_assigned_names(item))
+            elif isinstance(item, ast.FunctionDef):
+                cls.methods.append(self._collect_function(item))
+
+        self.module.classes.append(cls)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        func = self._collect_function(node)
+        if func.is_overload:
+            return
+
+        func.nested = [item.name for item in node.body if isinstance(item, ast.FunctionDef) and not is_overload_function(item)]
+        self._functions[func.name] = func
+
+    def generic_visit(self, node: ast.AST) -> None:
+        # Other module-level statements carry no structure
+        return
+
+    # --------------------------------------------------
+    # Functions
+    # --------------------------------------------------
+
+    def _collect_function(self, node: ast.FunctionDef) -> FunctionStructure:
+        source = self.source.segment(node) or ""
+
+        if node.returns:
+            try:
+                returns = ast.unparse(node.returns)
+            except Exception:
+                returns = "unknown"
+        else:
+            returns = "unknown"
+
+        return FunctionStructure(
+            node=node,
+            name=node.name,
+            signature=format_function_signature(node),
+            docstring=ast.get_docstring(node),
+            returns=returns,
+            is_overload=is_overload_function(node),
+            is_generator="yield" in source and any(isinstance(n, ast.Yield) for n in ast.walk(node)),
+            source=source,
+            span=self.source.byte_range(node),
+        )
+
+
+def _assigned_names(node: ast.Assign) -> list[str]:
+    return [target.id for target in node.targets if isinstance(target, ast.Name)]
+
+
+def collect_module_structure(tree: ast.Module, code: str) -> ModuleStructure:
+    """
+    Extract the structure of a parsed module in a single pass.
+    """
+    visitor = StructureVisitor(SourceIndex(code))
+    visitor.visit(tree)
+    return visitor.module
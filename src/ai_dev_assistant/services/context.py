@@ -23,6 +23,7 @@ from typing import Dict, List
 
 from ai_dev_assistant.rag.context import ContextOptions, build_context
 from ai_dev_assistant.rag.modes import ConversationMode, get_mode_policy
+from ai_dev_assistant.rag.session import get_session
 
 
 def build_query_context(
@@ -46,6 +47,7 @@ def build_query_context(
     - Pure function (no AI calls)
     - Deterministic
     - Safe to preview in UI before spending tokens
+    - Artifact lookups stay resident in the process session
     """
 
     pairs = [(c["chunk_id"], c["score"]) for c in chunks]
@@ -58,7 +60,8 @@ def build_query_context(
         inject_project_overview=policy.inject_project_overview,
     )
 
-    context = build_context(pairs, options)
+    with get_session().artifacts() as artifacts:
+        context = build_context(pairs, options, artifacts)
 
     return {
         "context": context,
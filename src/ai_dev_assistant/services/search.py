@@ -18,26 +18,67 @@ Rule:
 "inspect_repo.py answers: which parts of the codebase are relevant?"
 """
 
-from typing import Dict
+from typing import Dict, Iterable, List, Sequence
 
-from ai_dev_assistant.infra.config import EMBEDDING_MODEL, is_dry_run
-from ai_dev_assistant.infra.embeddings import embed_query
+from ai_dev_assistant.infra.config import EMBEDDING_MODEL, EMBEDDING_TARGET_DIM, is_dry_run
+from ai_dev_assistant.infra.embeddings import embed_queries, embed_query, is_local_model
+from ai_dev_assistant.rag.config import VECTOR_INDEX_EF_SEARCH, VECTOR_INDEX_NPROBE
 from ai_dev_assistant.rag.cost import estimate_embedding_cost
-from ai_dev_assistant.rag.semantic_search import search
+from ai_dev_assistant.rag.semantic_search import search, search_batch, search_partitions, search_partitions_batch
+
+DEFAULT_K = 5
+
+
+def _plan(partitions: Sequence[tuple[str, int]], types: Iterable[str] | None, k: int | None) -> List[tuple[str, int]]:
+    # A type filter narrows the partitions searched; an explicit k is
+    # shared out between them in proportion to their own k. An empty
+    # plan means a plain (filtered) top-k search.
+    wanted = None if types is None else set(types)
+    selected = [(partition, n) for partition, n in partitions if wanted is None or partition in wanted]
+    if not selected or k is None:
+        return selected
+
+    total = sum(n for _, n in selected)
+    shares = [n * k // total for _, n in selected]
+    by_remainder = sorted(range(len(selected)), key=lambda i: -(selected[i][1] * k % total))
+    for i in by_remainder[: k - sum(shares)]:
+        shares[i] += 1
+    return [(partition, share) for (partition, _), share in zip(selected, shares, strict=True) if share]
 
 
 def search_query(
     query: str,
-    k: int = 5,
+    k: int | None = None,
     model: str = EMBEDDING_MODEL,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    types: Iterable[str] | None = None,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
+    partitions: Sequence[tuple[str, int]] = (),
 ) -> Dict:
     """
     Perform semantic search over the embedded codebase.
 
     Input:
     - query: natural language question
-    - k: number of top chunks to retrieve
+    - k: number of top chunks to retrieve (None: 5, or the
+      partitions' own k)
     - model: embedding model
+    - dimensions: shortened vector size (must match the index)
+    - nprobe / ef_search: speed / recall of IVF / HNSW indexes
+      (None: the index's own setting)
+    - types: chunk types to search (None: all)
+    - path_prefix: only chunks of files under this path,
+      relative to the repo root (e.g. "src/pkg/services/")
+    - packages: only chunks of these packages and their
+      subpackages (e.g. ["pkg.services"])
+    - partitions: (chunk type, k) pairs, e.g. a ModePolicy's
+      partitions; if given, up to k chunks are retrieved from
+      each chunk type's sub-index instead of the overall top-k.
+      An explicit k is split between the partitions; types that
+      match none of them fall back to a plain top-k search
 
     Output (dict):
     {
@@ -57,10 +98,11 @@ def search_query(
     - Safe to call frequently
     - Cheap compared to LLM calls
     - Deterministic for a given index
+    - Local embedding models search even in dry-run mode
     """
     tokens, cost = estimate_embedding_cost([query], model)
 
-    if is_dry_run():
+    if is_dry_run() and not is_local_model(model):
         return {
             "query": query,
             "chunks": [],
@@ -71,8 +113,29 @@ def search_query(
             },
         }
 
-    vector = embed_query(query, model=model)
-    results = search(vector, k=k)
+    vector = embed_query(query, model=model, dimensions=dimensions)
+    plan = _plan(partitions, types, k)
+    if plan:
+        results = search_partitions(
+            vector,
+            plan,
+            model=model,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            path_prefix=path_prefix,
+            packages=packages,
+        )
+    else:
+        results = search(
+            vector,
+            k=DEFAULT_K if k is None else k,
+            model=model,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            types=types,
+            path_prefix=path_prefix,
+            packages=packages,
+        )
 
     return {
         "query": query,
@@ -83,3 +146,87 @@ def search_query(
             "estimated_cost": cost,
         },
     }
+
+
+def search_queries(
+    queries: List[str],
+    k: int | None = None,
+    model: str = EMBEDDING_MODEL,
+    dimensions: int | None = EMBEDDING_TARGET_DIM,
+    nprobe: int | None = VECTOR_INDEX_NPROBE,
+    ef_search: int | None = VECTOR_INDEX_EF_SEARCH,
+    types: Iterable[str] | None = None,
+    path_prefix: str | None = None,
+    packages: Iterable[str] | None = None,
+    partitions: Sequence[tuple[str, int]] = (),
+) -> Dict:
+    """
+    Semantic search for several queries at once: one embedding
+    request and one index search for the whole batch.
+
+    Input: as search_query, with a list of queries (the
+    filters apply to every query).
+
+    Output (dict):
+    {
+        "results": [
+            {"query": str, "chunks": [{"chunk_id": str, "score": float}, ...]},
+            ...
+        ],
+        "dry_run": bool,
+        "cost": {
+            "embedding_tokens": int,   # for all queries
+            "estimated_cost": float
+        }
+    }
+
+    Notes:
+    - For evaluation jobs, multi-query retrieval and server-side
+      micro-batching
+    - Results are in query order
+    """
+    tokens, cost = estimate_embedding_cost(queries, model)
+    cost_info = {
+        "embedding_tokens": tokens,
+        "estimated_cost": cost,
+    }
+
+    if is_dry_run() and not is_local_model(model):
+        return {
+            "results": [{"query": query, "chunks": []} for query in queries],
+            "dry_run": True,
+            "cost": cost_info,
+        }
+
+    vectors = embed_queries(queries, model=model, dimensions=dimensions)
+    plan = _plan(partitions, types, k)
+    if plan:
+        batch = search_partitions_batch(
+            vectors,
+            plan,
+            model=model,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            path_prefix=path_prefix,
+            packages=packages,
+        )
+    else:
+        batch = search_batch(
+            vectors,
+            k=DEFAULT_K if k is None else k,
+            model=model,
+            nprobe=nprobe,
+            ef_search=ef_search,
+            types=types,
+            path_prefix=path_prefix,
+            packages=packages,
+        )
+
+    return {
+        "results": [
+            {"query": query, "chunks": [{"chunk_id": cid, "score": score} for cid, score in results]}
+            for query, results in zip(queries, batch, strict=True)
+        ],
+        "dry_run": False,
+        "cost": cost_info,
+    }
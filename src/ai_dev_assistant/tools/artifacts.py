@@ -0,0 +1,287 @@
+"""
+tools/artifacts.py
+
+Streaming reader/writer for chunk and embedding artifacts.
+
+Format:
+- chunks.jsonl: one JSON object per line, written as chunks
+  are produced and read back lazily
+- chunks.json: legacy format (a single JSON list), still
+  readable so existing workspaces keep working
+
+Writes go to a temporary file that atomically replaces the
+artifact on success, so readers never see a partial file.
+
+Code chunks may reference their source in the blob store
+instead of carrying it (see tools/blobs.py); chunk_text()
+resolves either form.
+
+Embeddings are a float32 (or float16) matrix in embeddings.npy,
+memory-mapped on load, with row ids, the model name and the
+vector size in the embeddings.ids.json sidecar. The legacy embeddings.json (a list
+of records with inline vectors) is still readable.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import BinaryIO, Iterator, Sequence
+
+import numpy as np
+
+from ai_dev_assistant.rag.config import EMBEDDING_STORAGE_DTYPE
+from ai_dev_assistant.rag.schema import CodeChunk
+from ai_dev_assistant.tools.blobs import BlobStore
+from ai_dev_assistant.tools.defaults import (
+    get_chunks_path,
+    get_embedding_ids_path,
+    get_embeddings_path,
+    get_legacy_chunks_path,
+    get_legacy_embeddings_path,
+)
+
+EMBEDDING_DTYPES = ("float32", "float16")
+
+# ============================================================
+# READING
+# ============================================================
+
+
+def resolve_chunks_path(repo_name: str | None = None) -> Path:
+    """
+    Return the chunk artifact to read: chunks.jsonl if present,
+    otherwise a legacy chunks.json, otherwise the (missing)
+    chunks.jsonl path.
+    """
+    path = get_chunks_path(repo_name)
+    if path.exists():
+        return path
+
+    legacy = get_legacy_chunks_path(repo_name)
+    if legacy.exists():
+        return legacy
+
+    return path
+
+
+def iter_chunk_records(path: Path) -> Iterator[dict]:
+    """
+    Yield chunk records one at a time.
+    """
+    if path.suffix != ".jsonl":
+        yield from json.loads(path.read_text(encoding="utf-8"))
+        return
+
+    with path.open("rb") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def index_chunk_lines(path: Path) -> dict[str, tuple[int, int]]:
+    """
+    Map each source file to the byte span of its lines in a
+    chunks.jsonl artifact, so they can be copied verbatim.
+
+    Files whose records are not contiguous are left out.
+    """
+    spans: dict[str, tuple[int, int]] = {}
+    broken: set[str] = set()
+
+    current: str | None = None
+    offset = 0
+
+    with path.open("rb") as f:
+        for line in f:
+            file = json.loads(line)["file"]
+
+            if file != current:
+                if file in spans:
+                    broken.add(file)
+                spans[file] = (offset, offset)
+                current = file
+
+            offset += len(line)
+            spans[file] = (spans[file][0], offset)
+
+    for file in broken:
+        del spans[file]
+
+    return spans
+
+
+def read_span(f: BinaryIO, span: tuple[int, int]) -> bytes:
+    f.seek(span[0])
+    return f.read(span[1] - span[0])
+
+
+def chunk_text(record: dict, blobs: BlobStore | None = None) -> str:
+    """
+    Return the text of a chunk record, reading it from the
+    blob store if the chunk references one.
+    """
+    if not record.get("blob"):
+        return record["text"]
+
+    if blobs is None:
+        blobs = BlobStore.for_repo()
+    return blobs.read_text(record["blob"], record["start"], record["end"])
+
+
+# ============================================================
+# WRITING
+# ============================================================
+
+
+def chunk_record(chunk: CodeChunk) -> dict:
+    """
+    Serialize a chunk, leaving out unset blob references.
+    """
+    record = dict(chunk.__dict__)
+    if chunk.blob is None:
+        del record["blob"], record["start"], record["end"]
+    return record
+
+
+def encode_record(record: dict) -> bytes:
+    return (json.dumps(record) + "\n").encode("utf-8")
+
+
+class ChunkWriter:
+    """
+    Stream chunk records to a chunks.jsonl artifact.
+
+    Usage:
+        with ChunkWriter(path) as writer:
+            writer.write(chunk_record(chunk))
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.tmp_path = path.with_name(path.name + ".tmp")
+        self.count = 0
+        self._f: BinaryIO | None = None
+
+    def __enter__(self) -> "ChunkWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self.tmp_path.open("wb")
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        assert self._f is not None
+        self._f.close()
+
+        if exc_type is None:
+            os.replace(self.tmp_path, self.path)
+        else:
+            self.tmp_path.unlink(missing_ok=True)
+
+    def write(self, record: dict) -> None:
+        assert self._f is not None
+        self._f.write(encode_record(record))
+        self.count += 1
+
+    def write_raw(self, data: bytes) -> None:
+        """
+        Append already-encoded record lines (e.g. copied from a
+        previous artifact).
+        """
+        assert self._f is not None
+        self._f.write(data)
+        self.count += data.count(b"\n")
+
+
+# ============================================================
+# EMBEDDINGS
+# ============================================================
+
+
+def resolve_embeddings_path(repo_name: str | None = None) -> Path:
+    """
+    Return the embedding artifact to read: embeddings.npy if
+    present, otherwise a legacy embeddings.json, otherwise the
+    (missing) embeddings.npy path.
+    """
+    path = get_embeddings_path(repo_name)
+    if path.exists():
+        return path
+
+    legacy = get_legacy_embeddings_path(repo_name)
+    if legacy.exists():
+        return legacy
+
+    return path
+
+
+def load_embedding_meta(path: Path) -> dict:
+    """
+    Return {"model", "dim"} of an embedding artifact; the model
+    of a legacy embeddings.json is unknown (None).
+    """
+    if path.suffix != ".npy":
+        ids, matrix = load_embeddings(path)
+        return {"model": None, "dim": matrix.shape[1] if len(ids) else None}
+
+    meta = json.loads(path.with_suffix(".ids.json").read_text(encoding="utf-8"))
+    return {"model": meta.get("model"), "dim": meta.get("dim")}
+
+
+def load_embeddings(path: Path) -> tuple[list[str], np.ndarray]:
+    """
+    Return (ids, matrix) with one row per id.
+
+    embeddings.npy is opened read-only with mmap_mode="r", so
+    rows are paged in as they are used; callers that modify
+    vectors must copy them.
+    """
+    if path.suffix != ".npy":
+        records = json.loads(path.read_text(encoding="utf-8"))
+        ids = [r["id"] for r in records]
+        matrix = np.array([r["embedding"] for r in records], dtype=np.float32)
+        return ids, matrix
+
+    # embeddings.npy -> embeddings.ids.json
+    ids = json.loads(path.with_suffix(".ids.json").read_text(encoding="utf-8"))["ids"]
+    matrix = np.load(path, mmap_mode="r")
+
+    if matrix.shape[0] != len(ids):
+        raise RuntimeError(f"{path} has {matrix.shape[0]} rows but its id sidecar lists {len(ids)} ids")
+
+    return ids, matrix
+
+
+def write_embeddings(
+    ids: Sequence[str],
+    matrix: np.ndarray,
+    model: str,
+    repo_name: str | None = None,
+    dtype: str = EMBEDDING_STORAGE_DTYPE,
+) -> Path:
+    """
+    Write the embedding matrix and its id sidecar, each through
+    a temporary file, and drop a legacy embeddings.json.
+    """
+    if dtype not in EMBEDDING_DTYPES:
+        raise ValueError(f"Unsupported embedding dtype: {dtype!r} (expected one of {EMBEDDING_DTYPES})")
+    if len(ids) != matrix.shape[0]:
+        raise ValueError(f"Got {len(ids)} ids for {matrix.shape[0]} vectors")
+
+    path = get_embeddings_path(repo_name)
+    ids_path = get_embedding_ids_path(repo_name)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as f:
+        np.save(f, np.asarray(matrix, dtype=dtype))
+
+    tmp_ids = ids_path.with_name(ids_path.name + ".tmp")
+    meta = {"model": model, "dim": int(matrix.shape[1]) if matrix.ndim == 2 else None, "ids": list(ids)}
+    tmp_ids.write_text(json.dumps(meta), encoding="utf-8")
+
+    os.replace(tmp_path, path)
+    os.replace(tmp_ids, ids_path)
+    get_legacy_embeddings_path(repo_name).unlink(missing_ok=True)
+
+    return path
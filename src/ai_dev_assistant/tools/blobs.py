@@ -0,0 +1,90 @@
+"""
+tools/blobs.py
+
+Content-addressed store for source files.
+
+Each distinct source text is stored once, under the sha256
+of its UTF-8 bytes:
+
+    <data_root>/<repo_name>/blobs/<hash[:2]>/<hash>
+
+Code-bearing chunks (module, class, method, function) do not
+carry their text; they reference (blob, start, end), a byte
+range in one of these blobs, which is read on demand.
+
+Writes are atomic, so concurrent chunking processes can add
+the same blob safely.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from pathlib import Path
+
+from ai_dev_assistant.tools.defaults import get_blobs_dir
+
+
+class BlobStore:
+    def __init__(self, root: Path):
+        self.root = root
+
+    @classmethod
+    def for_repo(cls, repo_name: str | None = None) -> "BlobStore":
+        return cls(get_blobs_dir(repo_name))
+
+    def path(self, blob: str) -> Path:
+        return self.root / blob[:2] / blob
+
+    # --------------------------------------------------
+    # Writing
+    # --------------------------------------------------
+
+    def put(self, data: bytes) -> str:
+        """
+        Store data (if not present yet) and return its hash.
+        """
+        blob = hashlib.sha256(data).hexdigest()
+        path = self.path(blob)
+
+        if path.exists():
+            return blob
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+        return blob
+
+    def prune(self, keep: set[str]) -> int:
+        """
+        Delete blobs not in keep. Returns the number deleted.
+        """
+        if not self.root.exists():
+            return 0
+
+        deleted = 0
+        for path in self.root.glob("*/*"):
+            if path.name not in keep:
+                path.unlink(missing_ok=True)
+                deleted += 1
+        return deleted
+
+    # --------------------------------------------------
+    # Reading
+    # --------------------------------------------------
+
+    def read(self, blob: str, start: int = 0, end: int | None = None) -> bytes:
+        with self.path(blob).open("rb") as f:
+            f.seek(start)
+            return f.read() if end is None else f.read(end - start)
+
+    def read_text(self, blob: str, start: int = 0, end: int | None = None) -> str:
+        return self.read(blob, start, end).decode("utf-8")
@@ -7,41 +7,259 @@ Pure pipeline step:
 - no CLI
 - no env parsing
 - no interactive defaults
+
+In incremental mode, the pending embedding change set is
+applied to the saved index instead of rebuilding it.
+
+The index type (flat, sq8, ivfpq, ivfflat, hnsw or auto) and
+re-scoring factor default to RAG_INDEX_TYPE / RAG_INDEX_RERANK for
+new indexes; incremental updates keep those of the saved index.
+
+Each vector is stored with the type, file and package of its
+chunk (from the chunk artifact), for filtered search.
+
+Unless RAG_INDEX_PARTITIONS=0, one sub-index per chunk type is
+saved as well (faiss.<type>.index), for the conversation modes
+that retrieve by chunk type. Sub-indexes use the type and
+re-scoring factor of the main index, so they take no more memory
+than it does.
 """
 
 from __future__ import annotations
 
-import json
+from pathlib import Path, PurePosixPath
+from typing import Dict, List, Sequence
+
+import numpy as np
 
-from ai_dev_assistant.infra.vector_store import VectorStore
-from ai_dev_assistant.rag.config import VECTOR_DIM
+from ai_dev_assistant.infra.vector_store import (
+    AUTO_INDEX_TYPE,
+    ChunkMeta,
+    VectorStore,
+    choose_index_type,
+)
+from ai_dev_assistant.rag.config import VECTOR_INDEX_PARTITIONS, VECTOR_INDEX_RERANK, VECTOR_INDEX_TYPE
+from ai_dev_assistant.rag.embedding_policy import EMBEDDABLE_TYPES
+from ai_dev_assistant.tools.artifacts import (
+    iter_chunk_records,
+    load_embedding_meta,
+    load_embeddings,
+    resolve_chunks_path,
+    resolve_embeddings_path,
+)
 from ai_dev_assistant.tools.defaults import (
     get_active_repo_name,
-    get_embeddings_path,
+    get_embedding_changes_path,
     get_faiss_index_path,
     get_faiss_meta_path,
 )
+from ai_dev_assistant.tools.manifest import ChangeSet, load_changes
+
+# Metadata of chunks missing from the chunk artifact
+UNKNOWN_CHUNK = ChunkMeta(type="", file="", package="")
+
+# PQ codebooks need a few hundred vectors to train (256 centroids
+# per sub-space); smaller ivfpq sub-indexes are scalar-quantized
+PQ_MIN_PARTITION_VECTORS = 256
+
+
+def package_of(path: str) -> str:
+    """
+    Dotted package of a repo-relative file path, without a
+    src/ layout directory ("src/pkg/sub/mod.py" -> "pkg.sub").
+    """
+    parts = PurePosixPath(path).parent.parts
+    if parts[:1] == ("src",):
+        parts = parts[1:]
+    return ".".join(parts)
+
+
+def chunk_metadata(ids: Sequence[str], repo_name: str | None = None) -> List[ChunkMeta] | None:
+    """
+    Metadata of the embedded chunks, in ids order (None: no
+    chunk artifact).
+
+    Chunk files are absolute; they are made relative to the
+    repo root, which is the file of the project chunk.
+    """
+    chunks_path = resolve_chunks_path(repo_name)
+    if not chunks_path.exists():
+        return None
+
+    records = {r["id"]: r for r in iter_chunk_records(chunks_path) if r["type"] in EMBEDDABLE_TYPES}
+    roots = [Path(r["file"]) for r in records.values() if r["type"] == "project"]
+
+    def relative(file: str) -> str:
+        path = Path(file)
+        if roots and path.is_relative_to(roots[0]):
+            path = path.relative_to(roots[0])
+        return path.as_posix() if path.parts else ""
+
+    metadata = []
+    for chunk_id in ids:
+        record = records.get(chunk_id)
+        if record is None:
+            metadata.append(UNKNOWN_CHUNK)
+        elif record["type"] == "project":
+            metadata.append(ChunkMeta(type="project", file="", package=""))
+        else:
+            file = relative(record["file"])
+            metadata.append(ChunkMeta(type=record["type"], file=file, package=package_of(file)))
+    return metadata
 
 
-def main() -> None:
+def partition_index_type(index_type: str, count: int) -> str:
+    """
+    Index type of a sub-index of count vectors under a main index
+    of the given type.
+    """
+    if index_type == "ivfpq" and count < PQ_MIN_PARTITION_VECTORS:
+        return "sq8"
+    return index_type
+
+
+def save_partitions(
+    store: VectorStore,
+    ids: Sequence[str],
+    matrix: np.ndarray,
+    metadata: Sequence[ChunkMeta] | None,
+    delta: ChangeSet | None = None,
+) -> Dict[str, int]:
+    """
+    Build (or, with a change set, update) the sub-index of each
+    chunk type next to the saved main index, and delete those of
+    types without vectors. Without metadata, all are deleted.
+
+    Returns the number of vectors per saved sub-index.
+    """
+    rows_by_type: Dict[str, List[int]] = {}
+    for row, meta in enumerate(metadata or []):
+        if meta.type in EMBEDDABLE_TYPES:
+            rows_by_type.setdefault(meta.type, []).append(row)
+
+    counts = {}
+
+    for chunk_type in sorted(EMBEDDABLE_TYPES):
+        rows = rows_by_type.get(chunk_type)
+        index_path = get_faiss_index_path(partition=chunk_type)
+
+        if not rows:
+            index_path.unlink(missing_ok=True)
+            get_faiss_meta_path(partition=chunk_type).unlink(missing_ok=True)
+            continue
+
+        if delta is not None and index_path.exists():
+            # A chunk may change type: drop it from every sub-index
+            added = set(delta.added)
+            partition = VectorStore.load(partition=chunk_type)
+            partition.remove(set(delta.removed) | added)
+            new_rows = [row for row in rows if ids[row] in added]
+            if new_rows:
+                partition.add([ids[row] for row in new_rows], matrix[new_rows], [metadata[row] for row in new_rows])
+            partition.rerank = store.rerank
+        else:
+            partition = VectorStore(
+                dim=store.dim,
+                model=store.model,
+                index_type=partition_index_type(store.index_type, len(rows)),
+                rerank=store.rerank,
+                partition=chunk_type,
+            )
+            partition.build([ids[row] for row in rows], matrix[rows], [metadata[row] for row in rows])
+
+        partition.save()
+        counts[chunk_type] = len(partition)
+
+    return counts
+
+
+def main(
+    *,
+    incremental: bool = False,
+    index_type: str | None = None,
+    rerank: int | None = None,
+) -> None:
+    """
+    Build (or update) the vector store for the active repository.
+
+    Parameters
+    ----------
+    incremental : bool
+        Apply the pending embedding change set to the saved
+        index instead of rebuilding it from scratch.
+    index_type : str, optional
+        "flat", "sq8", "ivfpq", "ivfflat", "hnsw", or "auto" to
+        pick one from the vector count. A type different from
+        the saved index forces a full rebuild.
+    rerank : int, optional
+        Re-score rerank * k candidates exactly at query time.
+    """
     print(f"Building vector store for '{get_active_repo_name()}'")
 
-    embeddings_path = get_embeddings_path()
+    embeddings_path = resolve_embeddings_path()
+    changes_path = get_embedding_changes_path()
 
     if not embeddings_path.exists():
         raise RuntimeError("Embeddings file not found.\nRun rebuild_embeddings first.")
 
-    records = json.loads(embeddings_path.read_text())
+    delta: ChangeSet | None = None
+
+    if incremental and get_faiss_index_path().exists():
+        pending = load_changes(changes_path)
+        if pending is None or pending.is_empty():
+            print("No embedding changes; vector store is up to date")
+            return
+        if not pending.full:
+            delta = pending
+
+    ids, matrix = load_embeddings(embeddings_path)
+    model = load_embedding_meta(embeddings_path)["model"]
+
+    if index_type == AUTO_INDEX_TYPE:
+        index_type = choose_index_type(len(ids))
+
+    if delta is not None:
+        store = VectorStore.load()
+        if store.model != model or store.dim != matrix.shape[1]:
+            print("Embedding model or dimensions changed; rebuilding the index")
+            delta = None
+        elif index_type not in (None, store.index_type):
+            print(f"Index type changed ({store.index_type} -> {index_type}); rebuilding the index")
+            delta = None
+        elif not store.has_metadata:
+            print("Index has no chunk metadata; rebuilding the index")
+            delta = None
+        elif rerank is not None:
+            store.rerank = rerank
+
+    metadata = chunk_metadata(ids)
 
-    store = VectorStore(dim=VECTOR_DIM)
-    store.build(records)
+    if delta is not None:
+        added = set(delta.added)
+        rows = [i for i, chunk_id in enumerate(ids) if chunk_id in added]
+        removed = store.remove(set(delta.removed) - added)
+        written = store.upsert([ids[i] for i in rows], matrix[rows], metadata and [metadata[i] for i in rows])
+        print(f"Incremental update: {written} added or replaced, {removed} removed vectors")
+    else:
+        store = VectorStore(
+            dim=matrix.shape[1],
+            model=model,
+            index_type=index_type or VECTOR_INDEX_TYPE,
+            rerank=VECTOR_INDEX_RERANK if rerank is None else rerank,
+        )
+        store.build(ids, matrix, metadata)
+        print(f"Built {store.index_type} index over {len(ids)} vectors ({store.params})")
 
     # Ensure repo data directory exists
     get_faiss_index_path().parent.mkdir(parents=True, exist_ok=True)
 
     store.save()
+    partitions = save_partitions(store, ids, matrix, metadata if VECTOR_INDEX_PARTITIONS else None, delta)
+    changes_path.unlink(missing_ok=True)
 
     print("FAISS index built and saved")
+    if partitions:
+        print("Partitions: " + ", ".join(f"{chunk_type} ({count})" for chunk_type, count in partitions.items()))
     print(f"Index: {get_faiss_index_path()}")
     print(f"Meta:  {get_faiss_meta_path()}")
 
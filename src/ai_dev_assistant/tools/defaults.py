@@ -6,11 +6,12 @@ Default paths for ai_dev_assistant artifacts.
 Design:
 - One global data workspace
 - Located next to ai_dev_assistant repo by default
-- Overridable via environment variable
+- Overridable via environment variable (AI_DEV_ASSISTANT_DATA)
 - Repo-scoped subdirectories
 - Explicit active-repo tracking
 """
 
+import os
 from pathlib import Path
 
 # ============================================================
@@ -27,17 +28,30 @@ while not (ASSISTANT_ROOT / "pyproject.toml").exists():
 DATA_ROOT = ASSISTANT_ROOT / "data"
 
 
+def get_data_root() -> Path:
+    """
+    Return the data workspace root.
+
+    Resolved on every call so that AI_DEV_ASSISTANT_DATA
+    can be changed at runtime (e.g. isolated test workspaces).
+    """
+    override = os.environ.get("AI_DEV_ASSISTANT_DATA")
+    if override:
+        return Path(override).expanduser()
+    return DATA_ROOT
+
+
 # ============================================================
 # ACTIVE REPO STATE
 # ============================================================
 
 
 def get_active_repo_file() -> Path:
-    return DATA_ROOT / "LAST_ACTIVE_REPO"
+    return get_data_root() / "LAST_ACTIVE_REPO"
 
 
 def set_active_repo_name(repo_name: str) -> None:
-    DATA_ROOT.mkdir(parents=True, exist_ok=True)
+    get_data_root().mkdir(parents=True, exist_ok=True)
     get_active_repo_file().write_text(repo_name)
 
 
@@ -48,6 +62,18 @@ def get_active_repo_name() -> str:
     return f.read_text().strip()
 
 
+# ============================================================
+# SHARED ARTIFACTS
+# ============================================================
+
+
+def get_embedding_cache_path() -> Path:
+    """
+    Embedding cache shared by all repositories.
+    """
+    return get_data_root() / "embedding_cache.sqlite.db"
+
+
 # ============================================================
 # REPO-SCOPED DIRECTORIES
 # ============================================================
@@ -62,7 +88,7 @@ def get_repo_dir(repo_name: str | None = None) -> Path:
     if repo_name is None:
         repo_name = get_active_repo_name()
 
-    return DATA_ROOT / repo_name
+    return get_data_root() / repo_name
 
 
 # ============================================================
@@ -71,21 +97,62 @@ def get_repo_dir(repo_name: str | None = None) -> Path:
 
 
 def get_chunks_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "chunks.jsonl"
+
+
+def get_legacy_chunks_path(repo_name: str | None = None) -> Path:
     return get_repo_dir(repo_name) / "chunks.json"
 
 
+def get_blobs_dir(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "blobs"
+
+
 def get_embeddings_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "embeddings.npy"
+
+
+def get_embedding_ids_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "embeddings.ids.json"
+
+
+def get_legacy_embeddings_path(repo_name: str | None = None) -> Path:
     return get_repo_dir(repo_name) / "embeddings.json"
 
 
-def get_faiss_index_path(repo_name: str | None = None) -> Path:
+def get_embeddings_checkpoint_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "embeddings.checkpoint.jsonl"
+
+
+def get_faiss_index_path(repo_name: str | None = None, partition: str | None = None) -> Path:
+    # Per-chunk-type sub-indexes live next to the main index
+    if partition is not None:
+        return get_repo_dir(repo_name) / f"faiss.{partition}.index"
     return get_repo_dir(repo_name) / "faiss.index"
 
 
-def get_faiss_meta_path(repo_name: str | None = None) -> Path:
+def get_faiss_meta_path(repo_name: str | None = None, partition: str | None = None) -> Path:
+    if partition is not None:
+        return get_repo_dir(repo_name) / f"faiss_meta.{partition}.json"
     return get_repo_dir(repo_name) / "faiss_meta.json"
 
 
+def get_manifest_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "index_manifest.json"
+
+
+def get_index_changes_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "index_changes.json"
+
+
+def get_embedding_changes_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "embedding_changes.json"
+
+
+def get_artifacts_db_path(repo_name: str | None = None) -> Path:
+    return get_repo_dir(repo_name) / "artifacts.sqlite.db"
+
+
 def get_memory_db_path(repo_name: str | None = None) -> Path:
     return get_repo_dir(repo_name) / "memory.sqlite.db"
 
@@ -1,7 +1,7 @@
 """
 tools.export_yaml_preview
 
-Convert chunks.json into a human-readable YAML preview
+Convert chunks.jsonl into a human-readable YAML preview
 with proper multiline rendering.
 
 Pure pipeline step:
@@ -12,11 +12,11 @@ Pure pipeline step:
 
 from __future__ import annotations
 
-import json
-
 import yaml
 
-from ai_dev_assistant.tools.defaults import get_active_repo_name, get_chunks_path, get_yaml_preview_path
+from ai_dev_assistant.tools.artifacts import chunk_text, iter_chunk_records, resolve_chunks_path
+from ai_dev_assistant.tools.blobs import BlobStore
+from ai_dev_assistant.tools.defaults import get_active_repo_name, get_yaml_preview_path
 
 
 class LiteralString(str):
@@ -55,25 +55,29 @@ def main() -> None:
     """
     print(f"Currently active repo:'{get_active_repo_name()}'")
 
-    chunks_path = get_chunks_path()
+    chunks_path = resolve_chunks_path()
     yaml_path = get_yaml_preview_path()
 
     if not chunks_path.exists():
-        raise RuntimeError(f"No chunks.json found for active repo.\nExpected at: {chunks_path}\nRun index_repo first.")
-
-    data = json.loads(chunks_path.read_text(encoding="utf-8"))
-    data = convert_multiline_strings(data)
+        raise RuntimeError(f"No chunks.jsonl found for active repo.\nExpected at: {chunks_path}\nRun index_repo first.")
 
     yaml_path.parent.mkdir(parents=True, exist_ok=True)
-    yaml_path.write_text(
-        yaml.safe_dump(
-            data,
-            sort_keys=False,
-            allow_unicode=True,
-            width=120,
-        ),
-        encoding="utf-8",
-    )
+    blobs = BlobStore.for_repo()
+
+    # One single-item list per record: concatenated, the output
+    # is identical to dumping the whole list at once.
+    with yaml_path.open("w", encoding="utf-8") as f:
+        for record in iter_chunk_records(chunks_path):
+            # Show code inline, even when it lives in the blob store
+            record["text"] = chunk_text(record, blobs)
+            f.write(
+                yaml.safe_dump(
+                    [convert_multiline_strings(record)],
+                    sort_keys=False,
+                    allow_unicode=True,
+                    width=120,
+                )
+            )
 
     print(f"YAML preview written to {yaml_path}")
 
@@ -2,7 +2,8 @@
 tools/index_repo.py
 
 Extract structural code chunks from a repository
-and write them to the assistant data workspace.
+and stream them to chunks.jsonl in the assistant
+data workspace.
 
 This is a pure pipeline step:
 - no CLI
@@ -13,19 +14,195 @@ This is a pure pipeline step:
 from __future__ import annotations
 
 import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from dataclasses import replace
+from functools import partial
 from pathlib import Path
+from typing import Iterator
 
+from ai_dev_assistant.infra.artifact_sqlite import apply_chunk_changes, rebuild_chunks
+from ai_dev_assistant.infra.git import (
+    git_changed_paths,
+    git_dirty_paths,
+    git_exclude_file,
+    git_head,
+    git_tracked_paths,
+)
 from ai_dev_assistant.rag.chunking import (
     chunk_project_overview,
     chunk_python_file,
 )
+from ai_dev_assistant.rag.discovery import PROJECT_IGNORE_FILE, RepoWalker
+from ai_dev_assistant.rag.schema import CodeChunk
+from ai_dev_assistant.tools.artifacts import ChunkWriter, chunk_record, index_chunk_lines, iter_chunk_records, read_span
+from ai_dev_assistant.tools.blobs import BlobStore
 from ai_dev_assistant.tools.defaults import (
+    get_artifacts_db_path,
     get_chunks_path,
+    get_index_changes_path,
+    get_legacy_chunks_path,
+    get_manifest_path,
     set_active_repo_name,
 )
+from ai_dev_assistant.tools.manifest import (
+    ChangeSet,
+    FileEntry,
+    Manifest,
+    file_sha256,
+    fingerprint,
+    load_manifest,
+    push_changes,
+    save_manifest,
+)
+
+# ============================================================
+# FILE CHUNKING (serial / process pool)
+# ============================================================
+
+
+def _chunk_file(path: Path, blobs: BlobStore | None = None) -> list[CodeChunk]:
+    """
+    Chunk a single file in a worker process.
+
+    Generators cannot cross process boundaries, so the
+    chunks are materialized before being sent back.
+    """
+    return list(chunk_python_file(path, blobs))
+
+
+def iter_file_chunks(
+    py_files: list[Path],
+    workers: int = 1,
+    blobs: BlobStore | None = None,
+) -> Iterator[list[CodeChunk]]:
+    """
+    Yield the chunks of each file, in the order of py_files.
+
+    With workers > 1 the files are parsed in a process pool.
+    Results are streamed back in submission order, so the
+    output is identical to a serial run.
+
+    With a blob store, file sources are stored there and code
+    chunks reference them (see tools/blobs.py).
+    """
+    chunk_file = partial(_chunk_file, blobs=blobs)
+
+    if workers <= 1 or len(py_files) < 2:
+        for py_file in py_files:
+            yield chunk_file(py_file)
+        return
+
+    # Larger chunks amortize IPC overhead; keep several per worker
+    # so that slow files do not leave the other workers idle.
+    chunksize = max(1, len(py_files) // (workers * 8))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(chunk_file, py_files, chunksize=chunksize)
+
+
+def resolve_workers(workers: int) -> int:
+    """
+    Resolve the worker count (0 or less means: one per CPU).
+    """
+    if workers <= 0:
+        return os.cpu_count() or 1
+    return workers
+
+
+def _current_entry(path: Path, stat: os.stat_result, previous: FileEntry | None) -> FileEntry:
+    """
+    Fingerprint a file, skipping the hash when size and mtime
+    are unchanged since the previous run.
+    """
+    if previous is not None and previous.size == stat.st_size and previous.mtime_ns == stat.st_mtime_ns:
+        return replace(previous, chunk_ids=list(previous.chunk_ids))
+    return fingerprint(path, stat)
+
+
+def _walk_order(rel: str) -> tuple:
+    """
+    Sort key reproducing RepoWalker order: files of a directory
+    (by name) before its subdirectories (by name).
+    """
+    parts = rel.split("/")
+    return (*((1, part) for part in parts[:-1]), (0, parts[-1]))
+
+
+def _discover_paths(
+    repo_root: Path,
+    walker: RepoWalker,
+    previous: Manifest,
+    candidates: set[str],
+) -> list[tuple[Path, os.stat_result | None]]:
+    """
+    Discover files when only `candidates` (repo-relative paths)
+    may have changed since the previous run.
+
+    Candidates are checked against the discovery rules and
+    stat-ed; every other manifest entry is reused as is, with
+    a None stat.
+    """
+    discovered: dict[str, os.stat_result | None] = {}
+
+    for rel in previous.files:
+        if rel not in candidates:
+            discovered[rel] = None
+
+    for rel in candidates:
+        if not rel.endswith(".py"):
+            continue
+        stat = walker.check_file(rel)
+        if stat is not None:
+            discovered[rel] = stat
+
+    return [(repo_root / rel, discovered[rel]) for rel in sorted(discovered, key=_walk_order)]
+
+
+def _git_exclude_sha256(repo_root: Path) -> str | None:
+    """
+    Fingerprint of .git/info/exclude ("" if missing, None
+    outside git).
+    """
+    path = git_exclude_file(repo_root)
+    if path is None:
+        return None
+    return file_sha256(path) if path.exists() else ""
+
+
+def _git_candidates(repo_root: Path, previous: Manifest) -> set[str] | None:
+    """
+    Paths that may have changed since the indexed commit, per
+    git. Returns None when a full scan is needed instead.
+    """
+    if previous.git_commit is None:
+        return None
+
+    changed = git_changed_paths(repo_root, previous.git_commit)
+    tracked = git_tracked_paths(repo_root)
+    if changed is None or tracked is None:
+        return None
+
+    # Changed ignore rules can add or drop any file
+    if any(rel.rsplit("/", 1)[-1] in (".gitignore", PROJECT_IGNORE_FILE) for rel in changed):
+        return None
+    if _git_exclude_sha256(repo_root) != previous.git_exclude:
+        return None
+
+    # git cannot report deleted untracked files, nor dirty files
+    # since reverted to the indexed commit
+    return changed | set(previous.git_dirty) | (previous.files.keys() - tracked)
 
 
-def main(*, repo_root: Path) -> None:
+def main(
+    *,
+    repo_root: Path,
+    workers: int = 1,
+    incremental: bool = False,
+    git_diff: bool = False,
+    changed_paths: set[str] | None = None,
+) -> None:
     """
     Index a repository into the assistant workspace.
 
@@ -33,6 +210,22 @@ def main(*, repo_root: Path) -> None:
     ----------
     repo_root : Path
         Root directory of the repository to index (READ ONLY).
+    workers : int
+        Number of processes used for chunking.
+        1 runs serially, 0 uses one process per CPU.
+    incremental : bool
+        Re-parse only files whose content changed since the
+        last run (per the index manifest). Falls back to a
+        full run if no usable manifest exists.
+    git_diff : bool
+        Like incremental, but only look at the paths git reports
+        as changed since the indexed commit (plus the working
+        tree), without stat-ing every file. Falls back to an
+        incremental scan outside git or if that commit is unknown.
+    changed_paths : set[str] | None
+        Repo-relative paths known to have changed (e.g. from a
+        file watcher). Implies incremental; only these paths
+        are looked at, all others are reused from the manifest.
     """
     repo_root = repo_root.expanduser().resolve()
     if not repo_root.exists():
@@ -40,29 +233,144 @@ def main(*, repo_root: Path) -> None:
 
     repo_name = repo_root.name  # ← stable, intentional
 
-    print(f"Indexing repo '{repo_name}'")
+    workers = resolve_workers(workers)
 
-    all_chunks: list[dict] = []
+    print(f"Indexing repo '{repo_name}' (workers: {workers})")
+
+    chunks_path = get_chunks_path(repo_name)
+    manifest_path = get_manifest_path(repo_name)
+    blobs = BlobStore.for_repo(repo_name)
+
+    incremental = incremental or git_diff or changed_paths is not None
+    previous = load_manifest(manifest_path, repo_root) if incremental else None
+    if previous is not None and not chunks_path.exists():
+        previous = None
+    old_spans = index_chunk_lines(chunks_path) if previous is not None else {}
 
     # 1) Project overview
     project_chunk = chunk_project_overview(repo_root)
-    all_chunks.append(project_chunk.__dict__)
 
-    # 2) Python source files
-    for py_file in repo_root.rglob("*.py"):
-        for chunk in chunk_python_file(py_file):
-            all_chunks.append(chunk.__dict__)
+    # 2) Discover files (pruned, ignore-aware) and detect changes
+    walker = RepoWalker(repo_root)
+    discovered = None
 
-    # 3) Write to ASSISTANT DATA DIR
-    chunks_path = get_chunks_path(repo_name)
-    chunks_path.parent.mkdir(parents=True, exist_ok=True)
-    chunks_path.write_text(
-        json.dumps(all_chunks, indent=2),
-        encoding="utf-8",
+    candidates = changed_paths
+    if git_diff and previous is not None:
+        candidates = _git_candidates(repo_root, previous)
+        if candidates is None:
+            print("Git refresh unavailable; scanning all files.")
+
+    if candidates is not None and previous is not None:
+        discovered = _discover_paths(repo_root, walker, previous, candidates)
+
+    if discovered is None:
+        discovered = list(walker.iter_files(".py"))
+
+    py_files = [path for path, _ in discovered]
+
+    if walker.skipped_large:
+        print(f"Skipped {len(walker.skipped_large)} files over {walker.max_file_size:,} bytes.")
+
+    entries: dict[str, FileEntry] = {}
+    changed: set[str] = set()
+    to_parse: list[Path] = []
+
+    for py_file, stat in discovered:
+        rel = py_file.relative_to(repo_root).as_posix()
+        old = previous.files.get(rel) if previous is not None else None
+
+        # Not reported by git: unchanged since the indexed commit
+        entry = replace(old, chunk_ids=list(old.chunk_ids)) if stat is None else _current_entry(py_file, stat, old)
+        entries[rel] = entry
+
+        reusable = old is not None and old.sha256 == entry.sha256
+        if reusable and old.chunk_ids and str(py_file) not in old_spans:
+            reusable = False
+
+        if not reusable:
+            changed.add(rel)
+            to_parse.append(py_file)
+
+    old_project_text = None
+    if project_chunk.file in old_spans:
+        with chunks_path.open("rb") as f:
+            old_project_text = json.loads(read_span(f, old_spans[project_chunk.file]))["text"]
+
+    # 3) Stream chunks to ASSISTANT DATA DIR:
+    #    changed files are re-parsed, the rest copied verbatim
+    previous_chunks = chunks_path.open("rb") if previous is not None else nullcontext()
+
+    # Records of re-parsed files, to update the artifact database
+    parsed_records: list[dict] = [chunk_record(project_chunk)]
+
+    with ChunkWriter(chunks_path) as writer, previous_chunks as old_f:
+        writer.write(parsed_records[0])
+
+        parsed = iter_file_chunks(to_parse, workers=workers, blobs=blobs)
+
+        for py_file in py_files:
+            rel = py_file.relative_to(repo_root).as_posix()
+
+            if rel in changed:
+                chunk_ids = []
+                blob = None
+                for chunk in next(parsed):
+                    record = chunk_record(chunk)
+                    writer.write(record)
+                    chunk_ids.append(chunk.id)
+                    if previous is not None:
+                        parsed_records.append(record)
+                    blob = blob or chunk.blob
+                entries[rel].chunk_ids = chunk_ids
+                entries[rel].blob = blob
+            elif str(py_file) in old_spans:
+                writer.write_raw(read_span(old_f, old_spans[str(py_file)]))
+
+    # Superseded by chunks.jsonl
+    get_legacy_chunks_path(repo_name).unlink(missing_ok=True)
+
+    save_manifest(
+        manifest_path,
+        repo_root,
+        entries,
+        git_commit=git_head(repo_root),
+        git_dirty=sorted(git_dirty_paths(repo_root) or ()),
+        git_exclude=_git_exclude_sha256(repo_root),
     )
 
-    # 4) Mark active repo
+    # Drop sources no chunk refers to anymore
+    blobs.prune({entry.blob for entry in entries.values() if entry.blob})
+
+    # 4) Tell downstream steps what changed
+    if previous is None:
+        changes = ChangeSet(full=True)
+    else:
+        changes = ChangeSet()
+        for rel, old in previous.files.items():
+            if rel not in entries or rel in changed:
+                changes.removed.extend(old.chunk_ids)
+        for rel in sorted(changed):
+            changes.added.extend(entries[rel].chunk_ids)
+
+        if old_project_text != project_chunk.text:
+            changes.removed.append(project_chunk.id)
+            changes.added.append(project_chunk.id)
+
+        deleted = len(previous.files.keys() - entries.keys())
+        print(f"Re-parsed {len(changed)} of {len(entries)} files ({deleted} deleted).")
+
+    push_changes(get_index_changes_path(repo_name), changes)
+
+    # 5) Query-side artifact database
+    db_path = get_artifacts_db_path(repo_name)
+    if changes.full or not db_path.exists():
+        rebuild_chunks(db_path, iter_chunk_records(chunks_path))
+    else:
+        added = set(changes.added)
+        apply_chunk_changes(db_path, changes.removed, (r for r in parsed_records if r["id"] in added))
+
+    # 6) Mark active repo
     set_active_repo_name(repo_name)
 
-    print(f"Indexed {len(all_chunks)} chunks.")
+    print(f"Indexed {writer.count} chunks.")
     print(f"Saved to {chunks_path}")
@@ -0,0 +1,185 @@
+"""
+tools/manifest.py
+
+Per-file index manifest and pending change sets.
+
+The manifest records, for every indexed source file:
+- size and mtime (cheap change detection)
+- sha256 of the content (authoritative change detection)
+- the chunk ids emitted for it
+- the blob holding its source (see tools/blobs.py)
+
+and, for git checkouts, the commit that was indexed, the paths
+that were dirty at the time and the .git/info/exclude rules.
+
+Change sets tell downstream pipeline steps exactly which
+ids were added or removed since they last ran:
+
+    index_repo ──index_changes.json──▶ rebuild_embeddings
+    rebuild_embeddings ──embedding_changes.json──▶ build_vector_store
+
+A change set is either "full" (rebuild everything) or a
+pair of id lists. Removals are applied before additions,
+so an id present in both lists is replaced.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+MANIFEST_VERSION = 2
+
+
+# ============================================================
+# MANIFEST
+# ============================================================
+
+
+@dataclass
+class FileEntry:
+    size: int
+    mtime_ns: int
+    sha256: str
+    chunk_ids: list[str] = field(default_factory=list)
+    blob: str | None = None
+
+
+def file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with path.open("rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def fingerprint(path: Path, stat: os.stat_result | None = None) -> FileEntry:
+    """
+    Build a manifest entry (without chunk ids) for a file.
+    """
+    if stat is None:
+        stat = path.stat()
+    return FileEntry(
+        size=stat.st_size,
+        mtime_ns=stat.st_mtime_ns,
+        sha256=file_sha256(path),
+    )
+
+
+@dataclass
+class Manifest:
+    # Keyed by repo-relative POSIX path
+    files: dict[str, FileEntry]
+
+    # HEAD at indexing time (None outside git)
+    git_commit: str | None = None
+
+    # Paths differing from HEAD at indexing time: reverting one
+    # does not show up in a later diff against HEAD
+    git_dirty: list[str] = field(default_factory=list)
+
+    # sha256 of .git/info/exclude ("" if missing)
+    git_exclude: str | None = None
+
+
+def load_manifest(path: Path, repo_root: Path) -> Manifest | None:
+    """
+    Load a manifest.
+
+    Returns None if it is missing, was written by an
+    incompatible version or for another repository root
+    (chunk ids embed absolute paths).
+    """
+    if not path.exists():
+        return None
+
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    if raw.get("version") != MANIFEST_VERSION or raw.get("repo_root") != str(repo_root):
+        return None
+
+    return Manifest(
+        files={rel: FileEntry(**entry) for rel, entry in raw["files"].items()},
+        git_commit=raw.get("git_commit"),
+        git_dirty=raw.get("git_dirty", []),
+        git_exclude=raw.get("git_exclude"),
+    )
+
+
+def save_manifest(
+    path: Path,
+    repo_root: Path,
+    files: dict[str, FileEntry],
+    git_commit: str | None = None,
+    git_dirty: list[str] | None = None,
+    git_exclude: str | None = None,
+) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(
+        json.dumps(
+            {
+                "version": MANIFEST_VERSION,
+                "repo_root": str(repo_root),
+                "git_commit": git_commit,
+                "git_dirty": sorted(git_dirty or []),
+                "git_exclude": git_exclude,
+                "files": {rel: asdict(entry) for rel, entry in files.items()},
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+
+
+# ============================================================
+# CHANGE SETS
+# ============================================================
+
+
+@dataclass
+class ChangeSet:
+    full: bool = False
+    added: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+    def is_empty(self) -> bool:
+        return not self.full and not self.added and not self.removed
+
+    def merge(self, newer: "ChangeSet") -> "ChangeSet":
+        """
+        Combine a pending change set with a newer one.
+        """
+        if self.full or newer.full:
+            return ChangeSet(full=True)
+
+        newer_removed = set(newer.removed)
+        added = [i for i in self.added if i not in newer_removed]
+        seen = set(added)
+        added.extend(i for i in newer.added if i not in seen)
+        removed = list(dict.fromkeys([*self.removed, *newer.removed]))
+
+        return ChangeSet(added=added, removed=removed)
+
+
+def load_changes(path: Path) -> ChangeSet | None:
+    if not path.exists():
+        return None
+    return ChangeSet(**json.loads(path.read_text(encoding="utf-8")))
+
+
+def save_changes(path: Path, changes: ChangeSet) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(asdict(changes), indent=2), encoding="utf-8")
+
+
+def push_changes(path: Path, changes: ChangeSet) -> None:
+    """
+    Record changes for the next pipeline step, merging with
+    any change set that step has not consumed yet.
+    """
+    pending = load_changes(path)
+    if pending is not None:
+        changes = pending.merge(changes)
+    save_changes(path, changes)
@@ -3,55 +3,160 @@
 Rebuild embeddings for the currently active repository.
 
 Pipeline step:
-- loads chunks.json
+- streams chunks.jsonl (or legacy chunks.json)
 - computes embeddings
-- writes embeddings.json
+- writes embeddings.npy (+ embeddings.ids.json)
+
+In incremental mode, only chunks listed as added in the
+pending index change set are embedded; vectors for removed
+chunks are dropped and all others are kept as-is.
+
+Finished requests are checkpointed to embeddings.checkpoint.jsonl
+as they complete; with resume=True a rerun after a crash or
+preemption reuses them instead of embedding them again. The
+checkpoint is removed once the embeddings have been written.
 
 Repo context is resolved via LAST_ACTIVE_REPO.
 """
 
 from __future__ import annotations
 
-import json
 from pathlib import Path
+from typing import Iterator
+
+import numpy as np
 
 from ai_dev_assistant.infra.config import is_dry_run
+from ai_dev_assistant.infra.embedding_cache import EmbeddingCheckpoint
+from ai_dev_assistant.infra.embeddings import check_dimensions, is_local_model
+from ai_dev_assistant.rag.config import EMBEDDING_DIMENSIONS, EMBEDDING_MODEL, EMBEDDING_TARGET_DIM
 from ai_dev_assistant.rag.embedding_pipeline import embed_chunks
 from ai_dev_assistant.rag.schema import CodeChunk
+from ai_dev_assistant.tools.artifacts import (
+    iter_chunk_records,
+    load_embedding_meta,
+    load_embeddings,
+    resolve_chunks_path,
+    resolve_embeddings_path,
+    write_embeddings,
+)
 from ai_dev_assistant.tools.defaults import (
     get_active_repo_name,
-    get_chunks_path,
-    get_embeddings_path,
+    get_embedding_changes_path,
+    get_embeddings_checkpoint_path,
+    get_index_changes_path,
 )
+from ai_dev_assistant.tools.manifest import ChangeSet, load_changes, push_changes
 
 
-def load_chunks(path: Path) -> list[CodeChunk]:
+def load_chunks(path: Path) -> Iterator[CodeChunk]:
+    """
+    Lazily load chunks (chunks.jsonl or legacy chunks.json).
+    """
     if not path.exists():
         raise RuntimeError(f"Chunks file not found: {path}\nDid you run index_repo first?")
 
-    raw = json.loads(path.read_text())
-    return [CodeChunk(**item) for item in raw]
+    return (CodeChunk(**item) for item in iter_chunk_records(path))
+
+
+def main(*, incremental: bool = False, resume: bool = False) -> None:
+    """
+    Rebuild embeddings for the active repository.
+
+    Parameters
+    ----------
+    incremental : bool
+        Apply the pending index change set to the existing
+        embeddings instead of re-embedding every chunk.
+    resume : bool
+        Reuse the vectors checkpointed by an interrupted run.
+        Without it, a leftover checkpoint is discarded.
+    """
+    # Before any chunk is embedded (and checkpointed)
+    check_dimensions(EMBEDDING_MODEL, EMBEDDING_TARGET_DIM, EMBEDDING_DIMENSIONS.get(EMBEDDING_MODEL))
+
+    chunks_path = resolve_chunks_path()
+    embeddings_path = resolve_embeddings_path()
+    index_changes_path = get_index_changes_path()
+
+    delta: ChangeSet | None = None
+    kept_ids: list[str] = []
+    kept = np.empty((0, 0), dtype=np.float32)
+
+    if incremental and embeddings_path.exists():
+        pending = load_changes(index_changes_path)
+        if pending is None or pending.is_empty():
+            print("No index changes; embeddings are up to date")
+            return
+
+        meta = load_embedding_meta(embeddings_path)
+        dim = EMBEDDING_TARGET_DIM or EMBEDDING_DIMENSIONS.get(EMBEDDING_MODEL)
+        if meta["model"] not in (None, EMBEDDING_MODEL) or meta["dim"] not in (None, dim):
+            print("Embedding model or dimensions changed; re-embedding all chunks")
+        elif not pending.full:
+            delta = pending
 
+    chunks = load_chunks(chunks_path)
 
-def main() -> None:
-    chunks_path = get_chunks_path()
-    embeddings_path = get_embeddings_path()
+    print(f"Loading chunks from repo '{get_active_repo_name()}'")
 
-    chunks = load_chunks(chunks_path)
+    if delta is not None:
+        removed = set(delta.removed)
+        added = set(delta.added)
+
+        ids, matrix = load_embeddings(embeddings_path)
+        rows = [i for i, chunk_id in enumerate(ids) if chunk_id not in removed]
+        kept_ids = [ids[i] for i in rows]
+        kept = matrix[rows]
+        chunks = (c for c in chunks if c.id in added)
 
-    print(f"Loaded {len(chunks)} chunks from repo '{get_active_repo_name()}'")
+        print(f"Incremental update: {len(added)} added, {len(removed)} removed chunk ids")
 
-    records = embed_chunks(chunks, dry_run=is_dry_run())
+    checkpoint = EmbeddingCheckpoint(get_embeddings_checkpoint_path())
 
-    if not records:
+    if not resume:
+        checkpoint.discard()
+    elif not checkpoint.path.exists():
+        print("No checkpoint to resume from; starting a fresh run")
+
+    # Local models cost nothing, so they embed even in dry-run mode
+    dry_run = is_dry_run() and not is_local_model(EMBEDDING_MODEL)
+
+    try:
+        records = embed_chunks(
+            chunks,
+            model=EMBEDDING_MODEL,
+            dry_run=dry_run,
+            checkpoint=checkpoint,
+            dimensions=EMBEDDING_TARGET_DIM,
+        )
+    finally:
+        checkpoint.close()
+
+    if not records and (delta is None or dry_run):
         print("No embeddings generated (dry run?)")
         return
 
-    embeddings_path.parent.mkdir(parents=True, exist_ok=True)
-    embeddings_path.write_text(
-        json.dumps(records, indent=2),
-        encoding="utf-8",
-    )
+    if delta is not None:
+        changes = ChangeSet(
+            added=[r["id"] for r in records],
+            removed=delta.removed,
+        )
+    else:
+        changes = ChangeSet(full=True)
+
+    ids = kept_ids + [r["id"] for r in records]
+    # Width of the stored vectors: an update may add no vector
+    dim = kept.shape[1] if delta is not None else len(records[0]["embedding"])
+    matrix = np.array([r["embedding"] for r in records], dtype=np.float32).reshape(len(records), dim)
+    if delta is not None:
+        matrix = np.concatenate([kept.astype(np.float32), matrix])
+
+    embeddings_path = write_embeddings(ids, matrix, model=EMBEDDING_MODEL)
+
+    push_changes(get_embedding_changes_path(), changes)
+    index_changes_path.unlink(missing_ok=True)
+    checkpoint.discard()
 
-    print(f"Embedded {len(records)} chunks")
+    print(f"Embedded {len(records)} chunks ({len(ids)} total)")
     print(f"Wrote embeddings to {embeddings_path}")
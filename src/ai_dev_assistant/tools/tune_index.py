@@ -0,0 +1,181 @@
+# tools/tune_index.py
+"""
+Tune the vector index of the active repository against a
+recall target.
+
+Pipeline step:
+- samples stored vectors as pseudo-queries
+- computes their exact top-k with a flat index (ground truth)
+- builds each candidate index type and sweeps its knobs
+  (nprobe for IVF, efSearch for HNSW, rerank for quantized
+  indexes) from cheap to expensive
+- saves the fastest configuration whose recall@k meets the
+  target, with the measurements in faiss_meta.json ("tuning")
+
+The exact flat index always qualifies, so a configuration is
+always found. Incremental index updates keep the tuned settings;
+a full build_vector_store rebuild resets them.
+
+Repo context is resolved via LAST_ACTIVE_REPO.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Iterator, List, NamedTuple, Sequence
+
+import numpy as np
+
+from ai_dev_assistant.infra.vector_store import INDEX_TYPES, VectorStore
+from ai_dev_assistant.tools.artifacts import load_embedding_meta, load_embeddings, resolve_embeddings_path
+from ai_dev_assistant.tools.build_vector_store import chunk_metadata
+from ai_dev_assistant.tools.defaults import get_active_repo_name, get_faiss_meta_path
+
+EF_SEARCH_VALUES = (16, 32, 64, 128, 256, 512)
+RERANK_VALUES = (0, 2, 4, 8)
+
+
+class Trial(NamedTuple):
+    index_type: str
+    settings: dict
+    recall: float
+    latency_ms: float
+
+
+def candidate_sweeps(store: VectorStore) -> Iterator[List[dict]]:
+    """
+    Search settings to try on a built index, as sweeps ordered
+    from fastest (least accurate) to slowest.
+    """
+    if store.index_type == "hnsw":
+        yield [{"ef_search": ef_search} for ef_search in EF_SEARCH_VALUES]
+        return
+
+    reranks = RERANK_VALUES if store.index_type in ("sq8", "ivfpq") else (0,)
+
+    for rerank in reranks:
+        if store.index_type in ("ivfflat", "ivfpq"):
+            nlist = store.params["nlist"]
+            probes = sorted({min(2**i, nlist) for i in range(nlist.bit_length() + 1)})
+            yield [{"nprobe": nprobe, "rerank": rerank} for nprobe in probes]
+        else:
+            yield [{"rerank": rerank}]
+
+
+def measure(
+    store: VectorStore,
+    queries: np.ndarray,
+    truth: List[set[str]],
+    k: int,
+    settings: dict,
+) -> tuple[float, float]:
+    """
+    Recall@k against truth and mean search time per query (ms).
+    """
+    hits = 0
+    start = time.perf_counter()
+    for query, expected in zip(queries, truth, strict=True):
+        found = store.search(query.tolist(), k=k, **settings)
+        hits += len(expected & {chunk_id for chunk_id, _ in found})
+    latency = (time.perf_counter() - start) / len(queries)
+
+    return hits / sum(len(t) for t in truth), latency * 1000
+
+
+def main(
+    *,
+    target_recall: float = 0.95,
+    k: int = 10,
+    queries: int = 200,
+    index_types: Sequence[str] = INDEX_TYPES,
+    seed: int = 0,
+) -> Trial:
+    """
+    Find and save the fastest index meeting the recall target.
+
+    Parameters
+    ----------
+    target_recall : float
+        Minimum mean recall@k against exact search.
+    k : int
+        Number of results per query.
+    queries : int
+        Stored vectors sampled as pseudo-queries.
+    index_types : sequence of str
+        Index types to try (each is built once). The exact flat
+        index is always tried, as the fallback.
+    seed : int
+        Seed of the query sample and the training samples.
+
+    Returns
+    -------
+    Trial
+        The saved configuration and its measurements.
+    """
+    print(f"Tuning vector index for '{get_active_repo_name()}'")
+
+    embeddings_path = resolve_embeddings_path()
+    if not embeddings_path.exists():
+        raise RuntimeError("Embeddings file not found.\nRun rebuild_embeddings first.")
+
+    index_types = ["flat", *(t for t in index_types if t != "flat")]
+    unknown = set(index_types) - set(INDEX_TYPES)
+    if unknown:
+        raise ValueError(f"Unknown index types: {sorted(unknown)} (expected some of {INDEX_TYPES})")
+
+    ids, matrix = load_embeddings(embeddings_path)
+    model = load_embedding_meta(embeddings_path)["model"]
+    metadata = chunk_metadata(ids)
+    dim = matrix.shape[1]
+
+    rng = np.random.default_rng(seed)
+    sample = np.sort(rng.choice(len(ids), size=min(queries, len(ids)), replace=False))
+    query_vectors = np.array(matrix[sample], dtype=np.float32)
+
+    exact = VectorStore(dim=dim, model=model)
+    exact.build(ids, matrix, metadata)
+    truth = [{chunk_id for chunk_id, _ in exact.search(query.tolist(), k=k)} for query in query_vectors]
+
+    print(f"{len(ids)} vectors x {dim}, {len(sample)} queries, k={k}, target recall {target_recall}")
+
+    best: tuple[Trial, VectorStore] | None = None
+
+    for index_type in index_types:
+        store = exact if index_type == "flat" else VectorStore(dim=dim, model=model, index_type=index_type)
+        if store is not exact:
+            store.build(ids, matrix, metadata)
+        store.use_originals(ids, matrix)
+
+        for sweep in candidate_sweeps(store):
+            for settings in sweep:
+                recall, latency = measure(store, query_vectors, truth, k, settings)
+                print(f"  {index_type:<8} {settings}: recall {recall:.3f}, {latency:.3f} ms/query")
+
+                if recall >= target_recall:
+                    if best is None or latency < best[0].latency_ms:
+                        best = (Trial(index_type, settings, recall, latency), store)
+                    # The rest of the sweep is slower
+                    break
+
+    # Flat search is exact, so best is always set
+    trial, store = best
+    settings = dict(trial.settings)
+    store.rerank = settings.pop("rerank", 0)
+    store.configure(**settings)
+    store.tuning = {
+        "target_recall": target_recall,
+        "k": k,
+        "queries": len(sample),
+        "recall": round(trial.recall, 4),
+        "latency_ms": round(trial.latency_ms, 4),
+    }
+    store.save()
+
+    print(f"Selected {trial.index_type} {trial.settings}: recall {trial.recall:.3f}, {trial.latency_ms:.3f} ms/query")
+    print(f"Meta:  {get_faiss_meta_path()}")
+
+    return trial
+
+
+if __name__ == "__main__":
+    main()
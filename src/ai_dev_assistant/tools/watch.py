@@ -0,0 +1,200 @@
+"""
+tools/watch.py
+
+Keep the index of a repository live while it is edited.
+
+A polling scanner (os.scandir + stat, no OS-specific APIs)
+snapshots the indexable files every `interval` seconds.
+Changed paths are collected until the tree has been quiet
+for `debounce` seconds, then handed to a background worker
+that runs the incremental pipeline for exactly those paths:
+
+    chunk changed files ─▶ re-embed added chunks ─▶ update FAISS index
+
+Scanning continues while the worker runs; changes made in
+the meantime are batched into the next refresh.
+
+Pure pipeline step:
+- no CLI
+- no env parsing
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Callable
+
+from ai_dev_assistant.rag.discovery import RepoWalker
+from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
+from ai_dev_assistant.tools.index_repo import main as index_repo
+from ai_dev_assistant.tools.rebuild_embeddings import main as rebuild_embeddings
+
+Snapshot = dict[str, tuple[int, int]]
+
+
+# ============================================================
+# SCANNER
+# ============================================================
+
+
+def take_snapshot(walker: RepoWalker) -> Snapshot:
+    """
+    Map every indexable file to its (mtime_ns, size).
+    """
+    return {
+        path.relative_to(walker.root).as_posix(): (stat.st_mtime_ns, stat.st_size) for path, stat in walker.iter_files(".py")
+    }
+
+
+def diff_snapshots(old: Snapshot, new: Snapshot) -> set[str]:
+    """
+    Paths that were added, removed or modified between snapshots.
+    """
+    changed = old.keys() ^ new.keys()
+    changed.update(rel for rel in old.keys() & new.keys() if old[rel] != new[rel])
+    return changed
+
+
+# ============================================================
+# PIPELINE
+# ============================================================
+
+
+def refresh(repo_root: Path, paths: set[str] | None, workers: int = 1) -> None:
+    """
+    Run the incremental pipeline. With paths=None every file
+    is checked against the manifest.
+    """
+    index_repo(repo_root=repo_root, workers=workers, incremental=True, changed_paths=paths)
+    rebuild_embeddings(incremental=True)
+    build_vector_store(incremental=True)
+
+
+# ============================================================
+# WATCHER
+# ============================================================
+
+
+class Watcher:
+    """
+    Poll a repository and refresh its index in the background.
+
+    Usage:
+        Watcher(repo_root).run()
+    """
+
+    def __init__(
+        self,
+        repo_root: Path,
+        *,
+        interval: float = 1.0,
+        debounce: float = 2.0,
+        on_refresh: Callable[[set[str] | None], None] | None = None,
+    ):
+        self.repo_root = repo_root
+        self.interval = interval
+        self.debounce = debounce
+        self.on_refresh = on_refresh or (lambda paths: refresh(repo_root, paths))
+
+        self._walker = RepoWalker(repo_root)
+        self._snapshot = take_snapshot(self._walker)
+
+        # Changes seen but not yet quiet for `debounce` seconds
+        self._changed: set[str] = set()
+        self._last_change = 0.0
+
+        # Debounced changes waiting for the worker
+        self._pending: set[str] = set()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+        # After a failed refresh, check every file next time
+        self._rescan = False
+
+    # --------------------------------------------------
+    # Scanning
+    # --------------------------------------------------
+
+    def tick(self, now: float) -> set[str]:
+        """
+        Take one snapshot. Return the batch of changed paths
+        once no further change was seen for `debounce` seconds.
+        """
+        snapshot = take_snapshot(self._walker)
+        changed = diff_snapshots(self._snapshot, snapshot)
+        self._snapshot = snapshot
+
+        if changed:
+            self._changed |= changed
+            self._last_change = now
+            return set()
+
+        if self._changed and now - self._last_change >= self.debounce:
+            batch, self._changed = self._changed, set()
+            return batch
+
+        return set()
+
+    def _submit(self, paths: set[str]) -> None:
+        with self._lock:
+            self._pending |= paths
+        self._ready.set()
+
+    # --------------------------------------------------
+    # Background refresh
+    # --------------------------------------------------
+
+    def _worker(self, stop: threading.Event) -> None:
+        while not stop.is_set():
+            if not self._ready.wait(timeout=self.interval):
+                continue
+
+            with self._lock:
+                paths, self._pending = self._pending, set()
+                self._ready.clear()
+
+            print(f"\n🔄 {len(paths)} changed file(s): {', '.join(sorted(paths)[:5])}")
+            self._run_refresh(None if self._rescan else paths)
+
+    def _run_refresh(self, paths: set[str] | None) -> None:
+        started = time.perf_counter()
+        try:
+            self.on_refresh(paths)
+        except Exception:
+            # Keep watching; the next change triggers a full check
+            traceback.print_exc()
+            self._rescan = True
+            return
+
+        self._rescan = False
+        print(f"✅ Index updated in {time.perf_counter() - started:.1f}s")
+
+    # --------------------------------------------------
+    # Main loop
+    # --------------------------------------------------
+
+    def run(self, stop: threading.Event | None = None) -> None:
+        """
+        Catch up with changes made since the last index run,
+        then watch until `stop` is set (or KeyboardInterrupt).
+        """
+        stop = stop or threading.Event()
+
+        self._run_refresh(None)
+
+        worker = threading.Thread(target=self._worker, args=(stop,), name="index-refresh", daemon=True)
+        worker.start()
+
+        print(f"👀 Watching {self.repo_root} (poll every {self.interval}s, debounce {self.debounce}s)")
+
+        try:
+            while not stop.wait(self.interval):
+                batch = self.tick(time.monotonic())
+                if batch:
+                    self._submit(batch)
+        finally:
+            stop.set()
+            worker.join()
@@ -0,0 +1,211 @@
+"""
+tests/manual/chunking_benchmark.py
+
+Micro-benchmark for chunk_python_file.
+
+Compares the single-pass chunker against a reference copy of the
+previous implementation (one loop over tree.body per section,
+ast.walk per function, ast.get_source_segment per chunk) on a
+synthetic module, and checks that both emit identical chunks.
+
+Usage:
+    python tests/manual/chunking_benchmark.py [--classes 50] [--methods 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import tempfile
+import time
+from pathlib import Path
+
+from ai_dev_assistant.rag.ast_utils import is_overload_function, iter_real_functions
+from ai_dev_assistant.rag.chunking import chunk_python_file
+from ai_dev_assistant.rag.schema import CodeChunk
+from ai_dev_assistant.rag.structure import format_function_signature
+
+# ============================================================
+# REFERENCE (previous multi-pass implementation)
+# ============================================================
+
+
+def _returns(func: ast.FunctionDef) -> str:
+    try:
+        return ast.unparse(func.returns) if func.returns else "unknown"
+    except Exception:
+        return "unknown"
+
+
+def _function_lines(head: list[str], func: ast.FunctionDef) -> str:
+    lines = list(head)
+    doc = ast.get_docstring(func)
+    if doc:
+        lines.extend(["Docstring:", doc.strip(), ""])
+    lines.append(f"Returns: {_returns(func)}")
+    if any(isinstance(n, ast.Yield) for n in ast.walk(func)):
+        lines.append("Type: generator")
+    return "\n".join(lines)
+
+
+def _module_overview(path: Path, tree: ast.Module) -> str:
+    lines = [f"File: {path}", f"Module: {path.stem}", ""]
+    doc = ast.get_docstring(tree)
+    if doc:
+        lines.extend(["Docstring:", doc.strip(), ""])
+
+    imports: list[str] = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            imports.extend(name.name for name in node.names)
+        elif isinstance(node, ast.ImportFrom):
+            imports.extend(f"{node.module or ''}.{name.name}" for name in node.names)
+    if imports:
+        lines.extend(["Imports:", *(f"- {i}" for i in sorted(set(imports))), ""])
+
+    variables = [t.id for n in tree.body if isinstance(n, ast.Assign) for t in n.targets if isinstance(t, ast.Name)]
+    if variables:
+        lines.extend(["Module variables:", *(f"- {v}" for v in sorted(set(variables))), ""])
+
+    classes = [n for n in tree.body if isinstance(n, ast.ClassDef)]
+    if classes:
+        lines.append("Classes:")
+        for cls in classes:
+            lines.append(f"- {cls.name}")
+            lines.extend(f"  - {i.name}()" for i in cls.body if isinstance(i, ast.FunctionDef))
+        lines.append("")
+
+    functions = iter_real_functions(tree)
+    if functions:
+        lines.append("Functions:")
+        for fn in functions:
+            lines.append(f"- {fn.name}()")
+            lines.extend(
+                f"  - nested: {i.name}()" for i in fn.body if isinstance(i, ast.FunctionDef) and not is_overload_function(i)
+            )
+        lines.append("")
+
+    return "\n".join(lines).strip()
+
+
+def _class_overview(path: Path, node: ast.ClassDef) -> str:
+    lines = [f"Class: {node.name}", f"Defined in: {path}", ""]
+    bases = [
+        b.id if isinstance(b, ast.Name) else ast.unparse(b) for b in node.bases if isinstance(b, (ast.Name, ast.Attribute))
+    ]
+    if bases:
+        lines.extend(["Inherits from:", *(f"- {b}" for b in bases), ""])
+    doc = ast.get_docstring(node)
+    if doc:
+        lines.extend(["Docstring:", doc.strip(), ""])
+    attributes = [t.id for i in node.body if isinstance(i, ast.Assign) for t in i.targets if isinstance(t, ast.Name)]
+    if attributes:
+        lines.extend(["Class attributes:", *(f"- {a}" for a in sorted(set(attributes))), ""])
+    methods = [format_function_signature(i) for i in node.body if isinstance(i, ast.FunctionDef)]
+    if methods:
+        lines.extend(["Methods:", *(f"- {m}" for m in methods), ""])
+    return "\n".join(lines).strip()
+
+
+def reference_chunk_python_file(path: Path) -> list[CodeChunk]:
+    code = path.read_text(encoding="utf-8", errors="ignore")
+    tree = ast.parse(code)
+    f = str(path)
+
+    chunks = [
+        CodeChunk(f"{path}::module::overview", f, "module_overview", path.stem, _module_overview(path, tree)),
+        CodeChunk(f"{path}::module", f, "module", path.stem, code),
+    ]
+
+    for node in tree.body:
+        if not isinstance(node, ast.ClassDef):
+            continue
+        chunks.append(CodeChunk(f"{path}::{node.name}::overview", f, "class_overview", node.name, _class_overview(path, node)))
+        chunks.append(CodeChunk(f"{path}::{node.name}", f, "class", node.name, ast.get_source_segment(code, node) or ""))
+        for item in node.body:
+            if not isinstance(item, ast.FunctionDef) or is_overload_function(item):
+                continue
+            symbol = f"{node.name}.{item.name}"
+            head = [f"Method: {node.name}.{format_function_signature(item)}", f"Defined in: {path}", f"Class: {node.name}", ""]
+            chunks.append(CodeChunk(f"{path}::{symbol}::overview", f, "method_overview", symbol, _function_lines(head, item)))
+            chunks.append(CodeChunk(f"{path}::{symbol}", f, "method", symbol, ast.get_source_segment(code, item) or ""))
+
+    for func in iter_real_functions(tree):
+        head = [f"Function: {format_function_signature(func)}", f"Defined in: {path}", ""]
+        overview = _function_lines(head, func)
+        chunks.append(CodeChunk(f"{path}::{func.name}::overview", f, "function_overview", func.name, overview))
+        chunks.append(CodeChunk(f"{path}::{func.name}", f, "function", func.name, ast.get_source_segment(code, func) or ""))
+
+    return chunks
+
+
+# ============================================================
+# SYNTHETIC INPUT
+# ============================================================
+
+
+def make_module(classes: int, methods: int) -> str:
+    parts = ['"""Synthetic benchmark module."""', "import os", "from typing import Iterator", "", "LIMIT = 10", ""]
+
+    for c in range(classes):
+        parts.append(f"class Service{c}(Base{c % 7}, os.PathLike):")
+        parts.append(f'    """Service number {c}."""')
+        parts.append("    retries = 3")
+        for m in range(methods):
+            parts.append(f"    def method_{m}(self, a, b=None, *args, **kwargs) -> int:")
+            parts.append(f'        """Method {m} – does things."""')
+            parts.append("        total = 0")
+            parts.append("        for i in range(a):")
+            parts.append("            total += i * 2 if b else i")
+            if m % 5 == 0:
+                parts.append("            yield total")
+            parts.append("        return total")
+        parts.append("")
+
+    for fn in range(classes):
+        parts.append(f"def helper_{fn}(path, strict=False) -> Iterator[str]:")
+        parts.append("    def inner():")
+        parts.append("        return path")
+        parts.append("    return iter([inner()])")
+        parts.append("")
+
+    return "\n".join(parts)
+
+
+def _time(fn, path: Path, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        list(fn(path))
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark chunk_python_file.")
+    parser.add_argument("--classes", type=int, default=50)
+    parser.add_argument("--methods", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "synthetic.py"
+        path.write_text(make_module(args.classes, args.methods), encoding="utf-8")
+
+        reference = reference_chunk_python_file(path)
+        current = list(chunk_python_file(path))
+        assert [c.__dict__ for c in current] == [c.__dict__ for c in reference], "outputs differ"
+
+        lines = path.read_text().count("\n") + 1
+        print(f"Module: {lines:,} lines, {len(current):,} chunks")
+
+        old = _time(reference_chunk_python_file, path, args.repeat)
+        new = _time(chunk_python_file, path, args.repeat)
+
+    print(f"Reference (multi-pass): {old * 1000:9.1f} ms")
+    print(f"Single-pass:            {new * 1000:9.1f} ms")
+    print(f"Speedup:                {old / new:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
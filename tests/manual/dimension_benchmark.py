@@ -0,0 +1,81 @@
+"""
+tests/manual/dimension_benchmark.py
+
+Recall / latency tradeoff of shortened embeddings on a repo.
+
+Loads the repo's full-size embeddings.npy, truncates and
+renormalizes it to each target dimension (what the API's
+`dimensions` parameter returns for text-embedding-3 models),
+and compares flat-index search against the full-size index:
+
+- recall@k: overlap of the top-k with the full-size top-k
+- latency: mean search time per query
+- index size
+
+Queries are a random sample of the indexed vectors.
+
+Usage:
+    python tests/manual/dimension_benchmark.py [--repo NAME] [--dims 256 512 1024] [--k 10] [--queries 200]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from ai_dev_assistant.tools.artifacts import load_embeddings, resolve_embeddings_path
+
+
+def truncate(matrix: np.ndarray, dim: int) -> np.ndarray:
+    head = np.array(matrix[:, :dim], dtype=np.float32)
+    faiss.normalize_L2(head)
+    return head
+
+
+def search(vectors: np.ndarray, queries: np.ndarray, k: int) -> tuple[np.ndarray, float]:
+    index = faiss.IndexFlatIP(vectors.shape[1])
+    index.add(vectors)
+
+    start = time.perf_counter()
+    _, neighbors = index.search(queries, k)
+    return neighbors, (time.perf_counter() - start) / len(queries)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    hits = sum(len(set(f) & set(t)) for f, t in zip(found, truth, strict=True))
+    return hits / truth.size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark shortened embeddings.")
+    parser.add_argument("--repo", help="Repository name (default: active repo)")
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, 1024, 1536])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ids, matrix = load_embeddings(resolve_embeddings_path(args.repo))
+    full_dim = matrix.shape[1]
+
+    rng = np.random.default_rng(args.seed)
+    sample = rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False)
+
+    full = truncate(matrix, full_dim)
+    truth, full_latency = search(full, full[sample], args.k)
+
+    print(f"Vectors: {len(ids):,} x {full_dim}, {len(sample)} queries, k={args.k}")
+    print(f"{'dim':>6} {'recall@k':>9} {'ms/query':>9} {'index MB':>9}")
+    print(f"{full_dim:>6} {1.0:>9.3f} {full_latency * 1000:>9.3f} {full.nbytes / 1e6:>9.1f}")
+
+    for dim in sorted(d for d in args.dims if d < full_dim):
+        vectors = truncate(matrix, dim)
+        found, latency = search(vectors, vectors[sample], args.k)
+        print(f"{dim:>6} {recall(found, truth):>9.3f} {latency * 1000:>9.3f} {vectors.nbytes / 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+tests/manual/index_benchmark.py
+
+Memory / recall / latency of the vector index types on a repo.
+
+Builds every index type from the repo's embeddings.npy and
+compares it with the exact flat index:
+
+- index size (serialized)
+- recall@k against the flat top-k, without and with exact
+  re-scoring of rerank * k candidates
+- mean search time per query
+
+Queries are a random sample of the indexed vectors.
+
+Usage:
+    python tests/manual/index_benchmark.py [--repo NAME] [--k 10] [--queries 200] [--rerank 4]
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+import faiss
+import numpy as np
+
+from ai_dev_assistant.infra.vector_store import INDEX_TYPES, VectorStore
+from ai_dev_assistant.tools.artifacts import load_embeddings, resolve_embeddings_path
+
+
+def run(store: VectorStore, queries: np.ndarray, k: int, rerank: int) -> tuple[list[set[str]], float]:
+    results = []
+    start = time.perf_counter()
+    for query in queries:
+        results.append({chunk_id for chunk_id, _ in store.search(query.tolist(), k=k, rerank=rerank)})
+    return results, (time.perf_counter() - start) / len(queries)
+
+
+def recall(found: list[set[str]], truth: list[set[str]]) -> float:
+    return sum(len(f & t) for f, t in zip(found, truth, strict=True)) / sum(len(t) for t in truth)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark vector index types.")
+    parser.add_argument("--repo", help="Repository name (default: active repo)")
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--rerank", type=int, default=4)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    ids, matrix = load_embeddings(resolve_embeddings_path(args.repo))
+    dim = matrix.shape[1]
+
+    rng = np.random.default_rng(args.seed)
+    queries = np.array(matrix[np.sort(rng.choice(len(ids), size=min(args.queries, len(ids)), replace=False))])
+
+    print(f"Vectors: {len(ids):,} x {dim}, {len(queries)} queries, k={args.k}, rerank={args.rerank}")
+    print(f"{'index':>6} {'MB':>8} {'build s':>8} {'recall':>7} {'ms/q':>7} {'rescored':>9} {'ms/q':>7}")
+
+    truth: list[set[str]] = []
+
+    for index_type in INDEX_TYPES:
+        store = VectorStore(dim=dim, index_type=index_type)
+
+        start = time.perf_counter()
+        store.build(ids, matrix)
+        build_time = time.perf_counter() - start
+
+        store.use_originals(ids, matrix)
+        size = len(faiss.serialize_index(store.index)) / 1e6
+
+        found, latency = run(store, queries, args.k, rerank=0)
+        if index_type == "flat":
+            truth = found
+            print(f"{index_type:>6} {size:>8.1f} {build_time:>8.1f} {1.0:>7.3f} {latency * 1000:>7.2f}")
+            continue
+
+        rescored, rescored_latency = run(store, queries, args.k, rerank=args.rerank)
+        print(
+            f"{index_type:>6} {size:>8.1f} {build_time:>8.1f} {recall(found, truth):>7.3f} {latency * 1000:>7.2f}"
+            f" {recall(rescored, truth):>9.3f} {rescored_latency * 1000:>7.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,21 @@
 # tests/test_build_vector_store.py
 
+import json
+
+import faiss
+import numpy as np
+
+from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.tools import build_vector_store as build_module
+from ai_dev_assistant.tools.artifacts import load_embeddings, resolve_embeddings_path, write_embeddings
 from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
+from ai_dev_assistant.tools.defaults import (
+    get_embedding_changes_path,
+    get_faiss_index_path,
+    get_faiss_meta_path,
+    get_legacy_embeddings_path,
+)
+from ai_dev_assistant.tools.manifest import ChangeSet, save_changes
 
 
 def test_build_vector_store(precomputed_mini_repo):
@@ -17,3 +32,110 @@ def test_build_vector_store(precomputed_mini_repo):
     - index a repository
     """
     build_vector_store()
+
+
+def test_build_vector_store_incremental(precomputed_mini_repo):
+    """
+    Apply a pending embedding change set to a saved index.
+    """
+    build_vector_store()
+    store = VectorStore.load()
+    removed_id = store.ids[0]
+    replaced_id = store.ids[1]
+
+    save_changes(
+        get_embedding_changes_path(),
+        ChangeSet(added=[replaced_id], removed=[removed_id, replaced_id]),
+    )
+    build_vector_store(incremental=True)
+
+    updated = VectorStore.load()
+    assert removed_id not in updated.ids
+    assert updated.ids.count(replaced_id) == 1
+    assert updated.index.ntotal == len(store.ids) - 1
+    assert not get_embedding_changes_path().exists()
+
+
+def test_build_vector_store_incremental_over_baseline_index(precomputed_mini_repo):
+    """
+    An index saved in the original format (bare flat index,
+    {"ids", "dim"} meta) is rebuilt rather than updated.
+    """
+    build_vector_store()
+    store = VectorStore.load()
+    ids, matrix = load_embeddings(resolve_embeddings_path())
+
+    index = faiss.IndexFlatIP(store.dim)
+    index.add(np.ascontiguousarray(matrix, dtype="float32"))
+    faiss.write_index(index, str(get_faiss_index_path()))
+    get_faiss_meta_path().write_text(json.dumps({"ids": ids, "dim": store.dim}))
+
+    save_changes(get_embedding_changes_path(), ChangeSet(added=[], removed=[ids[0]]))
+    build_vector_store(incremental=True)
+
+    rebuilt = VectorStore.load()
+    assert rebuilt.model == store.model
+    assert rebuilt.has_metadata
+    assert rebuilt.ids == ids
+
+
+def test_build_vector_store_from_npy(precomputed_mini_repo):
+    """
+    Legacy embeddings.json converted to a memory-mapped float16
+    matrix builds the same index.
+    """
+    ids, matrix = load_embeddings(resolve_embeddings_path())
+    path = write_embeddings(ids, matrix, model="m", dtype="float16")
+
+    assert not get_legacy_embeddings_path().exists()
+    assert resolve_embeddings_path() == path
+
+    loaded_ids, loaded = load_embeddings(path)
+    assert loaded_ids == ids
+    assert isinstance(loaded, np.memmap) and loaded.dtype == np.float16
+    assert path.stat().st_size < matrix.nbytes / 2 + 1024
+
+    build_vector_store()
+    store = VectorStore.load()
+
+    assert store.ids == ids
+    for i, chunk_id in enumerate(ids):
+        assert store.search(matrix[i].tolist(), k=1)[0][0] == chunk_id
+
+
+def test_build_vector_store_partitions(precomputed_mini_repo, monkeypatch):
+    """
+    One sub-index per chunk type, kept in step with the main index.
+    """
+    build_vector_store()
+    store = VectorStore.load()
+
+    by_type = {}
+    for chunk_id in store.ids:
+        by_type.setdefault(store.chunk_meta(chunk_id).type, []).append(chunk_id)
+    assert len(by_type) > 1
+
+    for chunk_type, chunk_ids in by_type.items():
+        partition = VectorStore.load(partition=chunk_type)
+        assert partition.ids == chunk_ids
+        assert partition.index_type == store.index_type
+
+    # Sub-indexes are as compact as the main index
+    for index_type, expected in (("sq8", "sq8"), ("ivfpq", "sq8"), ("hnsw", "hnsw")):
+        build_vector_store(index_type=index_type, rerank=2)
+        for chunk_type in by_type:
+            partition = VectorStore.load(partition=chunk_type)
+            assert (partition.index_type, partition.rerank) == (expected, 2)
+    build_vector_store(index_type="flat", rerank=0)
+
+    removed_type, [removed_id, *_] = next((t, ids) for t, ids in by_type.items() if len(ids) > 1)
+    save_changes(get_embedding_changes_path(), ChangeSet(added=[], removed=[removed_id]))
+    build_vector_store(incremental=True)
+
+    assert removed_id not in VectorStore.load(partition=removed_type).ids
+    assert len(VectorStore.load(partition=removed_type)) == len(by_type[removed_type]) - 1
+
+    # Disabled: the next build deletes them
+    monkeypatch.setattr(build_module, "VECTOR_INDEX_PARTITIONS", False)
+    build_vector_store()
+    assert not any(get_faiss_index_path(partition=t).exists() for t in by_type)
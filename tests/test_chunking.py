@@ -0,0 +1,91 @@
+# tests/test_chunking.py
+import ast
+
+from ai_dev_assistant.rag.chunking import chunk_python_file
+
+SOURCE = '''\
+"""Module docstring."""
+import os
+from typing import overload
+
+LIMIT = 1
+
+
+class Base(os.PathLike):
+    """Base – with a non-ASCII docstring."""
+
+    kind = "base"
+
+    @overload
+    def get(self, name: int) -> int: ...
+
+    def get(self, name):
+        def inner():
+            yield name
+
+        return inner()
+
+    def get(self, name):  # redefinition keeps both chunks
+        return "é" + name
+
+
+def outer(a, *args, **kwargs) -> list[str]:
+    def nested():
+        return a
+
+    return [nested()]
+
+
+def gen():\r
+    yield 1\r
+
+
+def outer():
+    yield from range(3)
+'''
+
+
+def test_chunk_python_file_structure(tmp_path):
+    """
+    Chunk text matches the AST source segments, and the
+    overview semantics (overloads, redefinitions, generator
+    detection through nested functions) are preserved.
+    """
+    path = tmp_path / "sample.py"
+    path.write_bytes(SOURCE.encode("utf-8"))
+
+    chunks = list(chunk_python_file(path))
+    by_id = {}
+    for chunk in chunks:
+        by_id.setdefault(chunk.id, []).append(chunk)
+
+    code = path.read_text(encoding="utf-8")
+    tree = ast.parse(code)
+    base = tree.body[4]
+
+    assert by_id[f"{path}::module"][0].text == code
+    assert by_id[f"{path}::Base"][0].text == ast.get_source_segment(code, base)
+    assert [c.text for c in by_id[f"{path}::Base.get"]] == [
+        ast.get_source_segment(code, base.body[3]),
+        ast.get_source_segment(code, base.body[4]),
+    ]
+
+    # Yield inside a nested function marks the method as a generator
+    first_get, second_get = by_id[f"{path}::Base.get::overview"]
+    assert "Type: generator" in first_get.text
+    assert "Type: generator" not in second_get.text
+
+    # Last definition wins, at the position of the first one
+    functions = [c.symbol for c in chunks if c.type == "function"]
+    assert functions == ["outer", "gen"]
+    assert "yield from" in by_id[f"{path}::outer"][0].text
+    assert "Type: generator" not in by_id[f"{path}::outer::overview"][0].text
+    assert "Type: generator" in by_id[f"{path}::gen::overview"][0].text
+
+    module_overview = by_id[f"{path}::module::overview"][0].text
+    assert "- get()\n  - get()\n  - get()" in module_overview
+    assert "- typing.overload" in module_overview
+
+    class_overview = by_id[f"{path}::Base::overview"][0].text
+    assert "Inherits from:\n- os.PathLike" in class_overview
+    assert "Class attributes:\n- kind" in class_overview
@@ -0,0 +1,59 @@
+# tests/test_context.py
+from ai_dev_assistant.rag.context import ContextOptions, build_context, open_artifacts
+from ai_dev_assistant.tools.defaults import get_artifacts_db_path, repo_name_from_path, set_active_repo_name
+from ai_dev_assistant.tools.index_repo import main as index_repo
+
+
+def test_build_context_from_artifact_db(
+    mini_repo,
+    isolated_data_root,
+):
+    """
+    Context assembled from indexed SQLite lookups is identical
+    to the one assembled by scanning the chunk artifact.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    index_repo(repo_root=mini_repo)
+
+    results = [
+        (f"{mini_repo / 'factory.py'}::AdapterFactory::overview", 0.9),
+        (f"{mini_repo / 'utils.py'}::module::overview", 0.5),
+        ("missing::overview", 0.1),
+    ]
+    options = ContextOptions(prefer_full_code=True, expand_inheritance_depth=2)
+
+    from_db = build_context(results, options)
+
+    get_artifacts_db_path(repo_name).unlink()
+    from_json = build_context(results, options)
+
+    assert from_db == from_json
+    assert "[PARENT: Factory]" in from_db
+    assert 'return f"adapter:{name}"' in from_db
+    assert "PROJECT STRUCTURE" in from_db
+
+
+def test_build_context_reads_code_of_the_artifacts_repo(
+    mini_repo,
+    isolated_data_root,
+):
+    """
+    Full code comes from the blob store of the repo the artifacts
+    were opened for, not from the active repo.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    index_repo(repo_root=mini_repo)
+    set_active_repo_name("other_repo")
+
+    results = [(f"{mini_repo / 'factory.py'}::AdapterFactory::overview", 0.9)]
+    options = ContextOptions(prefer_full_code=True)
+
+    artifacts = open_artifacts(repo_name)
+    try:
+        from_db = build_context(results, options, artifacts)
+    finally:
+        artifacts.close()
+    assert 'return f"adapter:{name}"' in from_db
+
+    get_artifacts_db_path(repo_name).unlink()
+    assert build_context(results, options, open_artifacts(repo_name)) == from_db
@@ -0,0 +1,76 @@
+# tests/test_discovery.py
+from ai_dev_assistant.rag.discovery import RepoWalker, iter_python_files, parse_ignore_lines
+from ai_dev_assistant.rag.overviews import walk_python_packages
+
+
+def _touch(root, rel, text="x = 1\n"):
+    path = root / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def test_iter_python_files_prunes_ignored_paths(tmp_path):
+    """
+    Default ignored dirs, virtualenvs, .gitignore (nested, negated,
+    anchored, dir-only), .git/info/exclude, the project ignore file
+    and the size limit all keep files out of discovery.
+    """
+    for rel in [
+        "pkg/__init__.py",
+        "pkg/core.py",
+        "pkg/gen_pb2.py",
+        "pkg/keep_pb2.py",
+        "pkg/sub/mod.py",
+        "pkg/sub/local.py",
+        "pkg/out/x.py",
+        "out/y.py",
+        "vendor/lib.py",
+        "scratch.py",
+        "big.py",
+        ".git/hooks/hook.py",
+        "node_modules/a/b.py",
+        "env/lib/site.py",
+        "build/lib/pkg.py",
+    ]:
+        _touch(tmp_path, rel)
+
+    (tmp_path / "big.py").write_text("x = 1\n" * 100)
+    (tmp_path / "env" / "pyvenv.cfg").write_text("home = /usr\n")
+    (tmp_path / ".gitignore").write_text("*_pb2.py\n!keep_pb2.py\n/out/\n")
+    (tmp_path / "pkg" / "sub" / ".gitignore").write_text("local.py\n")
+    (tmp_path / ".git" / "info").mkdir(parents=True)
+    (tmp_path / ".git" / "info" / "exclude").write_text("scratch.py\n")
+    (tmp_path / ".aidevignore").write_text("vendor/\n")
+
+    files = [p.relative_to(tmp_path).as_posix() for p in iter_python_files(tmp_path, max_file_size=100)]
+
+    assert files == [
+        "pkg/__init__.py",
+        "pkg/core.py",
+        "pkg/keep_pb2.py",
+        "pkg/out/x.py",
+        "pkg/sub/mod.py",
+    ]
+
+
+def test_ignore_patterns_follow_gitignore_semantics():
+    patterns = parse_ignore_lines(["docs/**/*.py", "a/**", "**/gen", "\\#literal", "# comment"])
+    docs, inside_a, gen, literal = patterns
+
+    assert docs.matches("docs/x.py", "x.py", False)
+    assert docs.matches("docs/a/b/x.py", "x.py", False)
+    assert not docs.matches("src/docs/x.py", "x.py", False)
+    assert inside_a.matches("a/b/c", "c", True)
+    assert not inside_a.matches("a", "a", True)
+    assert gen.matches("x/y/gen", "gen", True)
+    assert literal.matches("#literal", "#literal", False)
+
+
+def test_walk_python_packages_uses_walker(tmp_path):
+    for rel in ["pkg/__init__.py", "pkg/api/__init__.py", "pkg/skip/__init__.py", "pkg/tests/__init__.py"]:
+        _touch(tmp_path, rel)
+    (tmp_path / "pkg" / ".gitignore").write_text("skip/\n")
+
+    tree = walk_python_packages(tmp_path / "pkg", walker=RepoWalker(tmp_path))
+
+    assert tree == {"api": {}}
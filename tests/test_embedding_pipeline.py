@@ -0,0 +1,85 @@
+# tests/test_embedding_pipeline.py
+import pytest
+
+from ai_dev_assistant.infra.embedding_cache import EmbeddingCache, EmbeddingCheckpoint
+from ai_dev_assistant.rag import embedding_pipeline
+from ai_dev_assistant.rag.embedding_pipeline import embed_chunks
+from ai_dev_assistant.rag.schema import CodeChunk
+
+
+def _chunk(i, text, chunk_type="function_overview"):
+    return CodeChunk(id=f"f.py::fn{i}::overview", file="f.py", type=chunk_type, symbol=f"fn{i}", text=text)
+
+
+def test_embed_chunks_uses_cache_and_dedups(tmp_path, monkeypatch, capsys):
+    """
+    Identical texts are embedded once, and a second run with an
+    unchanged text set makes no embedding calls at all.
+    """
+    calls = []
+
+    def fake_embed_texts(texts, model, on_batch, dimensions=None):
+        calls.append(list(texts))
+        vectors = [[float(len(t)), 0.5, -1.0] for t in texts]
+        on_batch(dict(enumerate(vectors)))
+        return vectors
+
+    monkeypatch.setattr(embedding_pipeline, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(embedding_pipeline, "estimate_embedding_cost", lambda texts, model: (len(texts), 0.0))
+
+    chunks = [_chunk(0, "alpha"), _chunk(1, "beta"), _chunk(2, "alpha"), _chunk(3, "code", "function")]
+
+    with EmbeddingCache(tmp_path / "cache.db") as cache:
+        first = embed_chunks(chunks, model="m", cache=cache)
+        assert calls == [["alpha", "beta"]]
+
+        second = embed_chunks(chunks, model="m", cache=cache)
+        assert calls == [["alpha", "beta"]]
+        assert "Cache hits:     2" in capsys.readouterr().out
+
+        # The cache is keyed by model too
+        embed_chunks(chunks[:1], model="other", cache=cache)
+        assert calls[-1] == ["alpha"]
+
+    assert [r["id"] for r in first] == [c.id for c in chunks[:3]]
+    assert first == second
+    assert first[0]["embedding"] == first[2]["embedding"] == [5.0, 0.5, -1.0]
+
+
+def test_embed_chunks_resumes_from_checkpoint(tmp_path, monkeypatch):
+    """
+    A run that dies halfway keeps its finished requests in the
+    checkpoint; the resumed run (here without the shared cache,
+    as on a fresh CI runner) only embeds the rest.
+    """
+    calls = []
+
+    def flaky_embed_texts(texts, model, on_batch, dimensions=None):
+        calls.append(list(texts))
+        on_batch({0: [1.0, 0.0], 1: [2.0, 0.0]})
+        if len(calls) == 1:
+            raise RuntimeError("preempted")
+        on_batch({i: [float(i + 1), 0.0] for i in range(2, len(texts))})
+
+    monkeypatch.setattr(embedding_pipeline, "embed_texts", flaky_embed_texts)
+    monkeypatch.setattr(embedding_pipeline, "estimate_embedding_cost", lambda texts, model: (len(texts), 0.0))
+
+    chunks = [_chunk(i, f"text {i}") for i in range(4)]
+    checkpoint = EmbeddingCheckpoint(tmp_path / "embeddings.checkpoint.jsonl")
+
+    with EmbeddingCache(tmp_path / "cache-a.db") as cache, pytest.raises(RuntimeError):
+        embed_chunks(chunks, model="m", cache=cache, checkpoint=checkpoint)
+    checkpoint.close()
+
+    # A torn line from the crash is skipped
+    with checkpoint.path.open("a") as f:
+        f.write('{"model": "m", "key": ')
+
+    with EmbeddingCache(tmp_path / "cache-b.db") as cache:
+        records = embed_chunks(chunks, model="m", cache=cache, checkpoint=checkpoint)
+    checkpoint.close()
+
+    assert calls == [["text 0", "text 1", "text 2", "text 3"], ["text 2", "text 3"]]
+    assert [r["embedding"][0] for r in records] == [1.0, 2.0, 1.0, 2.0]
+    assert len(checkpoint.load("m")) == 4
+    assert checkpoint.load("other") == {}
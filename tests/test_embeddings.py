@@ -0,0 +1,219 @@
+# tests/test_embeddings.py
+import base64
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import openai
+import pytest
+from openai import OpenAI
+
+from ai_dev_assistant.infra import embeddings
+from ai_dev_assistant.infra.embeddings import Piece, embed_queries, embed_query, embed_texts, pack_batches, split_oversize
+
+LATENCY = 0.1
+
+
+class ByteEncoder:
+    """
+    One token per UTF-8 byte, so tests never load a tiktoken vocabulary.
+    """
+
+    def encode(self, text):
+        return list(text.encode())
+
+    def decode(self, tokens):
+        return bytes(tokens).decode(errors="replace")
+
+
+class FakeEmbeddingsHandler(BaseHTTPRequestHandler):
+    """
+    Minimal /v1/embeddings endpoint: each input text "t<i>"
+    embeds to [i, 1], after LATENCY seconds. Texts listed in
+    server.flaky fail once with a 429 or 503.
+    """
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        time.sleep(LATENCY)
+
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            server.dimensions.append(body.get("dimensions"))
+            failure = next((server.flaky.pop(t) for t in body["input"] if t in server.flaky), None)
+
+        if failure is not None:
+            self.send_response(failure)
+            self.send_header("Content-Type", "application/json")
+            self.end_headers()
+            self.wfile.write(json.dumps({"error": {"message": "try again"}}).encode())
+            return
+
+        data = []
+        for i, text in enumerate(body["input"]):
+            vector = np.array([float(text[1:]), 1.0], dtype=np.float32)[: body.get("dimensions")]
+            if body.get("encoding_format") == "base64":
+                embedding = base64.b64encode(vector.tobytes()).decode()
+            else:
+                embedding = vector.tolist()
+            data.append({"object": "embedding", "index": i, "embedding": embedding})
+
+        payload = {"object": "list", "data": data, "model": body["model"], "usage": {"prompt_tokens": 0, "total_tokens": 0}}
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.end_headers()
+        self.wfile.write(json.dumps(payload).encode())
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_endpoint(monkeypatch):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeEmbeddingsHandler)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.flaky = {}
+    server.dimensions = []
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    client = OpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_address[1]}/v1")
+    monkeypatch.setattr(embeddings, "get_ai_client", lambda: client)
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+def test_embed_texts_concurrent_keeps_order_and_speeds_up(fake_endpoint):
+    texts = [f"t{i}" for i in range(16)]
+    expected = [[float(i), 1.0] for i in range(16)]
+
+    start = time.perf_counter()
+    serial = embed_texts(texts, model="m", batch_size=2, concurrency=1, encoder=ByteEncoder())
+    serial_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    concurrent = embed_texts(texts, model="m", batch_size=2, concurrency=4, encoder=ByteEncoder())
+    concurrent_time = time.perf_counter() - start
+
+    assert serial == concurrent == expected
+
+    # 8 batches: ~8 round trips serially, ~2 with 4 in flight
+    assert serial_time >= 8 * LATENCY
+    assert concurrent_time < serial_time / 2
+
+
+def test_embed_texts_retries_rate_limits_and_server_errors(fake_endpoint):
+    fake_endpoint.flaky = {"t1": 429, "t4": 503}
+
+    vectors = embed_texts(
+        [f"t{i}" for i in range(6)],
+        model="m",
+        batch_size=2,
+        concurrency=3,
+        retry_base_delay=0.01,
+        encoder=ByteEncoder(),
+    )
+
+    assert vectors == [[float(i), 1.0] for i in range(6)]
+    assert fake_endpoint.flaky == {}
+    assert fake_endpoint.requests == 5
+
+
+def test_embed_texts_reports_finished_batches_before_failing(fake_endpoint):
+    fake_endpoint.flaky = {"t5": 400}
+    finished = {}
+
+    with pytest.raises(openai.BadRequestError):
+        embed_texts(
+            [f"t{i}" for i in range(8)],
+            model="m",
+            batch_size=2,
+            concurrency=1,
+            encoder=ByteEncoder(),
+            on_batch=finished.update,
+        )
+
+    assert finished == {i: [float(i), 1.0] for i in range(4)}
+
+
+def test_embed_texts_shortens_vectors(fake_endpoint):
+    texts = ["t3", "t0"]
+
+    # text-embedding-3 models shorten server-side
+    assert embed_texts(texts, model="text-embedding-3-small", dimensions=1, encoder=ByteEncoder()) == [[3.0], [0.0]]
+    assert fake_endpoint.dimensions == [1]
+
+    # Others are truncated and renormalized locally
+    assert embed_texts(texts, model="m", dimensions=1, encoder=ByteEncoder()) == [[1.0], [0.0]]
+    assert fake_endpoint.dimensions == [1, None]
+
+
+def test_embed_texts_packs_requests_by_token_budget(fake_endpoint):
+    # "t0".."t9" are 2 tokens, "t10".."t19" are 3
+    texts = [f"t{i}" for i in range(20)]
+
+    vectors = embed_texts(texts, model="m", max_batch_tokens=10, concurrency=1, encoder=ByteEncoder())
+
+    assert vectors == [[float(i), 1.0] for i in range(20)]
+    # 20 tokens in 2 full requests, then 30 tokens in 3 requests of 3 texts and one of 1
+    assert fake_endpoint.requests == 6
+
+
+def test_oversize_inputs_truncate_or_split(monkeypatch):
+    encoder = ByteEncoder()
+    texts = ["abc", "x" * 10]
+
+    truncated = split_oversize(texts, encoder, max_input_tokens=4, policy="truncate")
+    assert truncated == [Piece(0, "abc", 3), Piece(1, "xxxx", 4)]
+
+    split = split_oversize(texts, encoder, max_input_tokens=4, policy="split")
+    assert split == [Piece(0, "abc", 3), Piece(1, "xxxx", 4), Piece(1, "xxxx", 4), Piece(1, "xx", 2)]
+
+    with pytest.raises(ValueError):
+        split_oversize(texts, encoder, policy="drop")
+
+    assert [len(b) for b in pack_batches(split, max_tokens=8)] == [2, 2]
+    assert [len(b) for b in pack_batches(split, max_tokens=100, max_inputs=3)] == [3, 1]
+
+    # Split pieces are merged back into one unit vector per text
+    piece_vectors = {"abc": [1.0, 0.0], "xxxx": [0.0, 1.0], "xx": [1.0, 0.0]}
+    monkeypatch.setattr(embeddings, "get_ai_client", lambda: OpenAI(api_key="test"))
+    monkeypatch.setattr(
+        embeddings, "_embed_batch", lambda client, batch, model, delay, dimensions: [piece_vectors[t] for t in batch]
+    )
+
+    vectors = embed_texts(texts, model="m", max_input_tokens=4, oversize="split", encoder=encoder)
+
+    assert vectors[0] == [1.0, 0.0]
+    assert np.allclose(vectors[1], np.array([2.0, 8.0]) / np.linalg.norm([2.0, 8.0]))
+
+
+def test_embed_queries_one_request(fake_endpoint):
+    queries = [f"t{i}" for i in range(5)]
+
+    assert embed_queries(queries, model="text-embedding-3-small", dimensions=None) == [[float(i), 1.0] for i in range(5)]
+    assert fake_endpoint.requests == 1
+    assert embed_queries([], model="m") == []
+
+
+def test_embed_query_retries_server_errors(fake_endpoint):
+    fake_endpoint.flaky = {"t3": 503}
+
+    assert embed_query("t3", model="text-embedding-3-small", dimensions=None) == [3.0, 1.0]
+    assert fake_endpoint.requests == 2
+
+
+def test_embed_query_in_dry_run_fails_clearly(monkeypatch):
+    monkeypatch.setattr(embeddings, "get_ai_client", lambda: None)
+
+    with pytest.raises(RuntimeError, match="dry-run"):
+        embed_query("question", model="text-embedding-3-small")
+    with pytest.raises(RuntimeError, match="dry-run"):
+        embed_queries(["question"], model="text-embedding-3-small")
@@ -1,9 +1,13 @@
 # tests/test_export_yaml_preview
 # tests/test_export_yaml_preview.py
 
+import yaml
+
+from ai_dev_assistant.tools.artifacts import iter_chunk_records, resolve_chunks_path
 from ai_dev_assistant.tools.defaults import (
     get_yaml_preview_path,
 )
+from ai_dev_assistant.tools.export_yaml_preview import convert_multiline_strings
 from ai_dev_assistant.tools.export_yaml_preview import main as export_yaml_preview
 
 
@@ -22,3 +26,16 @@ def test_export_yaml_preview(precomputed_mini_repo):
     # Assert (existence only; crash-free == success)
     yaml_path = get_yaml_preview_path()
     assert yaml_path.exists()
+
+
+def test_export_yaml_preview_streams_whole_document(precomputed_mini_repo):
+    """
+    Streaming one record at a time yields the same document
+    as dumping the whole chunk list at once.
+    """
+    chunks = list(iter_chunk_records(resolve_chunks_path()))
+
+    export_yaml_preview()
+
+    expected = yaml.safe_dump(convert_multiline_strings(chunks), sort_keys=False, allow_unicode=True, width=120)
+    assert get_yaml_preview_path().read_text(encoding="utf-8") == expected
@@ -1,10 +1,24 @@
 # tests/test_index_repo.py
+import shutil
+import sqlite3
+import subprocess
+
+import pytest
+
+from ai_dev_assistant.rag.chunking import chunk_python_file
+from ai_dev_assistant.tools import index_repo as index_repo_module
+from ai_dev_assistant.tools.artifacts import chunk_text, iter_chunk_records
+from ai_dev_assistant.tools.blobs import BlobStore
 from ai_dev_assistant.tools.defaults import (
     get_active_repo_name,
+    get_artifacts_db_path,
     get_chunks_path,
+    get_index_changes_path,
+    get_manifest_path,
     repo_name_from_path,
 )
 from ai_dev_assistant.tools.index_repo import main as index_repo
+from ai_dev_assistant.tools.manifest import load_changes, load_manifest
 
 
 def test_index_repo_creates_chunks(
@@ -15,7 +29,7 @@ def test_index_repo_creates_chunks(
     Index a repository into structural chunks.
 
     Verifies that:
-    - chunks.json is created in the assistant data workspace
+    - chunks.jsonl is created in the assistant data workspace
     - the active repository is recorded
     """
     index_repo(repo_root=mini_repo)
@@ -28,3 +42,184 @@ def test_index_repo_creates_chunks(
 
     # Active repo should be set
     assert get_active_repo_name() == repo_name
+
+
+def test_index_repo_parallel_matches_serial(
+    mini_repo,
+    isolated_data_root,
+):
+    """
+    Chunking in a process pool must produce a byte-identical
+    chunks.jsonl to a serial run.
+    """
+    chunks_path = get_chunks_path(repo_name_from_path(mini_repo))
+
+    index_repo(repo_root=mini_repo)
+    serial = chunks_path.read_bytes()
+
+    index_repo(repo_root=mini_repo, workers=2)
+    parallel = chunks_path.read_bytes()
+
+    assert parallel == serial
+
+
+def test_index_repo_incremental_tracks_changes(
+    mini_repo,
+    isolated_data_root,
+):
+    """
+    An incremental run re-parses only changed files, drops chunks
+    of deleted files, records exactly which ids changed and
+    produces the same chunks.jsonl as a full run.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    chunks_path = get_chunks_path(repo_name)
+    changes_path = get_index_changes_path(repo_name)
+
+    index_repo(repo_root=mini_repo, incremental=True)
+    assert get_manifest_path(repo_name).exists()
+    assert load_changes(changes_path).full
+
+    changes_path.unlink()
+
+    (mini_repo / "utils.py").write_text("def helper():\n    return 43\n\n\ndef other():\n    return 1\n")
+    (mini_repo / "adapter.py").unlink()
+
+    index_repo(repo_root=mini_repo, incremental=True)
+    incremental = chunks_path.read_bytes()
+
+    changes = load_changes(changes_path)
+    utils = str(mini_repo / "utils.py")
+    adapter = str(mini_repo / "adapter.py")
+    factory = str(mini_repo / "factory.py")
+
+    assert not changes.full
+    assert f"{utils}::other" in changes.added
+    assert f"{utils}::helper" in changes.removed
+    assert f"{utils}::helper" in changes.added
+    assert f"{adapter}::Factory" in changes.removed
+    assert f"{adapter}::Factory" not in changes.added
+    assert not any(i.startswith(factory) for i in changes.added + changes.removed)
+
+    # The artifact database follows the change set
+    with sqlite3.connect(get_artifacts_db_path(repo_name)) as conn:
+        rows = sorted(conn.execute("SELECT id, text FROM chunks"))
+    assert rows == sorted((r["id"], r["text"]) for r in iter_chunk_records(chunks_path))
+
+    index_repo(repo_root=mini_repo)
+    assert chunks_path.read_bytes() == incremental
+
+
+def test_index_repo_stores_sources_as_blobs(
+    mini_repo,
+    isolated_data_root,
+):
+    """
+    Code chunks reference byte ranges in the content-addressed
+    blob store instead of repeating the source; slicing them
+    gives back the original text. Unreferenced blobs are pruned.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    blobs = BlobStore.for_repo(repo_name)
+
+    index_repo(repo_root=mini_repo)
+
+    records = {r["id"]: r for r in iter_chunk_records(get_chunks_path(repo_name))}
+    inline = [c for p in sorted(mini_repo.glob("*.py")) for c in chunk_python_file(p)]
+
+    for chunk in inline:
+        record = records[chunk.id]
+        if chunk.type in ("module", "class", "method", "function"):
+            assert record["text"] == ""
+            assert record["blob"]
+        assert chunk_text(record, blobs) == chunk.text
+
+    adapter_blob = records[f"{mini_repo / 'adapter.py'}::module"]["blob"]
+    (mini_repo / "adapter.py").unlink()
+
+    index_repo(repo_root=mini_repo, incremental=True)
+    assert not blobs.path(adapter_blob).exists()
+
+
+def _git(repo, *args):
+    subprocess.run(
+        ["git", "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        cwd=repo,
+        check=True,
+        capture_output=True,
+    )
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_index_repo_git_diff_refresh(
+    mini_repo,
+    isolated_data_root,
+    monkeypatch,
+):
+    """
+    A git-diff refresh records the indexed commit, only fingerprints
+    paths git reports (committed, renamed, deleted, untracked) and
+    produces the same chunks.jsonl as a full run.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    chunks_path = get_chunks_path(repo_name)
+    manifest_path = get_manifest_path(repo_name)
+
+    _git(mini_repo, "init", "-q")
+    _git(mini_repo, "add", "-A")
+    _git(mini_repo, "commit", "-q", "-m", "initial")
+
+    index_repo(repo_root=mini_repo, git_diff=True)
+    first = load_manifest(manifest_path, mini_repo.resolve())
+    assert first.git_commit is not None
+
+    (mini_repo / "utils.py").write_text("def helper():\n    return 43\n")
+    _git(mini_repo, "mv", "adapter.py", "adapter2.py")
+    _git(mini_repo, "commit", "-q", "-am", "change")
+    (mini_repo / "untracked.py").write_text("def fresh():\n    return 1\n")
+
+    fingerprinted = []
+    current_entry = index_repo_module._current_entry
+
+    def spy(path, stat, previous):
+        fingerprinted.append(path.name)
+        return current_entry(path, stat, previous)
+
+    monkeypatch.setattr(index_repo_module, "_current_entry", spy)
+
+    index_repo(repo_root=mini_repo, git_diff=True)
+    refreshed = chunks_path.read_bytes()
+
+    assert sorted(fingerprinted) == ["adapter2.py", "untracked.py", "utils.py"]
+    assert load_manifest(manifest_path, mini_repo.resolve()).git_commit != first.git_commit
+
+    index_repo(repo_root=mini_repo)
+    assert chunks_path.read_bytes() == refreshed
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+def test_index_repo_git_diff_rechecks_reverted_and_exclude_changes(mini_repo, isolated_data_root):
+    """
+    A file dirty at indexing time and reverted since is re-checked,
+    and a changed .git/info/exclude forces a full scan.
+    """
+    repo_name = repo_name_from_path(mini_repo)
+    chunks_path = get_chunks_path(repo_name)
+
+    _git(mini_repo, "init", "-q")
+    _git(mini_repo, "add", "-A")
+    _git(mini_repo, "commit", "-q", "-m", "initial")
+
+    committed = (mini_repo / "utils.py").read_text()
+    (mini_repo / "utils.py").write_text("def dirty_helper():\n    return 0\n")
+    index_repo(repo_root=mini_repo, git_diff=True)
+    assert "dirty_helper" in chunks_path.read_text()
+
+    (mini_repo / "utils.py").write_text(committed)
+    index_repo(repo_root=mini_repo, git_diff=True)
+    assert "dirty_helper" not in chunks_path.read_text()
+
+    (mini_repo / ".git" / "info").mkdir(exist_ok=True)
+    (mini_repo / ".git" / "info" / "exclude").write_text("utils.py\n")
+    index_repo(repo_root=mini_repo, git_diff=True)
+    assert "/utils.py::" not in chunks_path.read_text()
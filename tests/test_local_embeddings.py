@@ -0,0 +1,214 @@
+# tests/test_local_embeddings.py
+import json
+import sys
+from functools import partial
+
+import numpy as np
+import pytest
+
+from ai_dev_assistant.cli import inspect_repo as inspect_cli
+from ai_dev_assistant.infra.config import LOCAL_EMBEDDING_DIM, LOCAL_EMBEDDING_MODEL
+from ai_dev_assistant.infra.embeddings import embed_queries
+from ai_dev_assistant.infra.local_embeddings import HashingEmbedder, subwords
+from ai_dev_assistant.infra.vector_store import ChunkMeta, VectorStore
+from ai_dev_assistant.rag.embedding_policy import EMBEDDABLE_TYPES
+from ai_dev_assistant.rag.modes import MODE_POLICIES, ConversationMode, get_mode_policy
+from ai_dev_assistant.services.search import search_queries, search_query
+from ai_dev_assistant.tools import rebuild_embeddings as rebuild_module
+from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
+from ai_dev_assistant.tools.defaults import get_embeddings_checkpoint_path, get_faiss_index_path, get_faiss_meta_path
+from ai_dev_assistant.tools.index_repo import main as index_repo
+
+
+def test_hashing_embedder_is_deterministic_and_normalized():
+    assert list(subwords("AdapterFactory.get_item(self, HTTPServer2)")) == [
+        "adapter",
+        "factory",
+        "get",
+        "item",
+        "http",
+        "server",
+        "2",
+    ]
+
+    embedder = HashingEmbedder(dim=256)
+    matrix = embedder.embed_matrix(["class AdapterFactory", "adapter_factory()", "def helper(): return 42", ""])
+
+    assert matrix.shape == (4, 256)
+    assert np.allclose(np.linalg.norm(matrix[:3], axis=1), 1.0)
+    assert not matrix[3].any()
+    assert np.array_equal(HashingEmbedder(dim=256).embed_one("class AdapterFactory"), matrix[0])
+
+    # Same identifiers in another spelling score higher than unrelated code
+    assert matrix[0] @ matrix[1] > 0.8
+    assert matrix[0] @ matrix[2] < 0.2
+
+
+def test_offline_index_and_search(mini_repo, active_repo_name, monkeypatch):
+    """
+    With the local model, the whole pipeline runs in dry-run
+    mode and search returns real results.
+    """
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    result = search_query("which factory creates adapters?", k=3, model=LOCAL_EMBEDDING_MODEL)
+
+    assert result["dry_run"] is False
+    assert result["cost"]["estimated_cost"] == 0.0
+    top = [c["chunk_id"] for c in result["chunks"]]
+    assert all("/factory.py::" in chunk_id for chunk_id in top)
+    assert any(chunk_id.endswith("::AdapterFactory::overview") for chunk_id in top)
+
+    helper = search_query("helper function", k=1, model=LOCAL_EMBEDDING_MODEL)
+    assert helper["chunks"][0]["chunk_id"].endswith("::helper::overview")
+
+    queries = ["which factory creates adapters?", "helper function"]
+    batch = search_queries(queries, k=3, model=LOCAL_EMBEDDING_MODEL)
+    assert [r["query"] for r in batch["results"]] == queries
+    assert batch["results"][0]["chunks"] == result["chunks"]
+    assert batch["results"][1]["chunks"][0] == helper["chunks"][0]
+
+
+def test_reduced_dimensions_are_recorded_and_checked(mini_repo, active_repo_name, monkeypatch):
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_TARGET_DIM", 64)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    meta = json.loads(get_faiss_meta_path().read_text())
+    assert (meta["model"], meta["dim"]) == (LOCAL_EMBEDDING_MODEL, 64)
+
+    result = search_query("adapter factory", k=1, model=LOCAL_EMBEDDING_MODEL, dimensions=64)
+    assert "/factory.py::" in result["chunks"][0]["chunk_id"]
+
+    with pytest.raises(ValueError, match="RAG_EMBEDDING_DIM"):
+        search_query("adapter factory", model=LOCAL_EMBEDDING_MODEL, dimensions=None)
+
+    with pytest.raises(ValueError, match="RAG_EMBEDDING_MODEL"):
+        VectorStore.load().check_query("text-embedding-3-small", 64)
+
+
+def test_filtered_search_by_path_package_and_type(mini_repo, active_repo_name, monkeypatch):
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    services = mini_repo / "services"
+    services.mkdir()
+    (services / "__init__.py").write_text("")
+    (services / "lookup.py").write_text(
+        "class AdapterLookup:\n"
+        "    def find(self, name):\n"
+        "        return name\n\n\n"
+        "def lookup_adapter(name):\n"
+        "    return AdapterLookup().find(name)\n"
+    )
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    store = VectorStore.load()
+    meta = store.chunk_meta(next(chunk_id for chunk_id in store.ids if chunk_id.endswith("::lookup_adapter::overview")))
+    assert meta == ChunkMeta("function_overview", "services/lookup.py", "services")
+
+    query = "which factory creates adapters?"
+    scoped = search_query(query, k=5, model=LOCAL_EMBEDDING_MODEL, path_prefix="services/")
+    assert scoped["chunks"]
+    assert all("/services/" in c["chunk_id"] for c in scoped["chunks"])
+    assert any(c["chunk_id"].endswith("::AdapterLookup::overview") for c in scoped["chunks"])
+
+    by_package = search_query(query, k=5, model=LOCAL_EMBEDDING_MODEL, packages=["services"])
+    assert by_package["chunks"] == scoped["chunks"]
+
+    functions = search_queries([query], k=5, model=LOCAL_EMBEDDING_MODEL, types=["function_overview"])
+    top = [c["chunk_id"] for c in functions["results"][0]["chunks"]]
+    assert top and all(store.chunk_meta(chunk_id).type == "function_overview" for chunk_id in top)
+
+
+def test_oversized_target_dimensions_fail_before_embedding(mini_repo, active_repo_name, monkeypatch):
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_TARGET_DIM", LOCAL_EMBEDDING_DIM + 1)
+
+    index_repo(repo_root=mini_repo)
+    with pytest.raises(ValueError, match="RAG_EMBEDDING_DIM"):
+        rebuild_module.main()
+    assert not get_embeddings_checkpoint_path().exists()
+
+    with pytest.raises(ValueError, match="RAG_EMBEDDING_DIM"):
+        embed_queries(["adapter factory"], model=LOCAL_EMBEDDING_MODEL, dimensions=LOCAL_EMBEDDING_DIM + 1)
+
+
+def test_partitioned_search_follows_mode_policy(mini_repo, active_repo_name, monkeypatch):
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    for policy in MODE_POLICIES.values():
+        assert {partition for partition, _ in policy.partitions} <= EMBEDDABLE_TYPES
+        # An injected project overview is not retrieved a second time
+        if policy.inject_project_overview:
+            assert "project" not in dict(policy.partitions)
+
+    store = VectorStore.load()
+    query = "which factory creates adapters?"
+    partitions = get_mode_policy(ConversationMode.ARCHITECTURE).partitions
+
+    result = search_query(query, model=LOCAL_EMBEDDING_MODEL, partitions=partitions)
+    found = [(c["chunk_id"], c["score"]) for c in result["chunks"]]
+
+    assert [score for _, score in found] == sorted((score for _, score in found), reverse=True)
+    for partition, k in partitions:
+        of_type = [chunk_id for chunk_id, _ in found if store.chunk_meta(chunk_id).type == partition]
+        assert 0 < len(of_type) <= k
+    assert len(found) == sum(min(k, len(VectorStore.load(partition=p))) for p, k in partitions)
+
+    classes = search_query(query, model=LOCAL_EMBEDDING_MODEL, partitions=partitions, types=["class_overview"])
+    assert [c["chunk_id"] for c in classes["chunks"]] == [c for c, _ in found if store.chunk_meta(c).type == "class_overview"]
+
+    # Without sub-indexes, the main index is searched by type
+    for partition, _ in partitions:
+        get_faiss_index_path(partition=partition).unlink()
+    fallback = search_queries([query], model=LOCAL_EMBEDDING_MODEL, partitions=partitions)
+    assert [c["chunk_id"] for c in fallback["results"][0]["chunks"]] == [chunk_id for chunk_id, _ in found]
+
+
+def test_cli_partitions_honour_k_and_type(mini_repo, active_repo_name, monkeypatch, capsys):
+    """
+    In a mode with partitions (debugging is the CLI default),
+    --k caps the total and a --type outside the partitions
+    still returns its top-k.
+    """
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+    monkeypatch.setattr(inspect_cli, "search_query", partial(search_query, model=LOCAL_EMBEDDING_MODEL))
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+    store = VectorStore.load()
+
+    def retrieved(*args):
+        monkeypatch.setattr(sys, "argv", ["inspect_repo", "which factory creates adapters?", *args])
+        inspect_cli.main()
+        out = capsys.readouterr().out
+        return [line.split()[0] for line in out.splitlines() if "  score=" in line]
+
+    partitions = get_mode_policy(ConversationMode.DEBUGGING).partitions
+    assert len(retrieved()) == sum(min(k, len(VectorStore.load(partition=p))) for p, k in partitions)
+
+    for k in (1, 2):
+        assert len(retrieved("--k", str(k))) == k
+
+    classes = retrieved("--type", "class_overview", "--k", "2")
+    assert len(classes) == 2
+    assert all(store.chunk_meta(chunk_id).type == "class_overview" for chunk_id in classes)
+
+    functions = retrieved("--type", "function_overview")
+    assert functions
+    assert all(store.chunk_meta(chunk_id).type == "function_overview" for chunk_id in functions)
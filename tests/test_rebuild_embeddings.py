@@ -1,5 +1,16 @@
 # tests/test_rebuild_embeddings.py
 
+import numpy as np
+
+from ai_dev_assistant.infra.config import LOCAL_EMBEDDING_MODEL
+from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.rag import embedding_pipeline
+from ai_dev_assistant.tools import rebuild_embeddings as rebuild_module
+from ai_dev_assistant.tools.artifacts import load_embedding_meta, load_embeddings, resolve_embeddings_path
+from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
+from ai_dev_assistant.tools.defaults import get_embeddings_path, get_index_changes_path
+from ai_dev_assistant.tools.index_repo import main as index_repo
+from ai_dev_assistant.tools.manifest import ChangeSet, save_changes
 from ai_dev_assistant.tools.rebuild_embeddings import main as rebuild_embeddings
 
 
@@ -11,3 +22,55 @@ def test_rebuild_embeddings(precomputed_mini_repo):
     verifying the pipeline stage executes without errors.
     """
     rebuild_embeddings()
+
+
+def test_rebuild_embeddings_incremental_writes_npy(precomputed_mini_repo, monkeypatch):
+    """
+    An incremental run keeps the surviving rows of the previous
+    matrix and appends the new vectors.
+    """
+    ids, matrix = load_embeddings(resolve_embeddings_path())
+    dim = matrix.shape[1]
+
+    def fake_embed_texts(texts, model, on_batch, dimensions=None):
+        vectors = [[1.0] * dim for _ in texts]
+        on_batch(dict(enumerate(vectors)))
+        return vectors
+
+    monkeypatch.setenv("AI_DEV_ASSISTANT_DRY_RUN", "0")
+    monkeypatch.setattr(embedding_pipeline, "embed_texts", fake_embed_texts)
+    monkeypatch.setattr(embedding_pipeline, "estimate_embedding_cost", lambda texts, model: (len(texts), 0.0))
+
+    save_changes(get_index_changes_path(), ChangeSet(added=[ids[1]], removed=[ids[0], ids[1]]))
+    rebuild_embeddings(incremental=True)
+
+    new_ids, new_matrix = load_embeddings(get_embeddings_path())
+
+    assert new_ids == ids[2:] + [ids[1]]
+    assert new_matrix.dtype == np.float32
+    assert np.array_equal(new_matrix[:-1], matrix[2:])
+    assert np.all(new_matrix[-1] == 1.0)
+
+
+def test_rebuild_embeddings_incremental_removing_everything(mini_repo, active_repo_name, monkeypatch):
+    """
+    An update that only removes vectors, down to none, keeps the
+    matrix 2-D, and the index can be updated from it.
+    """
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_embeddings()
+    build_vector_store()
+    ids, matrix = load_embeddings(resolve_embeddings_path())
+
+    save_changes(get_index_changes_path(), ChangeSet(removed=ids))
+    rebuild_embeddings(incremental=True)
+
+    new_ids, new_matrix = load_embeddings(get_embeddings_path())
+    assert new_ids == []
+    assert new_matrix.shape == (0, matrix.shape[1])
+    assert load_embedding_meta(get_embeddings_path())["dim"] == matrix.shape[1]
+
+    build_vector_store(incremental=True)
+    assert len(VectorStore.load()) == 0
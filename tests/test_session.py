@@ -0,0 +1,102 @@
+# tests/test_session.py
+import os
+import sqlite3
+
+from ai_dev_assistant.infra.config import LOCAL_EMBEDDING_MODEL
+from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.rag.session import get_session
+from ai_dev_assistant.services.context import build_query_context
+from ai_dev_assistant.services.search import search_query
+from ai_dev_assistant.tools import rebuild_embeddings as rebuild_module
+from ai_dev_assistant.tools.build_vector_store import main as build_vector_store
+from ai_dev_assistant.tools.defaults import get_artifacts_db_path
+from ai_dev_assistant.tools.index_repo import main as index_repo
+
+
+def test_session_keeps_index_and_artifacts_resident(mini_repo, active_repo_name, monkeypatch):
+    """
+    Repeated queries reuse the loaded index and artifact lookups
+    until their files are rewritten.
+    """
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    session = get_session()
+    loads = dict(session.loads)
+
+    for _ in range(3):
+        result = search_query("adapter factory", k=3, model=LOCAL_EMBEDDING_MODEL)
+        context = build_query_context(result["chunks"])
+
+    assert "AdapterFactory" in context["context"]
+    assert session.loads["vector_store"] == loads["vector_store"] + 1
+    assert session.loads["artifacts"] == loads["artifacts"] + 1
+    assert session.vector_store() is session.vector_store()
+
+    # A rebuilt index is picked up by the next query
+    store = session.vector_store()
+    assert store.read_only and store.memory_mapped
+
+    top = result["chunks"][0]["chunk_id"]
+    writable = VectorStore.load()
+    writable.remove([top])
+    writable.save()
+
+    result = search_query("adapter factory", k=3, model=LOCAL_EMBEDDING_MODEL)
+    assert session.vector_store() is not store
+    assert top not in {c["chunk_id"] for c in result["chunks"]}
+    assert session.loads["vector_store"] == loads["vector_store"] + 2
+
+
+def test_session_keeps_partitions_resident(mini_repo, active_repo_name, monkeypatch):
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+
+    index_repo(repo_root=mini_repo)
+    rebuild_module.main()
+    build_vector_store()
+
+    session = get_session()
+    assert session.has_partition("class_overview") and not session.has_partition("missing")
+
+    classes = session.vector_store("class_overview")
+    assert classes is session.vector_store("class_overview")
+    assert classes is not session.vector_store()
+    assert classes.partition == "class_overview" and classes.describe().startswith("class_overview flat index")
+    assert set(classes.ids) < set(session.vector_store().ids)
+
+
+def test_session_closes_replaced_artifacts(mini_repo, active_repo_name, monkeypatch):
+    """
+    A replaced artifact lookup is closed once no query uses it.
+    """
+    monkeypatch.setattr(rebuild_module, "EMBEDDING_MODEL", LOCAL_EMBEDDING_MODEL)
+    index_repo(repo_root=mini_repo)
+
+    db_path = get_artifacts_db_path()
+    session = get_session()
+
+    def rewrite():
+        stat = db_path.stat()
+        os.utime(db_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    def is_closed(artifacts):
+        try:
+            artifacts.index.conn.execute("SELECT 1")
+        except sqlite3.ProgrammingError:
+            return True
+        return False
+
+    with session.artifacts() as first:
+        rewrite()
+        with session.artifacts() as second:
+            assert second is not first
+        # Still used by the outer query
+        assert not is_closed(first)
+    assert is_closed(first) and not is_closed(second)
+
+    rewrite()
+    with session.artifacts() as third:
+        assert third is not second and is_closed(second)
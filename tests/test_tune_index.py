@@ -0,0 +1,49 @@
+# tests/test_tune_index.py
+import json
+
+import numpy as np
+
+from ai_dev_assistant.infra.vector_store import VectorStore
+from ai_dev_assistant.tools.artifacts import write_embeddings
+from ai_dev_assistant.tools.defaults import get_faiss_meta_path
+from ai_dev_assistant.tools.tune_index import main as tune_index
+
+
+def _write_corpus(count=3000, dim=32, clusters=30):
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.3 * rng.standard_normal((count, dim))
+    ids = [f"c{i}" for i in range(count)]
+    write_embeddings(ids, vectors.astype(np.float32), model="m")
+    return ids, vectors
+
+
+def test_tune_index_saves_config_meeting_target(active_repo_name):
+    ids, vectors = _write_corpus()
+
+    trial = tune_index(target_recall=0.9, k=5, queries=50, index_types=["ivfflat", "hnsw"])
+
+    assert trial.index_type in ("flat", "ivfflat", "hnsw")
+    assert trial.recall >= 0.9
+
+    meta = json.loads(get_faiss_meta_path().read_text())
+    assert meta["index"]["type"] == trial.index_type
+    assert meta["tuning"]["target_recall"] == 0.9
+    assert meta["tuning"]["recall"] >= 0.9
+
+    store = VectorStore.load()
+    if trial.index_type == "ivfflat":
+        assert store.params["nprobe"] == trial.settings["nprobe"] == store.index.nprobe
+    elif trial.index_type == "hnsw":
+        assert store.params["efSearch"] == trial.settings["ef_search"] == store.index.hnsw.efSearch
+    assert store.search(vectors[3].tolist(), k=1)[0][0] == "c3"
+
+
+def test_tune_index_falls_back_to_flat(active_repo_name):
+    _write_corpus(count=500)
+
+    trial = tune_index(target_recall=1.0, k=10, queries=20, index_types=["ivfpq"])
+
+    assert trial.index_type in ("flat", "ivfpq")
+    assert trial.recall == 1.0
+    assert VectorStore.load().index_type == trial.index_type
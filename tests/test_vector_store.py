@@ -0,0 +1,316 @@
+# tests/test_vector_store.py
+import json
+
+import faiss
+import numpy as np
+import pytest
+
+from ai_dev_assistant.infra.vector_store import (
+    FLAT_MAX_VECTORS,
+    HNSW_MAX_VECTORS,
+    ChunkMeta,
+    VectorStore,
+    choose_index_type,
+)
+from ai_dev_assistant.tools.defaults import get_faiss_index_path, get_faiss_meta_path
+
+
+def _corpus(count=3000, dim=64, clusters=40, seed=0):
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((clusters, dim))
+    vectors = centers[rng.integers(clusters, size=count)] + 0.3 * rng.standard_normal((count, dim))
+    return [f"c{i}" for i in range(count)], vectors.astype(np.float32)
+
+
+def _recall(store, exact, queries, k=10):
+    hits = 0
+    for query in queries:
+        truth = {chunk_id for chunk_id, _ in exact.search(query.tolist(), k=k)}
+        hits += len(truth & {chunk_id for chunk_id, _ in store.search(query.tolist(), k=k)})
+    return hits / (k * len(queries))
+
+
+@pytest.mark.parametrize(
+    ("index_type", "min_ratio", "min_recall", "min_rescored"),
+    [("sq8", 3.5, 0.9, 0.95), ("ivfpq", 8, 0.3, 0.7)],
+)
+def test_quantized_index_size_and_recall(index_type, min_ratio, min_recall, min_rescored):
+    ids, vectors = _corpus()
+    queries = vectors[:50] + 0.1
+
+    exact = VectorStore(dim=64)
+    exact.build(ids, vectors)
+
+    store = VectorStore(dim=64, index_type=index_type)
+    store.build(ids, vectors)
+    store.use_originals(ids, vectors)
+
+    ratio = len(faiss.serialize_index(exact.index)) / len(faiss.serialize_index(store.index))
+    assert ratio >= min_ratio
+
+    approximate = _recall(store, exact, queries)
+    store.rerank = 4
+    rescored = _recall(store, exact, queries)
+
+    assert approximate >= min_recall
+    assert rescored >= approximate
+    assert rescored >= min_rescored
+
+    # Re-scored results carry exact cosine scores
+    top_id, top_score = store.search(vectors[0].tolist(), k=1)[0]
+    assert top_id == "c0"
+    assert top_score == pytest.approx(1.0, abs=1e-5)
+
+
+def test_ivfpq_remove_and_add_keep_labels(active_repo_name):
+    ids, vectors = _corpus(count=1000)
+
+    store = VectorStore(dim=64, index_type="ivfpq", rerank=2)
+    store.build(ids[:900], vectors[:900])
+
+    assert store.remove(["c1", "c5"]) == 2
+    assert store.add(ids[900:], vectors[900:]) == 100
+    assert "c1" not in store and store.ids[-1] == "c999"
+
+    store.save()
+    loaded = VectorStore.load()
+    loaded.use_originals(ids, vectors)
+
+    assert (loaded.index_type, loaded.rerank, loaded.index.ntotal) == ("ivfpq", 2, 998)
+    assert loaded.search(vectors[950].tolist(), k=1, rerank=50)[0][0] == "c950"
+    assert all(chunk_id != "c5" for chunk_id, _ in loaded.search(vectors[5].tolist(), k=20))
+
+
+@pytest.mark.parametrize(
+    ("index_type", "low", "high"),
+    [("ivfflat", {"nprobe": 1}, {"nprobe": 64}), ("hnsw", {"ef_search": 1}, {"ef_search": 256})],
+)
+def test_approximate_index_per_query_params(index_type, low, high):
+    ids, vectors = _corpus()
+    queries = vectors[:50] + 0.1
+
+    exact = VectorStore(dim=64)
+    exact.build(ids, vectors)
+
+    store = VectorStore(dim=64, index_type=index_type)
+    store.build(ids, vectors)
+
+    def recall(**params):
+        hits = 0
+        for query in queries:
+            truth = {chunk_id for chunk_id, _ in exact.search(query.tolist(), k=10)}
+            hits += len(truth & {chunk_id for chunk_id, _ in store.search(query.tolist(), k=10, **params)})
+        return hits / (10 * len(queries))
+
+    assert recall() >= 0.8
+    assert recall(**high) >= 0.99
+    assert recall(**low) <= recall(**high)
+
+
+def test_choose_index_type_by_count():
+    assert choose_index_type(1000) == "flat"
+    assert choose_index_type(FLAT_MAX_VECTORS + 1) == "hnsw"
+    assert choose_index_type(HNSW_MAX_VECTORS + 1) == "ivfflat"
+
+    ids, vectors = _corpus(count=200)
+    store = VectorStore(dim=64, index_type="auto")
+    store.build(ids, vectors)
+    assert store.index_type == "flat"
+
+
+def test_hnsw_remove_skips_vectors(active_repo_name):
+    ids, vectors = _corpus(count=500)
+
+    store = VectorStore(dim=64, index_type="hnsw")
+    store.build(ids, vectors)
+    assert store.remove(["c7"]) == 1
+
+    store.save()
+    loaded = VectorStore.load()
+
+    assert (loaded.index_type, loaded.params["efSearch"]) == ("hnsw", store.params["efSearch"])
+    results = loaded.search(vectors[7].tolist(), k=5)
+    assert len(results) == 5
+    assert "c7" not in {chunk_id for chunk_id, _ in results}
+
+
+def test_hnsw_compacts_removed_vectors(active_repo_name):
+    ids, vectors = _corpus(count=1000)
+    metadata = _metadata(len(ids))
+
+    store = VectorStore(dim=64, index_type="hnsw")
+    store.build(ids, vectors, metadata)
+
+    # Up to HNSW_MAX_REMOVED_FRACTION of the graph: tombstones only
+    store.remove(ids[:200])
+    assert (store.index.ntotal, store._removed) == (1000, 200)
+
+    store.upsert(ids[200:210], vectors[200:210], metadata[200:210])
+    assert (store.index.ntotal, store._removed) == (800, 0)
+    assert store.ids == ids[210:] + ids[200:210]
+
+    store.save()
+    loaded = VectorStore.load()
+    assert loaded.chunk_meta("c205") == metadata[205]
+    for i in (205, 500, 999):
+        assert loaded.search(vectors[i].tolist(), k=1)[0][0] == f"c{i}"
+    assert all(int(chunk_id[1:]) >= 200 for chunk_id, _ in loaded.search(vectors[5].tolist(), k=20))
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8", "ivfflat", "hnsw"])
+def test_upsert_and_remove_in_place(index_type, active_repo_name):
+    ids, vectors = _corpus(count=2000)
+
+    store = VectorStore(dim=64, index_type=index_type)
+    store.build(ids, vectors)
+
+    # c3 takes the vector of c4: its old vector is gone, its label is new
+    assert store.upsert(["c3"], vectors[4:5]) == 1
+    assert store.remove(["c10", "missing"]) == 1
+    with pytest.raises(ValueError, match="upsert"):
+        store.add(["c3"], vectors[:1])
+
+    store.save()
+    meta = json.loads(get_faiss_meta_path().read_text())
+    assert meta["labels"] == [[0, 3], [4, 6], [11, 1990]]
+
+    loaded = VectorStore.load()
+    assert len(loaded) == 1999 and "c10" not in loaded
+
+    top = {chunk_id for chunk_id, _ in loaded.search(vectors[4].tolist(), k=2)}
+    assert top == {"c3", "c4"}
+    assert all(chunk_id != "c10" for chunk_id, _ in loaded.search(vectors[10].tolist(), k=10))
+
+    assert loaded.upsert(["c10"], vectors[10:11]) == 1
+    assert loaded.search(vectors[10].tolist(), k=1)[0][0] == "c10"
+
+
+def test_load_positional_meta(active_repo_name):
+    """
+    Indexes saved before labels: bare flat index, positional ids.
+    """
+    ids, vectors = _corpus(count=100)
+    index = faiss.IndexFlatIP(64)
+    block = vectors.copy()
+    faiss.normalize_L2(block)
+    index.add(block)
+
+    get_faiss_index_path().parent.mkdir(parents=True, exist_ok=True)
+    faiss.write_index(index, str(get_faiss_index_path()))
+    get_faiss_meta_path().write_text(json.dumps({"ids": ids, "dim": 64}))
+
+    read_only = VectorStore.load(read_only=True)
+    assert (read_only.model, read_only.index_type, read_only.has_metadata) == (None, "flat", False)
+    assert read_only.search(vectors[50].tolist(), k=1)[0][0] == "c50"
+
+    store = VectorStore.load()
+    assert store.remove(["c0"]) == 1
+    assert store.search(vectors[50].tolist(), k=1)[0][0] == "c50"
+    assert store.add(["new"], vectors[:1]) == 1
+    assert store.search(vectors[0].tolist(), k=1)[0][0] == "new"
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8", "ivfflat", "ivfpq", "hnsw"])
+def test_load_read_only_memory_mapped(index_type, active_repo_name):
+    ids, vectors = _corpus(count=2000)
+
+    store = VectorStore(dim=64, index_type=index_type)
+    store.build(ids, vectors)
+    store.save()
+
+    mapped = VectorStore.load(read_only=True)
+    assert mapped.memory_mapped and mapped.load_seconds is not None
+    assert "memory-mapped" in mapped.describe()
+
+    for query in vectors[:20]:
+        assert mapped.search(query.tolist(), k=5) == store.search(query.tolist(), k=5)
+
+    with pytest.raises(RuntimeError, match="read-only"):
+        mapped.upsert(["c0"], vectors[:1])
+    with pytest.raises(RuntimeError, match="read-only"):
+        mapped.save()
+    with pytest.raises(ValueError, match="read_only"):
+        VectorStore.load(mmap=True)
+
+    assert not VectorStore.load(read_only=True, mmap=False).memory_mapped
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivfpq", "hnsw"])
+def test_search_batch_matches_single_searches(index_type):
+    ids, vectors = _corpus(count=1000)
+    queries = vectors[:30] + 0.05
+
+    store = VectorStore(dim=64, index_type=index_type, rerank=2)
+    store.build(ids, vectors)
+    store.use_originals(ids, vectors)
+    store.remove(["c0"])
+
+    batch = store.search_batch(queries, k=5)
+
+    assert len(batch) == len(queries)
+    for query, results in zip(queries, batch, strict=True):
+        assert results == store.search(query.tolist(), k=5)
+    assert store.search_batch(np.empty((0, 64)), k=5) == []
+
+
+def _metadata(count):
+    types = ["class_overview", "function_overview", "method_overview"]
+    packages = ["pkg", "pkg.services", "pkg.services.api", "other"]
+    return [
+        ChunkMeta(types[i % 3], f"src/{packages[i % 4].replace('.', '/')}/m{i % 7}.py", packages[i % 4]) for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("index_type", ["flat", "sq8", "ivfflat", "ivfpq", "hnsw"])
+def test_filtered_search(index_type, active_repo_name):
+    ids, vectors = _corpus(count=2000)
+    metadata = _metadata(len(ids))
+
+    store = VectorStore(dim=64, index_type=index_type)
+    store.build(ids, vectors, metadata)
+    store.remove(["c5"])
+    store.upsert(["c1"], vectors[1:2], [ChunkMeta("function_overview", "src/other/new.py", "other")])
+    store.save()
+
+    loaded = VectorStore.load(read_only=True)
+    assert loaded.chunk_meta("c1") == ChunkMeta("function_overview", "src/other/new.py", "other")
+    assert loaded.chunk_meta("c5") is None
+
+    def matching(chunk_id, types=None, path_prefix=None, packages=None):
+        meta = loaded.chunk_meta(chunk_id)
+        return (
+            (types is None or meta.type in types)
+            and (path_prefix is None or meta.file.startswith(path_prefix))
+            and (packages is None or any(meta.package == p or meta.package.startswith(p + ".") for p in packages))
+        )
+
+    filters = [
+        {"types": ["method_overview"]},
+        {"path_prefix": "src/pkg/services/"},
+        {"packages": ["pkg.services"], "types": ["class_overview", "function_overview"]},
+    ]
+    for options in filters:
+        for query in vectors[:10]:
+            results = loaded.search(query.tolist(), k=5, **options)
+            assert results and all(matching(chunk_id, **options) for chunk_id, _ in results)
+
+    # A filter is applied before the top-k, not after
+    assert [chunk_id for chunk_id, _ in loaded.search(vectors[1].tolist(), k=5, path_prefix="./src/other/new")] == ["c1"]
+    assert loaded.search(vectors[0].tolist(), k=5, packages=["pkg.serv"]) == []
+    assert loaded.search_batch(vectors[:3], k=5, types=["project"]) == [[], [], []]
+
+
+def test_filtered_search_requires_metadata():
+    ids, vectors = _corpus(count=100)
+
+    store = VectorStore(dim=64)
+    store.build(ids, vectors)
+    assert not store.has_metadata
+    with pytest.raises(ValueError, match="metadata"):
+        store.search(vectors[0].tolist(), types=["class_overview"])
+    with pytest.raises(ValueError, match="rebuild"):
+        store.add(["new"], vectors[:1], _metadata(1))
+
+    store.build(ids, vectors, _metadata(len(ids)))
+    with pytest.raises(ValueError, match="metadata"):
+        store.add(["new"], vectors[:1])
@@ -0,0 +1,75 @@
+# tests/test_watch.py
+import os
+import threading
+
+from ai_dev_assistant.tools.defaults import get_chunks_path, repo_name_from_path
+from ai_dev_assistant.tools.index_repo import main as index_repo
+from ai_dev_assistant.tools.watch import Watcher
+
+
+def _bump(path, text):
+    """Write and force a new mtime (coarse filesystem clocks)."""
+    stat = path.stat() if path.exists() else None
+    path.write_text(text)
+    if stat is not None:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_watcher_debounces_changes(mini_repo):
+    """
+    Changes are batched until the tree has been quiet for
+    `debounce` seconds, then reported once.
+    """
+    watcher = Watcher(mini_repo, debounce=2.0, on_refresh=lambda paths: None)
+
+    assert watcher.tick(0.0) == set()
+
+    _bump(mini_repo / "utils.py", "def helper():\n    return 43\n")
+    assert watcher.tick(1.0) == set()
+
+    (mini_repo / "adapter.py").unlink()
+    (mini_repo / "new.py").write_text("x = 1\n")
+    assert watcher.tick(2.0) == set()
+    assert watcher.tick(3.0) == set()
+
+    assert watcher.tick(4.0) == {"utils.py", "adapter.py", "new.py"}
+    assert watcher.tick(10.0) == set()
+
+
+def test_watcher_refreshes_changed_paths(mini_repo, isolated_data_root):
+    """
+    The background refresh only re-indexes the reported paths
+    and ends up identical to a full index run.
+    """
+    chunks_path = get_chunks_path(repo_name_from_path(mini_repo))
+    refreshed = []
+    stop = threading.Event()
+
+    def on_refresh(paths):
+        index_repo(repo_root=mini_repo, changed_paths=paths)
+        refreshed.append(paths)
+        if paths:
+            stop.set()
+
+    watcher = Watcher(mini_repo, interval=0.01, debounce=0.0, on_refresh=on_refresh)
+
+    # Edit only once the initial catch-up run is done
+    original = watcher._run_refresh
+
+    def run_refresh(paths):
+        original(paths)
+        if paths is None:
+            _bump(mini_repo / "utils.py", "def helper():\n    return 43\n")
+
+    watcher._run_refresh = run_refresh
+
+    thread = threading.Thread(target=watcher.run, args=(stop,))
+    thread.start()
+    thread.join(timeout=10)
+
+    assert not thread.is_alive()
+    assert refreshed == [None, {"utils.py"}]
+
+    incremental = chunks_path.read_bytes()
+    index_repo(repo_root=mini_repo)
+    assert chunks_path.read_bytes() == incremental